@@ -13,6 +13,11 @@ if str(root_path) not in sys.path:
 
 
 import streamlit as st
+from backend.resources import start_warm_up
+
+# Load the embedding model, stores and HTTP clients once per server process,
+# in the background, so the first user doesn't wait for them
+start_warm_up()
 
 # ✅ MUST be the first Streamlit command
 st.set_page_config(page_title="🏠 Home", page_icon="🏠", layout="centered")
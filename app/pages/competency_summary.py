@@ -2,29 +2,28 @@
 
 import sys
 from pathlib import Path
-import asyncio
+import queue
 import streamlit as st
-import nest_asyncio
-nest_asyncio.apply()
 
 # Fix path for backend imports
 root_path = Path(__file__).resolve().parent.parent.parent
 if str(root_path) not in sys.path:
     sys.path.append(str(root_path))
 
-# Agents
-from backend.agents.agent_profile_summarizer import summarize_user_profile
-from backend.agents.agent_level_estimator import estimate_user_level
-from backend.agents.agent_role_competency_mapper import map_competencies_for_role
-from backend.agents.agent_extract_latest_job import extract_latest_job_role
-from backend.agents.agent_cv_strengths import extract_top_strengths
-from backend.rag_engine import get_all_competency_names, query_competency_by_name, query_competency
+# Agents (run as a dependency graph)
+from backend.competency_flow import build_competency_summary_dag
+from backend.rag_engine import query_competency_by_name
+from backend.async_runtime import run_sync
+from backend.step_store import restore_session, save_session, step_state
 
 # UI Setup
 st.set_page_config(page_title="📊 Competency Summary", page_icon="📊", layout="centered")
 st.sidebar.title("📊 Competency Summary")
 st.title("📊 Your Competency Summary")
 
+# After a browser refresh, pick the profile back up from the URL
+restore_session(st.session_state, st.query_params)
+
 # UI helper
 def render_compact_row(item):
     percent = int((item["level"] / 5) * 100)
@@ -46,14 +45,52 @@ cv_text = st.session_state.get("cv_text", "")
 manual_data = st.session_state.get("manual_data", {})
 summary_text = st.session_state.get("summary_result", "")
 
-# --- Run summarization if not yet processed
-if input_text and not summary_text:
-    with st.spinner("🧠 Summarizing your profile using AI..."):
-        summary_text = asyncio.run(summarize_user_profile(input_text))
-        st.session_state["summary_result"] = summary_text
-        st.success("✅ Summary complete!")
+# Stop if there is nothing to analyse
+if not input_text and not summary_text:
+    st.error("⚠️ No input data or summary found. Please go back and start from profile page.")
+    st.stop()
+
+# --- Run the agents: independent steps run concurrently, unchanged steps are reused
+STEP_LABELS = {
+    "summary": "🧠 Profile summarized",
+    "job_role": "🔍 Latest job role identified",
+    "role_competencies": "🧭 Role competencies mapped",
+    "user_levels": "📈 Competency levels estimated",
+    "strengths": "🟢 Strongest competencies extracted from CV",
+}
+
+# Only these outputs are kept, so a session restored from the URL can show them without the raw input
+RESULT_KEYS = ("summary", "job_role", "role_matches", "user_levels", "strengths")
+saved_summary = step_state(st.session_state, "competency_summary")
+
+if not input_text and "results" in saved_summary:
+    results = saved_summary["results"]
+else:
+    with st.status("🧠 Analyzing your profile with AI...", expanded=False) as status:
+        # Steps finish on the background loop; queue them and write from this script thread
+        finished_steps = queue.Queue()
+
+        def report_step(name, output, seconds, reused):
+            if name in STEP_LABELS:
+                finished_steps.put(f"{STEP_LABELS[name]} ({'cached' if reused else f'{seconds:.1f}s'})")
+
+        def show_finished_steps():
+            while not finished_steps.empty():
+                status.write(finished_steps.get())
+
+        results = run_sync(build_competency_summary_dag().run(
+            {"input_text": input_text, "summary_text": summary_text, "cv_text": cv_text},
+            state=step_state(st.session_state, "competency_dag_state"),
+            on_done=report_step,
+        ), on_poll=show_finished_steps)
+        status.update(label="✅ Profile analysis complete", state="complete")
+    saved_summary["results"] = {name: results[name] for name in RESULT_KEYS}
+
+summary_text = results["summary"]
+job_role = results["job_role"]
+st.session_state["summary_result"] = summary_text
+st.session_state["job_role"] = job_role
 
-# Stop if still no data
 if not summary_text:
     st.error("⚠️ No input data or summary found. Please go back and start from profile page.")
     st.stop()
@@ -62,29 +99,20 @@ if not summary_text:
 st.subheader("📋 Profile Summary")
 st.markdown(summary_text)
 
-# --- Identify role
-with st.spinner("🔍 Identifying your latest job role..."):
-    job_role = asyncio.run(extract_latest_job_role(summary_text)) or "Unknown Role"
-    st.session_state["job_role"] = job_role
-
 st.info(f"Recommended competencies based on your current role: **{job_role}**")
 
 # --- Most Needed Competencies for Role
 st.markdown("### 🔍 Most Needed Competencies for Your Role")
 most_needed_matches = []
-all_competencies = get_all_competency_names()
-role_competencies = asyncio.run(map_competencies_for_role(job_role, all_competencies))
+user_levels = results["user_levels"]
 
-for comp in role_competencies[:5]:
-    result = query_competency_by_name(comp)
-    if result:
-        user_level = asyncio.run(estimate_user_level(comp, summary_text))
-        most_needed_matches.append({
-            "competency": comp,
-            "definition": result["definition"],
-            "meta": result["metadata"],
-            "level": user_level
-        })
+for comp, result in results["role_matches"]:
+    most_needed_matches.append({
+        "competency": comp,
+        "definition": result["definition"],
+        "meta": result["metadata"],
+        "level": user_levels[comp]
+    })
 
 for item in most_needed_matches:
     render_compact_row(item)
@@ -93,18 +121,15 @@ for item in most_needed_matches:
 st.markdown("### 🟢 Your Strongest Competencies")
 strongest_matches = []
 
-if cv_text:
-    with st.spinner("🔎 Extracting strongest competencies from CV..."):
-        strength_matches_raw = asyncio.run(extract_top_strengths(cv_text, all_competencies))
-        for match in strength_matches_raw:
-            result = query_competency_by_name(match["competency"])
-            if result:
-                strongest_matches.append({
-                    "competency": match["competency"],
-                    "definition": result["definition"],
-                    "meta": result["metadata"],
-                    "level": match["level"]
-                })
+for match in results["strengths"]:
+    result = query_competency_by_name(match["competency"])
+    if result:
+        strongest_matches.append({
+            "competency": match["competency"],
+            "definition": result["definition"],
+            "meta": result["metadata"],
+            "level": match["level"]
+        })
 
 for item in strongest_matches:
     render_compact_row(item)
@@ -124,6 +149,7 @@ for comp in combined_competencies:
 
 # Save for next step
 st.session_state["final_competency_input"] = unique_competency_input
+save_session(st.session_state)
 
 # --- CTA Button
 if st.button("🚀 Get Job Recommendations Based on My Competencies"):
@@ -1,13 +1,14 @@
 # app/pages/gap_analyzer.py
 
+import queue
 import streamlit as st
-import asyncio
-from backend.agents.agent_gap_analyzer import analyze_gaps
-from backend.agents.agent_extract_job_requirements import extract_job_requirements
-from backend.agents.agent_learning_plan import generate_learning_plan
+from backend.gap_flow import run_gap_analysis
+from backend.async_runtime import run_sync
+from backend.step_store import restore_session, step_state
 
 st.set_page_config(page_title="🧠 Gap Analyzer", page_icon="🧠")
 st.title("🧠 Skill & Experience Gap Analyzer")
+restore_session(st.session_state, st.query_params)
 # st.snow()
 
 # --- Retrieve required session data ---
@@ -19,20 +20,6 @@ if not job or not cv_summary or not competencies:
     st.error("Missing data: job selection, CV summary, or competencies not found.")
     st.stop()
 
-# --- Run agents asynchronously ---
-async def run_all_agents():
-    gaps = await analyze_gaps(job, cv_summary, competencies)
-    requirements = await extract_job_requirements(job.get("description", ""), cv_summary)
-    plan = await generate_learning_plan(job, cv_summary, gaps.get("gaps", []), requirements.get("requirements", []))
-    return gaps, requirements, plan
-
-with st.spinner("🔍 Analyzing your profile against the job requirements..."):
-    try:
-        gaps, requirements, learning_plan = asyncio.run(run_all_agents())
-    except Exception as e:
-        st.error(f"❌ Analysis failed: {e}")
-        gaps, requirements, learning_plan = {"gaps": []}, {"requirements": []}, {"plan": []}
-
 # --- Display Job Info ---
 st.header(f"Target Role: {job.get('title') or job.get('role', 'Unknown')} at {job.get('company_name', job.get('company', ''))}")
 st.markdown(f"**Job Description Preview:** {job.get('description', '')[:300]}...")
@@ -41,34 +28,75 @@ st.markdown(f"**Job Description Preview:** {job.get('description', '')[:300]}...
 match_score = job.get("match_score", 0)
 st.progress(match_score / 100, text=f"Overall Match: {match_score}%")
 
-# --- Display Competency Gaps ---
-st.subheader("📊 Competency Gap Analysis")
-data_rows = []
-priority_gaps = set()
-for gap in gaps.get("gaps", [])[:10]:
-    if gap["type"] == "skill":
-        gap_size = abs(gap['required_level'] - gap['current_level'])
-        is_critical = gap_size > 1
-        label = f"⭐ {gap['competency']}" if is_critical else gap['competency']
-        if is_critical:
-            priority_gaps.add(gap['competency'])
-        data_rows.append([
-            label,
-            f"Level {gap['current_level']}",
-            f"Level {gap['required_level']}",
-            f"-{gap_size}"
-        ])
+# --- Gap table helpers ---
+def build_gap_rows(gap_list):
+    data_rows = []
+    priority_gaps = set()
+    for gap in gap_list[:10]:
+        if gap["type"] == "skill":
+            gap_size = abs(gap['required_level'] - gap['current_level'])
+            is_critical = gap_size > 1
+            label = f"⭐ {gap['competency']}" if is_critical else gap['competency']
+            if is_critical:
+                priority_gaps.add(gap['competency'])
+            data_rows.append([
+                label,
+                f"Level {gap['current_level']}",
+                f"Level {gap['required_level']}",
+                f"-{gap_size}"
+            ])
+    return data_rows, priority_gaps
 
-if data_rows:
-    st.table({
+def render_gap_table(container, data_rows):
+    container.table({
         "Competency": [row[0] for row in data_rows],
         "My Level": [row[1] for row in data_rows],
         "Target Level": [row[2] for row in data_rows],
         "Gap": [row[3] for row in data_rows]
     })
+
+# --- Display Competency Gaps ---
+st.subheader("📊 Competency Gap Analysis")
+gap_table = st.empty()
+
+# --- Run agents on the background loop: gaps and requirements concurrently, then the plan.
+# Results are memoised per job, summary and competencies, so reruns cost no LLM calls.
+streamed_gaps = queue.Queue()
+
+def show_streamed_gaps():
+    latest = None
+    while not streamed_gaps.empty():
+        latest = streamed_gaps.get()
+    if latest:
+        try:
+            rows, _ = build_gap_rows(latest)
+            if rows:
+                render_gap_table(gap_table, rows)
+        except (KeyError, TypeError):
+            pass  # Skip the live preview for an incomplete entry
+
+with st.spinner("🔍 Analyzing your profile against the job requirements..."):
+    try:
+        analysis = run_sync(
+            run_gap_analysis(
+                job, cv_summary, competencies,
+                state=step_state(st.session_state, "gap_analysis_results"),
+                on_gap=streamed_gaps.put,
+            ),
+            on_poll=show_streamed_gaps,
+        )
+        gaps, requirements, learning_plan = analysis["gaps"], analysis["requirements"], analysis["plan"]
+    except Exception as e:
+        st.error(f"❌ Analysis failed: {e}")
+        gaps, requirements, learning_plan = {"gaps": []}, {"requirements": []}, {"plan": []}
+
+data_rows, priority_gaps = build_gap_rows(gaps.get("gaps", []))
+
+if data_rows:
+    render_gap_table(gap_table, data_rows)
     st.markdown("These gaps highlight the areas that need development to strengthen your alignment with the job role. ⭐ indicates a key priority.")
 else:
-    st.info("✅ No major skill gaps found. Great work!")
+    gap_table.info("✅ No major skill gaps found. Great work!")
 
 # --- Display Requirement Matching ---
 st.subheader("📋 Job Requirement Match")
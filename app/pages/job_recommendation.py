@@ -1,20 +1,25 @@
 import streamlit as st
-import asyncio
 from backend.agents.agent_job_recommender import recommend_jobs_from_competencies
+from backend.async_runtime import run_sync
+from backend.enrichment_cache import profile_hash
+from backend.step_store import restore_session, save_session, step_state
 
 st.set_page_config(page_title="💼 Job Recommendations", page_icon="💼")
 st.title("💼 Job Recommendations")
+restore_session(st.session_state, st.query_params)
 
 competencies = st.session_state.get("final_competency_input", [])
 if not competencies:
     st.warning("No competency profile found. Please complete the competency summary first.")
     st.stop()
 
-# Only call LLM recommender once and cache it in session state
-if "job_recommendations" not in st.session_state:
+# Only call LLM recommender once per competency profile; results are kept in the step store
+stored_recommendations = step_state(st.session_state, "job_recommendations_by_competencies")
+recommendations_key = profile_hash(competencies)
+if recommendations_key not in stored_recommendations:
     with st.spinner("Generating job recommendations..."):
-        results = asyncio.run(recommend_jobs_from_competencies(competencies))
-        st.session_state["job_recommendations"] = results
+        stored_recommendations[recommendations_key] = run_sync(recommend_jobs_from_competencies(competencies))
+st.session_state["job_recommendations"] = stored_recommendations[recommendations_key]
 
 recommendations = st.session_state["job_recommendations"]
 
@@ -29,6 +34,7 @@ for idx, job in enumerate(recommendations):
     if st.button("🚀 I want to pursue this", key=f"pursue_{idx}"):
         st.session_state["selected_job"] = job
         st.session_state["show_preferences"] = True
+        save_session(st.session_state)
 
 # Show follow-up form after job selection
 if st.session_state.get("show_preferences"):
@@ -57,6 +63,7 @@ if st.session_state.get("show_preferences"):
                 "company_type": company_type,
                 "location": location
             }
+            save_session(st.session_state)
             st.success("Preferences saved!")
 
 
@@ -2,17 +2,21 @@
 
 import os
 import math
-import json
-import asyncio
-import requests
 import streamlit as st
-from backend.agents.agent_enrich_job import enrich_and_score_jobs
-from chromadb import PersistentClient
-from chromadb.utils import embedding_functions
+from backend.agents.agent_enrich_job import stream_enriched_jobs, enrich_and_score_jobs_chunked, is_raw_fallback, is_enriched, ENRICH_CHUNK_SIZE
+from backend.job_ranker import ENRICH_TOP_N, prerank_jobs
+from backend.job_search_client import search_jobs_async
+from backend.job_dedup import dedupe_jobs
+from backend.enrichment_cache import get_enrichment_cache, profile_hash
+from backend.embedding_cache import get_profile_embedding
+from backend.job_logic import run_enrichment
+from backend.async_runtime import run_sync, iterate_sync
+from backend.step_store import restore_session, save_session, step_state
 from datetime import datetime
 
 st.set_page_config(page_title="🔎 Job Search", page_icon="🔍")
 st.title("🔎 Matching Job Opportunities")
+restore_session(st.session_state, st.query_params)
 
 # --- Redirect Trigger to Gap Analyzer ---
 if st.session_state.get("redirect_gap"):
@@ -23,86 +27,135 @@ if st.session_state.get("redirect_gap"):
 SEARCH_API_KEY = os.getenv("SEARCH_API_KEY")
 SEARCH_API_URL = os.getenv("SEARCH_API_URL")
 
-# --- Initialize ChromaDB ---
-client = PersistentClient(path="chromadb_data")
-collection = client.get_or_create_collection(
-    name="enriched_jobs",
-    embedding_function=embedding_functions.SentenceTransformerEmbeddingFunction("all-MiniLM-L6-v2")
-)
+# --- Enrichment cache (chromadb_data): keyed by job fingerprint + profile hash, so hits are per user ---
+enrichment_cache = get_enrichment_cache()
 
 # --- Get user data ---
 selected_job = st.session_state.get("selected_job")
 user_summary = st.session_state.get("summary_result", "")
+competencies = st.session_state.get("final_competency_input", [])
 
 if not selected_job:
     st.error("Missing job selection. Please go back and choose a recommendation first.")
     st.stop()
 
-# --- Retry-capable Search Function ---
-def search_jobs(query, max_retries=3):
-    for attempt in range(max_retries):
-        try:
-            with st.spinner(f"🔍 Searching jobs... (attempt {attempt + 1})"):
-                params = {
-                    "engine": "google_jobs",
-                    "q": query,
-                    "api_key": SEARCH_API_KEY
-                }
-                response = requests.get(SEARCH_API_URL, params=params)
-                response.raise_for_status()
-                result = response.json()
-                jobs = result.get("jobs") or result.get("results") or []
-                if jobs:
-                    return jobs
-        except Exception as e:
-            st.warning(f"Attempt {attempt + 1} failed: {e}")
-    return []
-
-# --- Prepare search query and cache key ---
-job_title = selected_job.get("title", "").strip().lower()
-search_key = f"{job_title}_{user_summary[:50]}"
+# --- Profile vector: embedded once per session and reused for pre-ranking and scoring ---
+def session_profile_vector():
+    if not user_summary:
+        return None
+    try:
+        return get_profile_embedding(st.session_state, user_summary)
+    except Exception as e:
+        print(f"⚠️ Profile embedding unavailable: {e}")
+        return None
 
-# --- Check cache first ---
-existing = collection.get(where={"job_title": job_title})
-enriched_jobs = []
+profile_vector = session_profile_vector()
 
-if existing and existing.get("documents"):
+# --- Fan-out Search: title variants, preferred location and industries, several pages each ---
+def search_jobs(query):
+    preferences = st.session_state.get("user_preferences", {})
     try:
-        enriched_jobs = [json.loads(doc) for doc in existing["documents"]]
-        st.info("✅ Loaded enriched results from local cache.")
+        with st.spinner("🔍 Searching jobs..."):
+            jobs = run_sync(
+                search_jobs_async(query, preferences, api_key=SEARCH_API_KEY, api_url=SEARCH_API_URL)
+            )
+        # The same posting is often listed by several boards; enrich it once
+        return dedupe_jobs(jobs)
     except Exception as e:
-        st.warning(f"⚠️ Failed to parse cached enrichment: {e}")
+        st.warning(f"Job search failed: {e}")
+        return []
 
-# --- Run enrichment if cache not available ---
+# --- Prepare search query and cache keys ---
+job_title = selected_job.get("title", "").strip().lower()
+profile_key = profile_hash(user_summary, competencies)
+results_key = profile_hash(job_title, profile_key, st.session_state.get("user_preferences", {}))
+
+# --- Reruns (pagination, buttons) and reloads reuse this profile's results ---
+session_results = step_state(st.session_state, "job_search_results")
+enriched_jobs = session_results.get(results_key, [])
+
+# --- Stream enrichment, previewing each job as soon as it is scored ---
+def collect_enriched_jobs(raw_jobs, user_summary, preview):
+    jobs = []
+    for job in iterate_sync(stream_enriched_jobs(
+        raw_jobs, user_summary, competencies=competencies, profile_vector=profile_vector
+    )):
+        jobs.append(job)
+        preview.markdown("\n".join(
+            f"- ✅ **{j.get('role', 'Unknown Role')}** at {j.get('company', 'Unknown Company')} — {j.get('match_score', 0)}% match"
+            for j in jobs
+        ))
+    return jobs
+
+# --- Enrich jobs missing from the cache, with retries; None if every attempt failed ---
+def enrich_with_ai(jobs):
+    for attempt in range(3):
+        try:
+            with st.spinner(f"⚙️ Enhancing jobs with AI... (Attempt {attempt + 1})"):
+                if len(jobs) > ENRICH_CHUNK_SIZE:
+                    # Several prompts' worth: enrich the chunks in parallel
+                    enriched = run_sync(
+                        enrich_and_score_jobs_chunked(
+                            jobs, user_summary, competencies=competencies, profile_vector=profile_vector
+                        )
+                    )
+                else:
+                    preview = st.empty()
+                    enriched = collect_enriched_jobs(jobs, user_summary, preview)
+                    preview.empty()
+                if enriched:
+                    # Check if enrichment is actually useful
+                    if all(not j.get("fit_reason") and not j.get("match_score") for j in enriched):
+                        raise ValueError("LLM enrichment returned unusable data.")
+
+                    # Raw-data placeholders are shown but not cached, so the next search retries them
+                    scored = [(job, e) for job, e in zip(jobs, enriched) if not is_raw_fallback(e)]
+                    enrichment_cache.put([job for job, _ in scored], profile_key, [e for _, e in scored])
+                    return enriched  # Success
+        except Exception as e:
+            log_path = os.path.join("logs", "enrichment_failures.log")
+            os.makedirs("logs", exist_ok=True)
+            with open(log_path, "a", encoding="utf-8") as log:
+                log.write(f"{datetime.now()} - Attempt {attempt+1} failed: {str(e)}\n")
+    return None
+
+# --- Search, then enrich only what the cache doesn't have ---
 if not enriched_jobs:
     raw_jobs = search_jobs(job_title)
     if raw_jobs:
-        for attempt in range(3):
-            try:
-                with st.spinner(f"⚙️ Enhancing jobs with AI... (Attempt {attempt + 1})"):
-                    enriched_jobs = asyncio.new_event_loop().run_until_complete(
-                        enrich_and_score_jobs(raw_jobs, user_summary)
-                    )
-                    if enriched_jobs:
-                        # Check if enrichment is actually useful
-                        if all(not j.get("fit_reason") and not j.get("match_score") for j in enriched_jobs):
-                            raise ValueError("LLM enrichment returned unusable data.")
-
-                        for i, job in enumerate(enriched_jobs):
-                            collection.add(
-                                documents=[json.dumps(job)],
-                                ids=[f"{search_key}_{i}"],
-                                metadatas=[{"job_title": job_title}]
-                            )
-                        break  # Success
-            except Exception as e:
-                log_path = os.path.join("logs", "enrichment_failures.log")
-                os.makedirs("logs", exist_ok=True)
-                with open(log_path, "a", encoding="utf-8") as log:
-                    log.write(f"{datetime.now()} - Attempt {attempt+1} failed: {str(e)}\n")
-                if attempt == 2:
-                    st.warning("❌ Enrichment failed after 3 attempts. Showing raw jobs.")
-                    enriched_jobs = raw_jobs
+        # Spend the enrichment budget on the most relevant postings
+        candidates = prerank_jobs(raw_jobs, user_summary, ENRICH_TOP_N, profile_vector=profile_vector)
+        cached, stale, missing = enrichment_cache.lookup(candidates, profile_key)
+        if cached:
+            st.info(f"✅ Loaded {len(cached)} enriched results from local cache.")
+        if stale:
+            # Show the stale results now and refresh them in the background;
+            # jobs that only got a raw-data placeholder keep their stale entry
+            enrichment_cache.revalidate(
+                [candidates[i] for i in stale], profile_key,
+                lambda jobs: [
+                    None if is_raw_fallback(job) else job
+                    for job in run_enrichment(jobs, user_summary, competencies=competencies, profile_vector=profile_vector)
+                ]
+            )
+
+        fresh = {}
+        if missing:
+            missing_jobs = [candidates[i] for i in missing]
+            enriched = enrich_with_ai(missing_jobs)
+            if enriched is None:
+                st.warning("❌ Enrichment failed after 3 attempts. Showing raw jobs.")
+                enriched = missing_jobs
+            fresh = dict(zip(missing, enriched))
+
+        enriched_jobs = [cached.get(i) or fresh.get(i) for i in range(len(candidates))]
+        enriched_jobs = [job for job in enriched_jobs if job]
+        # Scores are computed locally and reproducibly, so rank by them
+        enriched_jobs.sort(key=lambda j: -int(j.get("match_score", 0) or 0))
+        # Memoised for the profile (persisted with a TTL), so only when every job is a real
+        # enrichment; raw postings and placeholders are retried on the next search
+        if len(fresh) == len(missing) and all(is_enriched(job) for job in enriched_jobs):
+            session_results[results_key] = enriched_jobs
     else:
         st.warning("⚠️ No jobs found from Search API.")
         enriched_jobs = []
@@ -137,6 +190,9 @@ def render_jobs(jobs):
 
                 if "link" in job:
                     st.markdown(f"[🔗 View Job Posting]({job['link']})")
+                other_links = [o for o in job.get("apply_options", []) if o.get("link") != job.get("link")]
+                if other_links:
+                    st.markdown("Also listed on: " + " · ".join(f"[{o.get('title', 'Apply')}]({o['link']})" for o in other_links))
 
                 unique_key = f"{section_key}_{i}_{title[:10]}_{company[:10]}"
                 if st.button(f"⭐️ I'm interested", key=unique_key):
@@ -146,6 +202,7 @@ def render_jobs(jobs):
                     st.session_state.setdefault("summary_result", user_summary)
                     st.session_state.setdefault("final_competency_input", [])
                     st.session_state["redirect_gap"] = True
+                    save_session(st.session_state)
                     st.switch_page("pages/gap_analyzer.py")
 
             with col2:
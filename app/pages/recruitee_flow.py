@@ -10,6 +10,8 @@ root_path = Path(__file__).resolve().parent.parent.parent
 if str(root_path) not in sys.path:
     sys.path.append(str(root_path))
 
+from backend.step_store import start_profile
+
 # Page config
 st.set_page_config(page_title="📤 Share Your Profile", page_icon="📤", layout="centered")
 st.sidebar.title("📤 Share Your Profile")
@@ -65,8 +67,9 @@ if st.button("🚀 Analyze Your Profile"):
         st.error("⚠️ Please upload a CV or fill out at least one profile input.")
         st.stop()
 
-    # Save text to be summarized later
+    # Save text to be summarized later; a new input invalidates the previous profile's stored results
     st.session_state["raw_input_text"] = input_text
+    start_profile(st.session_state, input_text, st.session_state.get("cv_text", ""))
 
     # Redirect to next page immediately
     st.switch_page("pages/competency_summary.py")
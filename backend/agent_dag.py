@@ -0,0 +1,106 @@
+# backend/agent_dag.py
+
+import json
+import time
+import asyncio
+import hashlib
+import inspect
+
+
+def _fingerprint(value) -> str:
+    material = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AgentDAG:
+    """
+    Runs agents as a dependency graph on one event loop.
+
+    Each node names the inputs it needs (flow inputs or other nodes) and is
+    called with them as keyword arguments; its return value is the node's
+    output. A node starts as soon as its inputs are ready, so independent
+    branches run concurrently. Sync functions run in a worker thread.
+
+    Pass the same `state` dict (e.g. from st.session_state) to later runs:
+    nodes whose inputs are unchanged reuse their previous output, so a
+    changed input only re-runs the nodes downstream of it.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.timings = {}  # seconds per node in the last run
+
+    def add(self, name: str, func, inputs=()):
+        if name in self.nodes:
+            raise ValueError(f"Node '{name}' is already defined")
+        self.nodes[name] = (func, tuple(inputs))
+        return self
+
+    def _check(self, flow_inputs):
+        for name, (_, inputs) in self.nodes.items():
+            for dep in inputs:
+                if dep not in self.nodes and dep not in flow_inputs:
+                    raise ValueError(f"Node '{name}' needs '{dep}', which is neither a node nor a flow input")
+
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle in agent graph at '{name}'")
+            visiting.add(name)
+            for dep in self.nodes[name][1]:
+                if dep in self.nodes:
+                    visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.nodes:
+            visit(name)
+
+    async def run(self, inputs: dict, state: dict = None, on_done=None) -> dict:
+        """
+        Run every node and return {name: output} for flow inputs and nodes.
+        state keeps outputs between runs; on_done(name, output, seconds, reused)
+        is called as each node finishes.
+        """
+        self._check(inputs)
+        state = {} if state is None else state
+        self.timings = {}
+        tasks = {}
+
+        async def run_node(name):
+            func, deps = self.nodes[name]
+            kwargs = {}
+            for dep in deps:
+                kwargs[dep] = await tasks[dep] if dep in tasks else inputs[dep]
+
+            key = _fingerprint(kwargs)
+            previous = state.get(name)
+            start = time.perf_counter()
+            if previous is not None and previous[0] == key:
+                output, reused = previous[1], True
+            else:
+                if inspect.iscoroutinefunction(func):
+                    output = await func(**kwargs)
+                else:
+                    output = await asyncio.to_thread(func, **kwargs)
+                state[name] = (key, output)
+                reused = False
+
+            seconds = time.perf_counter() - start
+            self.timings[name] = seconds
+            if on_done:
+                on_done(name, output, seconds, reused)
+            return output
+
+        for name in self.nodes:
+            tasks[name] = asyncio.ensure_future(run_node(name))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        return dict(inputs, **{name: task.result() for name, task in tasks.items()})
@@ -1,4 +1,5 @@
 from backend.llm_api import call_apilogy_llm
+from backend.rag_engine import keep_shortlisted
 import asyncio
 import json
 import re
@@ -31,9 +32,11 @@ Available Competencies:
     try:
         # Extract only the JSON part if extra text is present
         match = re.search(r"\[\s*{.*?}\s*]", response, re.DOTALL)
-        if match:
-            return json.loads(match.group(0))
-        return json.loads(response)
+        strengths = json.loads(match.group(0) if match else response)
     except json.JSONDecodeError:
         print("⚠️ Failed to parse LLM response:", response)
         return []
+
+    levels = {str(s.get("competency", "")).strip().lower(): s.get("level") for s in strengths if isinstance(s, dict)}
+    kept = keep_shortlisted([s.get("competency", "") for s in strengths if isinstance(s, dict)], competency_list, "CV strengths")
+    return [{"competency": name, "level": levels[name.strip().lower()]} for name in kept]
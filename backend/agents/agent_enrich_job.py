@@ -1,38 +1,45 @@
 # backend/agents/agent_enrich_job.py
 
+import os
 import json
 import httpx
-from backend.llm_api import call_apilogy_llm
+import asyncio
+from backend.llm_api import call_apilogy_llm, stream_apilogy_llm
+from backend.async_runtime import run_sync
+from backend.json_stream import iter_json_array
+from backend.job_ranker import prerank_jobs
+from backend.enrichment_cache import get_job_facts_cache, JOB_FACTS_KEY
+from backend.job_scoring import score_jobs, local_fit_reason
 
-async def enrich_and_score_jobs(jobs, user_summary):
-    try:
-        if not jobs:
-            return []
+# Chunked enrichment settings (override in .env)
+ENRICH_CHUNK_SIZE = int(os.getenv("ENRICH_CHUNK_SIZE", "5"))
+ENRICH_MAX_CONCURRENCY = int(os.getenv("ENRICH_MAX_CONCURRENCY", "4"))
 
-        trimmed_jobs = jobs[:5]  # Limit to reduce load
+# Raw search fields worth sending to the facts prompt
+RAW_PROMPT_FIELDS = ["title", "company_name", "location", "via", "description", "detected_extensions", "apply_link", "sharing_link"]
+# Compact facts the scoring prompt needs to judge fit
+SCORING_FIELDS = ["role", "company", "industry", "location", "description"]
 
-        prompt = f"""
-You are a job matching assistant.
 
-Given a user's profile and a list of job posts, return for each job:
+def build_facts_prompt(raw_jobs):
+    trimmed = [{k: job[k] for k in RAW_PROMPT_FIELDS if job.get(k)} for job in raw_jobs]
+    return f"""
+You are a job data assistant.
+
+For each job post below, extract these facts (they must not depend on who is applying):
 - role
 - company
 - company_type (e.g., Private, Government, Startup)
 - location
 - industry
 - pay_usd (estimated salary range per month)
-- fit_reason (why this job matches the user’s profile)
-- match_score (0 to 100)
 - description (brief 1–2 sentence summary)
 - link (application or view link)
 
-User Profile:
-{user_summary}
-
 Jobs (raw):
-{json.dumps(trimmed_jobs, indent=2)}
+{json.dumps(trimmed, indent=2)}
 
-Respond only in JSON format:
+Respond only in JSON format, one object per job in the same order:
 [
   {{
     "role": "Job Title",
@@ -41,47 +48,287 @@ Respond only in JSON format:
     "location": "City, Country",
     "industry": "Field",
     "pay_usd": "Approx USD/month",
-    "fit_reason": "Why this fits the user",
-    "match_score": 0-100,
     "description": "1–2 sentence job summary",
     "link": "Direct job link"
   }}
 ]
 """
 
-        for attempt in range(3):
-            try:
-                response = await call_apilogy_llm(prompt)
-                parsed = json.loads(response)
-
-                enriched_results = []
-                for enriched, raw in zip(parsed, trimmed_jobs):
-                    # Ensure fallbacks for critical fields
-                    enriched.setdefault("description", raw.get("description", "")[:300])
-                    enriched.setdefault("link", raw.get("apply_link") or raw.get("sharing_link", ""))
-                    enriched.setdefault("role", raw.get("title", "Unknown Role"))
-                    enriched.setdefault("company", raw.get("company_name", "Unknown Company"))
-                    enriched.setdefault("match_score", 0)
-                    enriched.setdefault("fit_reason", "Not provided.")
-
-                    # Fallback to raw job if enrichment is clearly missing
-                    if not enriched.get("fit_reason") or enriched.get("match_score", 0) == 0:
-                        enriched["fit_reason"] = f"Auto-filled from raw data. Role: {raw.get('title', '')}"
-                        enriched["match_score"] = 20  # Default minimal match score to ensure ranking
-
-                    enriched_results.append(enriched)
-
-                return enriched_results
-
-            except json.JSONDecodeError:
-                print(f"Attempt {attempt + 1}: Invalid JSON from LLM")
-            except httpx.HTTPStatusError as e:
-                print(f"Attempt {attempt + 1}: HTTP error - {e}")
-            except Exception as e:
-                print(f"Attempt {attempt + 1}: Unexpected error - {e}")
+def build_scoring_prompt(facts, user_summary):
+    compact = [{k: f.get(k, "") for k in SCORING_FIELDS} for f in facts]
+    return f"""
+You are a job matching assistant.
+
+Given a user's profile and a list of jobs, return for each job:
+- fit_reason (why this job matches the user’s profile)
+- match_score (0 to 100)
+
+User Profile:
+{user_summary}
+
+Jobs:
+{json.dumps(compact, indent=2)}
+
+Respond only in JSON format, one object per job in the same order:
+[
+  {{
+    "fit_reason": "Why this fits the user",
+    "match_score": 0-100
+  }}
+]
+"""
+
+def build_fit_reason_prompt(facts, local_scores, user_summary):
+    compact = [
+        dict({k: f.get(k, "") for k in ("role", "company", "industry")},
+             match_score=score["match_score"],
+             matched_competencies=score["matched_competencies"],
+             missing_competencies=score["missing_competencies"])
+        for f, score in zip(facts, local_scores)
+    ]
+    return f"""
+You are a job matching assistant.
+
+Each job below already has a match score for this user. For each job, write a
+fit_reason: 1–2 sentences on why the job fits the user's profile, mentioning
+the matched competencies and the main gaps. Do not change or restate the score.
+
+User Profile:
+{user_summary}
+
+Jobs:
+{json.dumps(compact, indent=2)}
+
+Respond only in JSON format, one object per job in the same order:
+[
+  {{
+    "fit_reason": "Why this fits the user"
+  }}
+]
+"""
+
+def apply_raw_fallbacks(enriched, raw):
+    # Ensure fallbacks for critical fields
+    enriched.setdefault("description", raw.get("description", "")[:300])
+    enriched.setdefault("link", raw.get("apply_link") or raw.get("sharing_link", ""))
+    enriched.setdefault("apply_options", raw.get("apply_options", []))  # every board listing this job
+    enriched.setdefault("role", raw.get("title", "Unknown Role"))
+    enriched.setdefault("company", raw.get("company_name", "Unknown Company"))
+    enriched.setdefault("match_score", 0)
+    enriched.setdefault("fit_reason", "Not provided.")
 
-        return []  # All attempts failed
+    # Fallback to raw job if enrichment is clearly missing (a local score of 0 is a real score)
+    if enriched.get("score_source") != "local" and (not enriched.get("fit_reason") or enriched.get("match_score", 0) == 0):
+        enriched["fit_reason"] = f"Auto-filled from raw data. Role: {raw.get('title', '')}"
+        enriched["match_score"] = 20  # Default minimal match score to ensure ranking
+        enriched["score_source"] = "raw"
+
+    return enriched
+
+def is_raw_fallback(enriched):
+    """True for the placeholder apply_raw_fallbacks writes when neither the LLM nor local scoring produced a score."""
+    return enriched.get("score_source") == "raw"
+
+def is_enriched(job):
+    """True for a job scored by the LLM or locally; False for a raw posting or a raw-data placeholder."""
+    return "match_score" in job and not is_raw_fallback(job)
+
+async def _call_json_array(prompt, label):
+    """Ask the LLM for a JSON array, with up to 3 attempts; [] if all fail."""
+    for attempt in range(3):
+        try:
+            response = await call_apilogy_llm(prompt, refresh=attempt > 0)
+            parsed = json.loads(response)
+            if isinstance(parsed, list):
+                return parsed
+            print(f"Attempt {attempt + 1}: {label} reply is not a JSON array")
+        except json.JSONDecodeError:
+            print(f"Attempt {attempt + 1}: Invalid JSON from LLM ({label})")
+        except httpx.HTTPError as e:
+            print(f"Attempt {attempt + 1}: HTTP error - {e}")
+            break  # llm_api has already retried with backoff
+        except Exception as e:
+            print(f"Attempt {attempt + 1}: Unexpected error - {e}")
+
+    return []  # All attempts failed
+
+def _job_facts_cache():
+    try:
+        return get_job_facts_cache()
+    except Exception as e:
+        print(f"⚠️ Job facts cache unavailable: {e}")
+        return None
+
+async def extract_job_facts(raw_jobs):
+    """Stage one: user-independent facts for each job (same order; {} where extraction failed)."""
+    facts = await _call_json_array(build_facts_prompt(raw_jobs), "job facts")
+    facts = [f if isinstance(f, dict) else {} for f in facts[:len(raw_jobs)]]
+    return facts + [{} for _ in raw_jobs[len(facts):]]
+
+async def get_job_facts(raw_jobs):
+    """
+    Job facts from the global cache, extracting only the postings it hasn't
+    seen. Stale facts are served and refreshed in the background. Chroma
+    calls run in a worker thread so they don't stall the shared event loop.
+    """
+    cache = await asyncio.to_thread(_job_facts_cache)
+    if cache is None:
+        return await extract_job_facts(raw_jobs)
+
+    found, stale, missing = await asyncio.to_thread(cache.lookup, raw_jobs, JOB_FACTS_KEY)
+    if stale:
+        cache.revalidate(
+            [raw_jobs[i] for i in stale], JOB_FACTS_KEY, lambda jobs: run_sync(extract_job_facts(jobs))
+        )
+    if missing:
+        missing_jobs = [raw_jobs[i] for i in missing]
+        extracted = await extract_job_facts(missing_jobs)
+        await asyncio.to_thread(
+            cache.put,
+            [job for job, facts in zip(missing_jobs, extracted) if facts],
+            JOB_FACTS_KEY,
+            [facts for facts in extracted if facts],
+        )
+        found.update(zip(missing, extracted))
+    return [found[i] for i in range(len(raw_jobs))]
+
+async def score_job_facts(facts, user_summary):
+    """Stage two: per-user fit_reason and match_score for each job's facts."""
+    scores = await _call_json_array(build_scoring_prompt(facts, user_summary), "job scoring")
+    return [s if isinstance(s, dict) else {} for s in scores[:len(facts)]]
+
+def local_scores_for(raw_jobs, user_summary, competencies, profile_vector=None):
+    """Local match scores for raw jobs, or None if the scoring engine can't run (LLM scoring is used instead)."""
+    try:
+        return score_jobs(raw_jobs, user_summary, competencies, profile_vector=profile_vector)
+    except Exception as e:
+        print(f"⚠️ Local match scoring unavailable, asking the LLM to score: {e}")
+        return None
+
+def merge_local_score(facts, local_score, reason):
+    fit_reason = (reason or {}).get("fit_reason") or local_fit_reason(local_score)
+    return {**facts, **local_score, "fit_reason": fit_reason}
+
+async def write_fit_reasons(facts, local_scores, user_summary):
+    """The LLM's only job when scores are local: one fit_reason per job ({} where it failed)."""
+    reasons = await _call_json_array(build_fit_reason_prompt(facts, local_scores, user_summary), "fit reasons")
+    reasons = [r if isinstance(r, dict) else {} for r in reasons[:len(facts)]]
+    return reasons + [{} for _ in facts[len(reasons):]]
+
+async def enrich_job_chunk(trimmed_jobs, user_summary, competencies=None, profile_vector=None):
+    """
+    Enrich one batch of raw jobs: cached/extracted job facts, then a local
+    match score with an LLM-written fit_reason. If local scoring can't run,
+    one LLM call scores the batch instead ([] if that fails).
+
+    Local scoring is CPU-bound embedding work, so it runs in a worker thread
+    alongside the facts lookup instead of blocking the shared event loop.
+    """
+    facts, local_scores = await asyncio.gather(
+        get_job_facts(trimmed_jobs),
+        asyncio.to_thread(local_scores_for, trimmed_jobs, user_summary, competencies, profile_vector),
+    )
+    if local_scores is None:
+        scores = await score_job_facts(facts, user_summary)
+        return [apply_raw_fallbacks({**f, **s}, raw) for f, s, raw in zip(facts, scores, trimmed_jobs)]
+
+    reasons = await write_fit_reasons(facts, local_scores, user_summary)
+    return [
+        apply_raw_fallbacks(merge_local_score(f, score, reason), raw)
+        for f, score, reason, raw in zip(facts, local_scores, reasons, trimmed_jobs)
+    ]
+
+async def enrich_and_score_jobs(jobs, user_summary, top_n=None, competencies=None, profile_vector=None):
+    try:
+        if not jobs:
+            return []
+
+        # Spend the LLM budget on the most relevant jobs, not the first ones
+        trimmed_jobs = await asyncio.to_thread(prerank_jobs, jobs, user_summary, top_n, profile_vector=profile_vector)
+        return await enrich_job_chunk(trimmed_jobs, user_summary, competencies, profile_vector)
 
     except Exception as e:
         print(f"Outer error in enrich_and_score_jobs: {e}")
         return []
+
+async def enrich_and_score_jobs_chunked(jobs, user_summary, top_n=None, chunk_size=None, max_concurrency=None,
+                                        competencies=None, profile_vector=None):
+    """
+    Enrich any number of jobs by splitting them into fixed-size chunks that are
+    sent to the LLM concurrently (at most max_concurrency at a time) and merged
+    back in input order. A failing chunk is retried on its own; if it still
+    fails its jobs are returned with raw-data fallbacks.
+
+    top_n=None enriches every job; otherwise the top_n pre-ranked jobs.
+    competencies (final_competency_input) feed the local match score;
+    profile_vector (see get_profile_embedding) saves re-embedding the summary.
+    """
+    if not jobs:
+        return []
+
+    chunk_size = chunk_size or ENRICH_CHUNK_SIZE
+    semaphore = asyncio.Semaphore(max_concurrency or ENRICH_MAX_CONCURRENCY)
+
+    if top_n is None:
+        selected = list(jobs)
+    else:
+        selected = await asyncio.to_thread(prerank_jobs, jobs, user_summary, top_n, profile_vector=profile_vector)
+    chunks = [selected[i:i + chunk_size] for i in range(0, len(selected), chunk_size)]
+
+    async def run_chunk(index, chunk):
+        async with semaphore:
+            try:
+                enriched = await enrich_job_chunk(chunk, user_summary, competencies, profile_vector)
+            except Exception as e:
+                print(f"Chunk {index + 1}/{len(chunks)} failed: {e}")
+                enriched = []
+        if not enriched:
+            print(f"Chunk {index + 1}/{len(chunks)}: using raw job data")
+        # Pad short or failed chunks so every input job keeps its place
+        enriched += [apply_raw_fallbacks({}, raw) for raw in chunk[len(enriched):]]
+        return enriched
+
+    results = await asyncio.gather(*(run_chunk(i, c) for i, c in enumerate(chunks)))
+    return [job for chunk_result in results for job in chunk_result]
+
+async def stream_enriched_jobs(jobs, user_summary, top_n=None, competencies=None, profile_vector=None):
+    """
+    Streaming counterpart of enrich_and_score_jobs: yields each enriched job as
+    soon as the LLM finishes writing it. With local scores, jobs the stream
+    didn't cover get a locally written fit_reason; otherwise falls back to the
+    retrying non-streaming call if the stream produces nothing usable.
+    """
+    if not jobs:
+        return
+
+    trimmed_jobs = await asyncio.to_thread(prerank_jobs, jobs, user_summary, top_n, profile_vector=profile_vector)
+    facts, local_scores = await asyncio.gather(
+        get_job_facts(trimmed_jobs),
+        asyncio.to_thread(local_scores_for, trimmed_jobs, user_summary, competencies, profile_vector),
+    )
+    if local_scores is None:
+        prompt = build_scoring_prompt(facts, user_summary)
+    else:
+        prompt = build_fit_reason_prompt(facts, local_scores, user_summary)
+
+    def merged(index, piece):
+        if local_scores is None:
+            return apply_raw_fallbacks({**facts[index], **piece}, trimmed_jobs[index])
+        return apply_raw_fallbacks(merge_local_score(facts[index], local_scores[index], piece), trimmed_jobs[index])
+
+    emitted = 0
+    try:
+        async for piece in iter_json_array(stream_apilogy_llm(prompt)):
+            if emitted >= len(trimmed_jobs) or not isinstance(piece, dict):
+                continue
+            yield merged(emitted, piece)
+            emitted += 1
+    except Exception as e:
+        print(f"Streaming enrichment failed after {emitted} jobs: {e}")
+
+    if local_scores is not None:
+        for index in range(emitted, len(trimmed_jobs)):
+            yield merged(index, {})
+    elif emitted == 0:
+        for enriched in await enrich_and_score_jobs(trimmed_jobs, user_summary, top_n=len(trimmed_jobs)):
+            yield enriched
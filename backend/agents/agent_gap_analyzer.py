@@ -1,14 +1,16 @@
 # backend/agents/agent_gap_analyzer.py
 
 import json
-from backend.llm_api import call_apilogy_llm
+import httpx
+from backend.llm_api import call_apilogy_llm, stream_apilogy_llm
+from backend.json_stream import iter_json_array
 import asyncio
 
-async def analyze_gaps(job_json: dict, summary_result: str, competencies: list) -> dict:
+def build_gap_prompt(job_json: dict, summary_result: str, competencies: list) -> str:
     job_info = json.dumps(job_json, indent=2)
     competency_text = json.dumps(competencies, indent=2)
 
-    prompt = f"""
+    return f"""
 You are a career coach AI.
 
 Compare a job's requirements with a user's current competencies and summarized CV.
@@ -57,15 +59,41 @@ User Competency Input:
 Only return valid JSON.
 """
 
+async def analyze_gaps(job_json: dict, summary_result: str, competencies: list) -> dict:
+    prompt = build_gap_prompt(job_json, summary_result, competencies)
+
     for attempt in range(3):
         try:
-            response = await call_apilogy_llm(prompt)
+            response = await call_apilogy_llm(prompt, refresh=attempt > 0)
             parsed = json.loads(response)
             if "gaps" in parsed:
                 return parsed
         except json.JSONDecodeError:
             print(f"Attempt {attempt + 1}: Invalid JSON from LLM")
+        except httpx.HTTPError as e:
+            print(f"Attempt {attempt + 1}: HTTP error - {e}")
+            break  # llm_api has already retried with backoff
         except Exception as e:
             print(f"Attempt {attempt + 1}: Gap analysis failed: {e}")
 
     return {"job_title": job_json.get("title", ""), "gaps": []}
+
+async def stream_gaps(job_json: dict, summary_result: str, competencies: list):
+    """
+    Yield each gap entry as soon as the LLM finishes writing it. Falls back to
+    the retrying analyze_gaps call if the stream produces no gaps.
+    """
+    prompt = build_gap_prompt(job_json, summary_result, competencies)
+
+    emitted = 0
+    try:
+        async for gap in iter_json_array(stream_apilogy_llm(prompt)):
+            if isinstance(gap, dict):
+                emitted += 1
+                yield gap
+    except Exception as e:
+        print(f"Streaming gap analysis failed after {emitted} gaps: {e}")
+
+    if emitted == 0:
+        for gap in (await analyze_gaps(job_json, summary_result, competencies)).get("gaps", []):
+            yield gap
@@ -1,6 +1,7 @@
 # backend/agents/agent_learning_plan.py
 
 import json
+import httpx
 from backend.llm_api import call_apilogy_llm
 import asyncio
 
@@ -52,13 +53,16 @@ Only return valid JSON. Do not include explanations.
 
     for attempt in range(3):
         try:
-            response = await call_apilogy_llm(prompt)
+            response = await call_apilogy_llm(prompt, refresh=attempt > 0)
             parsed = json.loads(response)
 
             if "plan" in parsed and isinstance(parsed["plan"], list):
                 return parsed
         except json.JSONDecodeError:
             print(f"Attempt {attempt + 1}: Invalid JSON from LLM")
+        except httpx.HTTPError as e:
+            print(f"Attempt {attempt + 1}: HTTP error - {e}")
+            break  # llm_api has already retried with backoff
         except Exception as e:
             print(f"Attempt {attempt + 1}: Learning plan generation error - {e}")
 
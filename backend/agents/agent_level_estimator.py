@@ -1,5 +1,7 @@
 from backend.llm_api import call_apilogy_llm
 import asyncio
+import json
+import re
 
 async def estimate_user_level(competency_name: str, profile_summary: str) -> int:
     prompt = f"""
@@ -17,3 +19,59 @@ Reply with ONLY a single digit from 1 to 5. No explanation.
         return min(max(int(result.strip()), 1), 5)
     except:
         return 3
+
+async def estimate_user_levels(competency_names: list, profile_summary: str, max_concurrency: int = 5) -> dict:
+    """
+    Estimate levels for several competencies against one profile summary.
+
+    All competencies are scored in a single structured call; any the LLM leaves
+    out are estimated individually, at most max_concurrency at a time.
+    Returns {competency_name: level} in the order given.
+    """
+    if not competency_names:
+        return {}
+
+    list_str = "\n".join([f"- {c}" for c in competency_names])
+
+    prompt = f"""
+Given this summary of a user's professional experience:
+
+{profile_summary}
+
+Estimate the user's level (1 to 5) for each of the following competencies:
+{list_str}
+
+Output ONLY a valid JSON object mapping each competency name exactly as written above to a single integer from 1 to 5:
+{{ "Competency Name": 3, ... }}
+
+Do not include explanations, markdown, or any text before/after the JSON.
+"""
+
+    levels = {}
+    try:
+        response = await call_apilogy_llm(prompt)
+        match = re.search(r"{.*}", response, re.DOTALL)
+        parsed = json.loads(match.group(0) if match else response)
+        by_lower = {str(k).strip().lower(): v for k, v in parsed.items()}
+        for name in competency_names:
+            value = by_lower.get(name.lower())
+            if value is not None:
+                try:
+                    levels[name] = min(max(int(value), 1), 5)
+                except (TypeError, ValueError):
+                    pass
+    except Exception as e:
+        print("⚠️ Batch level estimation failed, estimating one by one:", e)
+
+    missing = [name for name in competency_names if name not in levels]
+    if missing:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def estimate_one(name):
+            async with semaphore:
+                return await estimate_user_level(name, profile_summary)
+
+        for name, level in zip(missing, await asyncio.gather(*(estimate_one(n) for n in missing))):
+            levels[name] = level
+
+    return {name: levels[name] for name in competency_names}
@@ -1,6 +1,7 @@
 # backend/agents/agent_role_competency_mapper.py
 
 from backend.llm_api import call_apilogy_llm
+from backend.rag_engine import keep_shortlisted
 import asyncio
 
 async def map_competencies_for_role(role_name: str, competency_list: list) -> list:
@@ -18,4 +19,5 @@ Available competencies:
 """
 
     response = await call_apilogy_llm(prompt)
-    return [c.strip() for c in response.split(",") if c.strip()]
+    picks = [c.strip() for c in response.split(",") if c.strip()]
+    return keep_shortlisted(picks, competency_list, "Role competency mapper")
@@ -0,0 +1,117 @@
+# backend/async_runtime.py
+
+import atexit
+import asyncio
+import threading
+import concurrent.futures
+
+# How often run_sync wakes up to call on_poll while it waits
+POLL_INTERVAL = 0.05
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide event loop, starting its background thread on first use."""
+    global _loop, _thread
+    if _loop is None or not _thread.is_alive():
+        with _lock:
+            if _loop is None or not _thread.is_alive():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, daemon=True, name="async-runtime")
+                thread.start()
+                _loop, _thread = loop, thread
+    return _loop
+
+
+def in_runtime_thread() -> bool:
+    return _thread is not None and threading.current_thread() is _thread
+
+
+def submit(coro) -> concurrent.futures.Future:
+    """Schedule a coroutine on the background loop and return a concurrent.futures.Future for it."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run_sync(coro, timeout: float = None, on_poll=None):
+    """
+    Run a coroutine on the background loop and block until it finishes.
+
+    on_poll() is called from the waiting thread every POLL_INTERVAL seconds
+    and once at the end, so Streamlit code can drain progress the coroutine
+    queued up (st.* calls only work from the script thread).
+    """
+    if in_runtime_thread():
+        coro.close()
+        raise RuntimeError("run_sync() called from the runtime loop; await the coroutine instead")
+
+    future = submit(coro)
+    if on_poll is None:
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    loop = get_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    # wait() rather than result(POLL_INTERVAL): the coroutine may itself raise TimeoutError
+    while not concurrent.futures.wait([future], POLL_INTERVAL).done:
+        on_poll()
+        if deadline is not None and loop.time() >= deadline:
+            future.cancel()
+            raise TimeoutError(f"Coroutine did not finish within {timeout}s")
+    on_poll()
+    return future.result()
+
+
+def iterate_sync(agen, timeout: float = None):
+    """Consume an async generator on the background loop as a plain generator."""
+    done = object()
+
+    async def next_item():
+        try:
+            return await agen.__anext__()
+        except StopAsyncIteration:
+            return done
+
+    finished = False
+    try:
+        while True:
+            item = run_sync(next_item(), timeout)
+            if item is done:
+                finished = True
+                return
+            yield item
+    finally:
+        if not finished:
+            run_sync(agen.aclose(), timeout)
+
+
+def shutdown(timeout: float = 5):
+    """Cancel outstanding tasks and stop the background loop."""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+    if loop is None or not thread.is_alive():
+        return
+
+    async def cancel_pending():
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(timeout)
+    except Exception as e:
+        print(f"⚠️ Failed to cancel pending tasks: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout)
+    # The loop is left unclosed so the HTTP clients' own atexit hooks can still close on it
+
+
+atexit.register(shutdown)
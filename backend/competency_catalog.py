@@ -0,0 +1,82 @@
+# backend/competency_catalog.py
+
+import os
+import threading
+import pandas as pd
+
+DEFAULT_CSV_PATH = "data/direktori_komp.csv"
+
+
+def _normalize(name) -> str:
+    return str(name).strip().lower()
+
+
+class CompetencyCatalog:
+    """
+    In-memory view of the competency CSV with a case-insensitive name index.
+
+    The file is parsed once and re-parsed only when its mtime changes, so
+    lookups cost a dict access plus an os.stat.
+    """
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH):
+        self.csv_path = csv_path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._names = []
+        self._index = {}
+
+    def _refresh(self):
+        mtime = os.stat(self.csv_path).st_mtime_ns
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+
+            df = pd.read_csv(self.csv_path, sep="|")
+            df = df.dropna(subset=["Competency", "Definition"]).reset_index(drop=True)
+
+            names = []
+            index = {}
+            for row in df.to_dict(orient="records"):
+                key = _normalize(row["Competency"])
+                if key in index:
+                    continue  # First row wins, as with the old DataFrame lookup
+                names.append(row["Competency"])
+                index[key] = {"definition": row["Definition"], "metadata": row}
+
+            self._names, self._index, self._mtime = names, index, mtime
+
+    def names(self) -> list:
+        """All competency names in file order."""
+        self._refresh()
+        return list(self._names)
+
+    def get(self, name: str):
+        """Definition and metadata (including L1–L5) for a name, or None."""
+        if not name:
+            return None
+        self._refresh()
+        return self._index.get(_normalize(name))
+
+    def __contains__(self, name) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._names)
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_competency_catalog(csv_path=DEFAULT_CSV_PATH) -> CompetencyCatalog:
+    """Return the process-wide catalog for a CSV file."""
+    catalog = _catalogs.get(csv_path)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.setdefault(csv_path, CompetencyCatalog(csv_path))
+    return catalog
@@ -0,0 +1,65 @@
+# backend/competency_flow.py
+
+from backend.agent_dag import AgentDAG
+from backend.agents.agent_profile_summarizer import summarize_user_profile
+from backend.agents.agent_level_estimator import estimate_user_levels
+from backend.agents.agent_role_competency_mapper import map_competencies_for_role
+from backend.agents.agent_extract_latest_job import extract_latest_job_role
+from backend.agents.agent_cv_strengths import extract_top_strengths
+from backend.rag_engine import query_competency_by_name, shortlist_competencies, chunk_text
+
+ROLE_COMPETENCIES_SHOWN = 5
+
+
+async def summary_node(input_text, summary_text):
+    return summary_text or await summarize_user_profile(input_text)
+
+
+async def job_role_node(summary):
+    return (await extract_latest_job_role(summary)) or "Unknown Role"
+
+
+def role_shortlist_node(job_role):
+    return shortlist_competencies([job_role])
+
+
+async def role_competencies_node(job_role, role_shortlist):
+    return await map_competencies_for_role(job_role, role_shortlist)
+
+
+def role_matches_node(role_competencies):
+    matches = [(comp, query_competency_by_name(comp)) for comp in role_competencies[:ROLE_COMPETENCIES_SHOWN]]
+    return [(comp, result) for comp, result in matches if result]
+
+
+async def user_levels_node(role_matches, summary):
+    return await estimate_user_levels([comp for comp, _ in role_matches], summary)
+
+
+def cv_shortlist_node(cv_text):
+    return shortlist_competencies(chunk_text(cv_text)) if cv_text else []
+
+
+async def strengths_node(cv_text, cv_shortlist):
+    return await extract_top_strengths(cv_text, cv_shortlist) if cv_text else []
+
+
+def build_competency_summary_dag() -> AgentDAG:
+    """
+    The competency summary flow. The CV branch (shortlist, strengths) only
+    needs the CV text, so it runs alongside the summary -> role -> role
+    competencies -> levels chain.
+
+    Flow inputs: input_text, summary_text (an existing summary, or ""), cv_text.
+    """
+    return (
+        AgentDAG()
+        .add("summary", summary_node, ["input_text", "summary_text"])
+        .add("job_role", job_role_node, ["summary"])
+        .add("role_shortlist", role_shortlist_node, ["job_role"])
+        .add("role_competencies", role_competencies_node, ["job_role", "role_shortlist"])
+        .add("role_matches", role_matches_node, ["role_competencies"])
+        .add("user_levels", user_levels_node, ["role_matches", "summary"])
+        .add("cv_shortlist", cv_shortlist_node, ["cv_text"])
+        .add("strengths", strengths_node, ["cv_text", "cv_shortlist"])
+    )
@@ -0,0 +1,121 @@
+# backend/embedding_cache.py
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Number of text embeddings kept in memory (override in .env)
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU of text -> normalised float32 embedding, keyed by a hash of
+    the text. Misses are encoded together in one batch. Returned vectors are
+    read-only because they are shared between callers.
+    """
+
+    def __init__(self, max_entries=EMBEDDING_CACHE_SIZE, model=None):
+        self.max_entries = max_entries
+        self._model = model
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_model(self):
+        if self._model is None:
+            from backend.rag_engine import get_embedding_model  # rag_engine imports this module
+            return get_embedding_model()
+        return self._model
+
+    def embed(self, texts: list) -> np.ndarray:
+        keys = [text_hash(t) for t in texts]
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        if missing:
+            encoded = self._get_model().encode(list(missing.values()), normalize_embeddings=True, convert_to_numpy=True)
+            encoded = np.asarray(encoded, dtype=np.float32)
+            encoded.setflags(write=False)
+            with self._lock:
+                for key, vector in zip(missing, encoded):
+                    self._entries[key] = vector
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        with self._lock:
+            self.misses += len(missing)
+            self.hits += len(keys) - len(missing)
+
+        return np.stack([found[key] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+_cache = EmbeddingCache()
+_profile_stats = {"hits": 0, "misses": 0}
+_profile_lock = threading.Lock()
+
+
+def embed_texts(texts: list) -> np.ndarray:
+    """Normalised embeddings for texts, served from the shared cache where possible."""
+    return _cache.embed(list(texts))
+
+
+def embed_text(text: str) -> np.ndarray:
+    return _cache.embed([text])[0]
+
+
+def get_profile_embedding(state, profile_text: str) -> np.ndarray:
+    """
+    The user's profile vector for this session. It is computed once per
+    distinct profile text and kept in `state` (e.g. st.session_state) so
+    every step of the flow reuses it.
+    """
+    key = text_hash(profile_text)
+    entry = state.get("profile_embedding")
+    if entry and entry.get("hash") == key:
+        with _profile_lock:
+            _profile_stats["hits"] += 1
+        return entry["vector"]
+
+    vector = embed_text(profile_text)
+    state["profile_embedding"] = {"hash": key, "vector": vector}
+    with _profile_lock:
+        _profile_stats["misses"] += 1
+    return vector
+
+
+def get_embedding_cache_stats() -> dict:
+    """Hit-rate counters for the shared text cache and the session profile vectors."""
+    lookups = _profile_stats["hits"] + _profile_stats["misses"]
+    return {
+        "texts": _cache.stats(),
+        "profile": dict(_profile_stats, hit_rate=_profile_stats["hits"] / lookups if lookups else 0.0),
+    }
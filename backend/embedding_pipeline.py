@@ -0,0 +1,71 @@
+# backend/embedding_pipeline.py
+
+import os
+import math
+import time
+import numpy as np
+
+# Bulk embedding settings (override in .env)
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_PROCESSES = int(os.getenv("EMBED_PROCESSES", "0"))  # 0 = one per CPU core
+# Below this many texts, starting worker processes costs more than it saves
+EMBED_MULTIPROCESS_MIN_TEXTS = int(os.getenv("EMBED_MULTIPROCESS_MIN_TEXTS", "2000"))
+
+
+def encode_texts(texts: list, batch_size: int = None, processes: int = None, model=None, verbose: bool = True):
+    """
+    Encode many texts into L2-normalised float32 vectors.
+
+    Texts are sorted by length before batching so each batch pads to a
+    similar length, and large inputs are spread over a pool of worker
+    processes (one per core by default). Results come back in input order.
+
+    Returns (embeddings, stats) where stats has texts, seconds, texts_per_sec
+    and processes.
+    """
+    batch_size = batch_size or EMBED_BATCH_SIZE
+    processes = processes or EMBED_PROCESSES or os.cpu_count() or 1
+    if model is None:
+        from backend.rag_engine import get_embedding_model  # rag_engine imports this module
+        model = get_embedding_model()
+    start = time.perf_counter()
+
+    if not texts:
+        dim = model.get_sentence_embedding_dimension()
+        return np.zeros((0, dim), dtype=np.float32), {"texts": 0, "seconds": 0.0, "texts_per_sec": 0.0, "processes": 0}
+
+    # Longest first: similar lengths share a batch, and peak memory is hit early
+    order = np.argsort([-len(t) for t in texts], kind="stable")
+    sorted_texts = [texts[i] for i in order]
+
+    if processes > 1 and len(texts) >= EMBED_MULTIPROCESS_MIN_TEXTS:
+        # Contiguous chunks of the sorted list keep per-worker lengths similar
+        chunk_size = max(batch_size, math.ceil(len(texts) / (processes * 4)))
+        pool = model.start_multi_process_pool(target_devices=["cpu"] * processes)
+        try:
+            embeddings = model.encode_multi_process(
+                sorted_texts, pool, batch_size=batch_size, chunk_size=chunk_size, normalize_embeddings=True
+            )
+        finally:
+            model.stop_multi_process_pool(pool)
+    else:
+        processes = 1
+        embeddings = model.encode(
+            sorted_texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True
+        )
+
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    result = np.empty_like(embeddings)
+    result[order] = embeddings
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "texts": len(texts),
+        "seconds": seconds,
+        "texts_per_sec": len(texts) / seconds if seconds > 0 else float("inf"),
+        "processes": processes,
+    }
+    if verbose:
+        print(f"🔢 Embedded {stats['texts']} texts in {seconds:.2f}s "
+              f"({stats['texts_per_sec']:.0f} texts/sec, {processes} process(es))")
+    return result, stats
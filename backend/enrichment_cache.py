@@ -0,0 +1,208 @@
+# backend/enrichment_cache.py
+
+import os
+import json
+import time
+import hashlib
+import threading
+from dotenv import load_dotenv
+
+from backend.job_dedup import job_fingerprint
+from backend.resources import get_chroma_client as get_shared_chroma_client
+
+load_dotenv()
+
+ENRICH_CACHE_PATH = os.getenv("ENRICH_CACHE_PATH", "chromadb_data")
+ENRICH_CACHE_COLLECTION = "enrichment_cache"
+LEGACY_COLLECTION = "enriched_jobs"  # title-keyed cache used before; dropped by the eviction job
+
+# Fresh for TTL, then served stale (and refreshed in the background) for STALE more seconds (override in .env)
+ENRICH_CACHE_TTL_SECONDS = float(os.getenv("ENRICH_CACHE_TTL_SECONDS", str(3 * 24 * 3600)))
+ENRICH_CACHE_STALE_SECONDS = float(os.getenv("ENRICH_CACHE_STALE_SECONDS", str(7 * 24 * 3600)))
+ENRICH_CACHE_MAX_ENTRIES = int(os.getenv("ENRICH_CACHE_MAX_ENTRIES", "5000"))
+
+# User-independent job facts (company type, industry, pay, summary): one entry per posting, shared by all users
+JOB_FACTS_COLLECTION = "job_facts"
+JOB_FACTS_KEY = "facts"
+JOB_FACTS_TTL_SECONDS = float(os.getenv("JOB_FACTS_TTL_SECONDS", str(30 * 24 * 3600)))
+JOB_FACTS_MAX_ENTRIES = int(os.getenv("JOB_FACTS_MAX_ENTRIES", "20000"))
+
+# Entries are looked up by id only; Chroma still wants a vector per record
+_PLACEHOLDER_EMBEDDING = [0.0]
+
+
+def profile_hash(*parts) -> str:
+    """Hash of everything about the user that an enrichment depends on (e.g. the profile summary)."""
+    material = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+class EnrichmentCache:
+    """
+    Enriched jobs stored in a Chroma collection under "<job fingerprint>:<profile hash>",
+    so a hit is always for this posting and this user's profile.
+
+    Entries younger than ttl_seconds are fresh. For stale_seconds after that
+    they are still served, but the caller should revalidate() them. Older
+    entries are misses. evict() removes dead entries and keeps the
+    collection at max_entries, oldest first.
+    """
+
+    def __init__(self, collection, ttl_seconds=ENRICH_CACHE_TTL_SECONDS,
+                 stale_seconds=ENRICH_CACHE_STALE_SECONDS, max_entries=ENRICH_CACHE_MAX_ENTRIES):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def entry_id(job: dict, profile_key: str) -> str:
+        return f"{job_fingerprint(job)}:{profile_key}"
+
+    def lookup(self, jobs: list, profile_key: str, now: float = None):
+        """
+        Return (found, stale, missing): found maps job index -> cached
+        enrichment (fresh or stale), stale and missing are lists of indexes.
+        """
+        now = now or time.time()
+        ids = [self.entry_id(job, profile_key) for job in jobs]
+        entries = {}
+        if ids:
+            got = self.collection.get(ids=list(dict.fromkeys(ids)), include=["documents", "metadatas"])
+            entries = {i: (doc, meta or {}) for i, doc, meta in zip(got["ids"], got["documents"], got["metadatas"])}
+
+        found, stale, missing = {}, [], []
+        for index, entry_id in enumerate(ids):
+            entry = entries.get(entry_id)
+            age = now - float(entry[1].get("created_at", 0)) if entry else None
+            if entry is None or age > self.ttl_seconds + self.stale_seconds:
+                missing.append(index)
+                continue
+            try:
+                found[index] = json.loads(entry[0])
+            except (TypeError, json.JSONDecodeError):
+                missing.append(index)
+                continue
+            if age > self.ttl_seconds:
+                stale.append(index)
+
+        with self._lock:
+            self.hits += len(found) - len(stale)
+            self.stale_hits += len(stale)
+            self.misses += len(missing)
+        return found, stale, missing
+
+    def put(self, jobs: list, profile_key: str, enriched: list, now: float = None):
+        """Store enrichments for jobs (same order); re-adding a job replaces its entry."""
+        now = now or time.time()
+        records = {}
+        for job, result in zip(jobs, enriched):
+            fingerprint = job_fingerprint(job)
+            records[f"{fingerprint}:{profile_key}"] = (
+                json.dumps(dict(result, job_fingerprint=fingerprint), ensure_ascii=False, default=str),
+                {"job_fingerprint": fingerprint, "profile_hash": profile_key, "created_at": now},
+            )
+        if not records:
+            return
+
+        self.collection.upsert(
+            ids=list(records),
+            documents=[doc for doc, _ in records.values()],
+            metadatas=[meta for _, meta in records.values()],
+            embeddings=[_PLACEHOLDER_EMBEDDING] * len(records),
+        )
+        if self.collection.count() > self.max_entries:
+            self.evict(now)
+
+    def revalidate(self, jobs: list, profile_key: str, refresh) -> bool:
+        """
+        Re-enrich stale jobs in a background thread and store the results.
+        refresh(jobs) must return enrichments in the same order; an empty
+        result (a failed refresh) leaves that job's stale entry in place. Jobs
+        already being refreshed are skipped. Returns False if there was nothing to do.
+        """
+        with self._lock:
+            pending = [job for job in jobs if self.entry_id(job, profile_key) not in self._refreshing]
+            keys = {self.entry_id(job, profile_key) for job in pending}
+            self._refreshing |= keys
+        if not pending:
+            return False
+
+        def run():
+            try:
+                refreshed = [(job, result) for job, result in zip(pending, refresh(pending) or []) if result]
+                if refreshed:
+                    self.put([job for job, _ in refreshed], profile_key, [result for _, result in refreshed])
+            except Exception as e:
+                print(f"⚠️ Background enrichment refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing -= keys
+
+        threading.Thread(target=run, daemon=True, name="enrichment-revalidate").start()
+        return True
+
+    def evict(self, now: float = None) -> int:
+        """Delete entries past their stale window, then the oldest ones beyond max_entries."""
+        now = now or time.time()
+        existing = self.collection.get(include=["metadatas"])
+        created = sorted(
+            (float((meta or {}).get("created_at", 0)), entry_id)
+            for entry_id, meta in zip(existing["ids"], existing["metadatas"])
+        )
+        expired = [entry_id for at, entry_id in created if now - at > self.ttl_seconds + self.stale_seconds]
+        alive = [entry_id for at, entry_id in created if now - at <= self.ttl_seconds + self.stale_seconds]
+        overflow = alive[:max(len(alive) - self.max_entries, 0)]
+
+        to_delete = expired + overflow
+        if to_delete:
+            self.collection.delete(ids=to_delete)
+        return len(to_delete)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "entries": self.collection.count(),
+        }
+
+
+_caches = {}
+_cache_lock = threading.Lock()
+
+
+def get_chroma_client(path: str = ENRICH_CACHE_PATH):
+    """Return the shared client for the cache directory (see backend/resources.py)."""
+    return get_shared_chroma_client(path)
+
+
+def _get_cache(name: str, **settings) -> EnrichmentCache:
+    if name not in _caches:
+        with _cache_lock:
+            if name not in _caches:
+                collection = get_chroma_client().get_or_create_collection(name=name)
+                _caches[name] = EnrichmentCache(collection, **settings)
+    return _caches[name]
+
+
+def get_enrichment_cache() -> EnrichmentCache:
+    """Return the process-wide per-user enrichment cache, opening chromadb_data on first use."""
+    return _get_cache(ENRICH_CACHE_COLLECTION)
+
+
+def get_job_facts_cache() -> EnrichmentCache:
+    """Return the global job facts cache; look entries up with JOB_FACTS_KEY as the profile key."""
+    return _get_cache(
+        JOB_FACTS_COLLECTION,
+        ttl_seconds=JOB_FACTS_TTL_SECONDS,
+        stale_seconds=JOB_FACTS_TTL_SECONDS,
+        max_entries=JOB_FACTS_MAX_ENTRIES,
+    )
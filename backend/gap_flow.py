@@ -0,0 +1,50 @@
+# backend/gap_flow.py
+
+import asyncio
+
+from backend.agents.agent_gap_analyzer import stream_gaps
+from backend.agents.agent_extract_job_requirements import extract_job_requirements
+from backend.agents.agent_learning_plan import generate_learning_plan
+from backend.enrichment_cache import profile_hash
+from backend.job_dedup import job_fingerprint
+
+
+def gap_analysis_key(job: dict, cv_summary: str, competencies: list) -> str:
+    """Memo key: the posting, the summary and the competencies the analysis was run for."""
+    return f"{job_fingerprint(job)}:{profile_hash(cv_summary)}:{profile_hash(competencies)}"
+
+
+async def run_gap_analysis(job: dict, cv_summary: str, competencies: list, state: dict = None, on_gap=None) -> dict:
+    """
+    Gaps and job requirements run concurrently; the learning plan starts as
+    soon as both are in. Returns {"gaps", "requirements", "plan"}.
+
+    on_gap(gap_list) is called with the gaps so far as each one streams in.
+    Pass the same `state` dict (e.g. from st.session_state) to later calls:
+    a result for the same job, summary and competencies is returned without
+    any LLM calls.
+    """
+    state = {} if state is None else state
+    key = gap_analysis_key(job, cv_summary, competencies)
+    if key in state:
+        return state[key]
+
+    async def collect_gaps():
+        gap_list = []
+        async for gap in stream_gaps(job, cv_summary, competencies):
+            gap_list.append(gap)
+            if on_gap:
+                on_gap(list(gap_list))
+        return {"job_title": job.get("title", ""), "gaps": gap_list}
+
+    gaps, requirements = await asyncio.gather(
+        collect_gaps(),
+        extract_job_requirements(job.get("description", ""), cv_summary),
+    )
+    plan = await generate_learning_plan(job, cv_summary, gaps.get("gaps", []), requirements.get("requirements", []))
+
+    result = {"gaps": gaps, "requirements": requirements, "plan": plan}
+    # Don't memoise a run where every agent fell back to empty output; the next render retries it
+    if gaps.get("gaps") or requirements.get("requirements") or plan.get("plan"):
+        state[key] = result
+    return result
@@ -0,0 +1,146 @@
+# backend/job_dedup.py
+
+import os
+import re
+import hashlib
+from collections import defaultdict
+import numpy as np
+
+# Postings whose 64-bit SimHashes differ in at most this many bits are duplicates (override in .env)
+JOB_DEDUP_MAX_DISTANCE = int(os.getenv("JOB_DEDUP_MAX_DISTANCE", "3"))
+
+_BITS = np.arange(64, dtype=np.uint64)
+_WORD = re.compile(r"\w+")
+
+
+def _words(text) -> list:
+    return _WORD.findall(str(text or "").lower())
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def job_features(job: dict) -> dict:
+    """Weighted features of a posting: title and company words count more than description shingles."""
+    features = defaultdict(float)
+    for word in _words(job.get("title")):
+        features[f"t:{word}"] += 3
+    for word in _words(job.get("company_name")):
+        features[f"c:{word}"] += 3
+    words = _words(job.get("description"))
+    for i in range(max(len(words) - 2, 0)):
+        features[" ".join(words[i:i + 3])] += 1
+    return features
+
+
+def simhash(features: dict) -> int:
+    """64-bit SimHash of weighted features."""
+    if not features:
+        return 0
+    hashes = np.array([_feature_hash(f) for f in features], dtype=np.uint64)
+    weights = np.array(list(features.values()), dtype=np.float64)
+    bits = ((hashes[:, None] >> _BITS) & np.uint64(1)).astype(np.int8)
+    votes = weights @ (2 * bits - 1)
+    return int(np.packbits((votes > 0)[::-1]).view(">u8")[0])
+
+
+def job_fingerprint(job: dict) -> str:
+    """
+    Stable identity of a posting for caching: a hash of its normalised title,
+    company, location and description. Search-specific fields such as
+    job_id or links are left out because they change between queries.
+    """
+    parts = [" ".join(_words(job.get(field))) for field in ("title", "company_name", "location", "description")]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _company(job) -> str:
+    return " ".join(_words(job.get("company_name")))
+
+
+def _apply_links(job) -> list:
+    """Every apply link of a posting: its apply_options plus the apply_link/sharing_link (or link) fields."""
+    options = list(job.get("apply_options") or [])
+    title = job.get("via") or job.get("company_name") or "Apply"
+    for field in ("apply_link", "sharing_link", "link"):
+        if job.get(field):
+            options.append({"title": title, "link": job[field]})
+    return options
+
+
+def _merge(group: list) -> dict:
+    merged = dict(group[0])
+    links, options = set(), []
+    for job in group:
+        for option in _apply_links(job):
+            if option.get("link") and option["link"] not in links:
+                links.add(option["link"])
+                options.append(option)
+    merged["apply_options"] = options
+    merged["duplicate_count"] = len(group) - 1
+    return merged
+
+
+def dedupe_jobs(jobs: list, max_distance: int = None) -> list:
+    """
+    Collapse near-duplicate postings (same job listed by several boards).
+
+    Each posting gets a SimHash of title + company + description. The 64
+    bits are split into max_distance + 1 bands, so any pair within
+    max_distance bits matches exactly on at least one band; only postings
+    sharing a band bucket (and company) are compared. Each group keeps its
+    first posting, with every apply link from the group in apply_options.
+    """
+    max_distance = JOB_DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+    if len(jobs) < 2:
+        return list(jobs)
+
+    hashes = [simhash(job_features(job)) for job in jobs]
+    companies = [_company(job) for job in jobs]
+    parent = list(range(len(jobs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        a, b = find(i), find(j)
+        if a != b:
+            parent[max(a, b)] = min(a, b)  # lowest index (best search rank) is the root
+
+    # Identical fingerprints are merged up front so LSH buckets stay small
+    first_with_hash = {}
+    for i, (h, company) in enumerate(zip(hashes, companies)):
+        key = (h, company)
+        if key in first_with_hash:
+            union(first_with_hash[key], i)
+        else:
+            first_with_hash[key] = i
+
+    bands = max_distance + 1
+    band_bits = 64 // bands
+    buckets = defaultdict(list)
+    for (h, company), i in first_with_hash.items():
+        for band in range(bands):
+            width = band_bits if band < bands - 1 else 64 - band_bits * (bands - 1)
+            value = (h >> (band * band_bits)) & ((1 << width) - 1)
+            buckets[(band, value, company)].append(i)
+
+    for members in buckets.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                i, j = members[a], members[b]
+                if bin(hashes[i] ^ hashes[j]).count("1") <= max_distance:
+                    union(i, j)
+
+    groups = defaultdict(list)
+    for i in range(len(jobs)):
+        groups[find(i)].append(jobs[i])
+
+    deduped = [_merge(groups[root]) for root in sorted(groups)]
+    if len(deduped) < len(jobs):
+        print(f"🧹 Collapsed {len(jobs) - len(deduped)} duplicate job postings ({len(jobs)} -> {len(deduped)})")
+    return deduped
@@ -1,25 +1,21 @@
 # backend/job_logic.py
 
-import requests
-import asyncio
-from backend.agents.agent_enrich_job import enrich_and_score_jobs
+from backend.async_runtime import run_sync
+from backend.agents.agent_enrich_job import enrich_and_score_jobs_chunked
+from backend.job_search_client import search_jobs_async
+from backend.job_dedup import dedupe_jobs
 
-def search_jobs(job_title, api_key, api_url, max_retries=3):
-    for attempt in range(max_retries):
-        try:
-            params = {
-                "engine": "google_jobs",
-                "q": job_title,
-                "api_key": api_key
-            }
-            response = requests.get(api_url, params=params)
-            response.raise_for_status()
-            return response.json().get("jobs", [])
-        except Exception as e:
-            print(f"Search attempt {attempt + 1} failed: {e}")
-    return []
+def search_jobs(job_title, api_key, api_url, preferences=None, max_results=None):
+    """Search all query variants for a title concurrently; returns merged jobs with near-duplicates collapsed."""
+    jobs = run_sync(
+        search_jobs_async(job_title, preferences, max_results=max_results, api_key=api_key, api_url=api_url)
+    )
+    return dedupe_jobs(jobs)
 
-def run_enrichment(jobs, user_summary):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    return loop.run_until_complete(enrich_and_score_jobs(jobs, user_summary))
+def run_enrichment(jobs, user_summary, top_n=None, competencies=None, profile_vector=None):
+    """Enrich all jobs (or the top_n pre-ranked ones) in parallel chunks."""
+    return run_sync(
+        enrich_and_score_jobs_chunked(
+            jobs, user_summary, top_n=top_n, competencies=competencies, profile_vector=profile_vector
+        )
+    )
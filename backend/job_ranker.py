@@ -0,0 +1,49 @@
+# backend/job_ranker.py
+
+import os
+import numpy as np
+
+from backend.embedding_cache import embed_texts
+
+# How many search results are sent to the LLM for enrichment (override in .env)
+ENRICH_TOP_N = int(os.getenv("ENRICH_TOP_N", "5"))
+
+
+def job_text(job: dict) -> str:
+    """Text used to embed a raw search result."""
+    parts = [
+        job.get("title", ""),
+        job.get("company_name", ""),
+        job.get("location", ""),
+        job.get("description", ""),
+    ]
+    return "\n".join(str(p) for p in parts if p)
+
+
+def prerank_jobs(jobs: list, user_summary: str, top_n: int = None, profile_vector=None) -> list:
+    """
+    Rank raw jobs by embedding similarity to the user summary and return the
+    top_n most relevant ones, best first. Pass the session's profile_vector
+    (see get_profile_embedding) to skip embedding the summary. Falls back to
+    the first top_n jobs if the embedding model is unavailable.
+    """
+    top_n = ENRICH_TOP_N if top_n is None else top_n
+    if len(jobs) <= top_n or not user_summary:
+        return list(jobs[:top_n])
+
+    try:
+        # Cached: reruns and repeated searches don't re-encode the same texts
+        if profile_vector is None:
+            vectors = embed_texts([user_summary] + [job_text(job) for job in jobs])
+            profile_vector, job_vectors = vectors[0], vectors[1:]
+        else:
+            job_vectors = embed_texts([job_text(job) for job in jobs])
+    except Exception as e:
+        print(f"⚠️ Job pre-ranking unavailable, using first {top_n} jobs: {e}")
+        return list(jobs[:top_n])
+
+    # Normalised vectors: cosine similarity is a single matrix-vector product
+    scores = job_vectors @ profile_vector
+    top = np.argpartition(-scores, top_n - 1)[:top_n]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [jobs[i] for i in top]
@@ -0,0 +1,136 @@
+# backend/job_scoring.py
+
+import os
+import threading
+import numpy as np
+
+from backend.embedding_cache import embed_text, embed_texts
+from backend.job_ranker import job_text
+from backend.vector_store import get_vector_store
+
+# Local match scoring settings (override in .env)
+MATCH_COMPETENCIES_PER_JOB = int(os.getenv("MATCH_COMPETENCIES_PER_JOB", "10"))
+MATCH_COVERAGE_WEIGHT = float(os.getenv("MATCH_COVERAGE_WEIGHT", "0.7"))  # rest is profile-text similarity
+
+# Cosine similarities between related MiniLM embeddings mostly fall in this band
+SIMILARITY_FLOOR = 0.1
+SIMILARITY_CEIL = 0.7
+# A user competency this similar (or more) to a required one partly covers it
+COVERAGE_FLOOR = 0.5
+
+_matrix_cache = {}
+_matrix_lock = threading.Lock()
+
+
+def get_competency_matrix():
+    """
+    (names, L2-normalised matrix) of every catalog competency in the vector
+    store, rebuilt when the store is written to (its version) or its size
+    changes (a rebuild from another process).
+    """
+    store = get_vector_store("competencies")
+    key = (id(store), store.version, store.count())
+    with _matrix_lock:
+        if _matrix_cache.get("key") != key:
+            _, matrix, metadatas = store.get_vectors()
+            matrix = np.asarray(matrix, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            _matrix_cache.update(
+                key=key,
+                names=[str(meta.get("Competency", "")) for meta in metadatas],
+                matrix=matrix / np.where(norms == 0, 1, norms),
+            )
+        return _matrix_cache["names"], _matrix_cache["matrix"]
+
+
+def _scale(similarity, floor, ceil):
+    return np.clip((similarity - floor) / (ceil - floor), 0.0, 1.0)
+
+
+def user_coverage(competencies: list, names: list, matrix: np.ndarray) -> np.ndarray:
+    """
+    How well the user covers each catalog competency (0–1): their own level
+    for competencies they listed, partial credit for closely related ones.
+    """
+    index = {name.strip().lower(): i for i, name in enumerate(names)}
+    rows, levels = [], []
+    for item in competencies or []:
+        i = index.get(str(item.get("competency", "")).strip().lower())
+        if i is not None:
+            rows.append(i)
+            levels.append(min(max(float(item.get("level", 0) or 0), 0), 5) / 5)
+    if not rows:
+        return np.zeros(len(names), dtype=np.float32)
+
+    related = _scale(matrix[rows] @ matrix.T, COVERAGE_FLOOR, 1.0)  # (user competencies x catalog)
+    return (np.asarray(levels, dtype=np.float32)[:, None] * related).max(axis=0)
+
+
+def score_jobs(jobs: list, user_summary: str, competencies: list = None, profile_vector=None) -> list:
+    """
+    Deterministic 0–100 match scores for many jobs at once.
+
+    Each job is mapped onto its MATCH_COMPETENCIES_PER_JOB closest catalog
+    competencies (weighted by similarity) and scored by how well the user's
+    levels cover them. That is blended with the similarity between the job
+    and the profile summary. Returns one dict per job with match_score,
+    matched_competencies and missing_competencies.
+    """
+    if not jobs:
+        return []
+
+    names, matrix = get_competency_matrix()
+    if not names:
+        raise ValueError("Competency vector store is empty")
+    covered = user_coverage(competencies, names, matrix)
+    if not covered.any() and not user_summary:
+        raise ValueError("None of the user's competencies are in the catalog")
+
+    job_vectors = embed_texts([job_text(job) for job in jobs])
+    requirement_sims = job_vectors @ matrix.T  # (jobs x catalog)
+
+    k = min(MATCH_COMPETENCIES_PER_JOB, len(names))
+    top = np.argpartition(-requirement_sims, k - 1, axis=1)[:, :k]
+    top_sims = np.take_along_axis(requirement_sims, top, axis=1)
+    order = np.argsort(-top_sims, axis=1, kind="stable")
+    top, top_sims = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_sims, order, axis=1)
+
+    weights = _scale(top_sims, SIMILARITY_FLOOR, SIMILARITY_CEIL) + 1e-6
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    coverage = covered[top]  # (jobs x k)
+    coverage_score = (weights * coverage).sum(axis=1)
+
+    if user_summary:
+        profile_vector = embed_text(user_summary) if profile_vector is None else profile_vector
+        text_score = _scale(job_vectors @ profile_vector, SIMILARITY_FLOOR, SIMILARITY_CEIL)
+    else:
+        text_score = np.zeros(len(jobs), dtype=np.float32)
+
+    # Without listed competencies only the text similarity counts, and vice versa
+    alpha = MATCH_COVERAGE_WEIGHT if covered.any() else 0.0
+    if not user_summary:
+        alpha = 1.0
+    scores = np.rint(100 * (alpha * coverage_score + (1 - alpha) * text_score)).astype(int)
+
+    results = []
+    for row, score in enumerate(scores):
+        # Only competencies the job is actually about are named in the result
+        required = [(names[i], c) for i, c, sim in zip(top[row], coverage[row], top_sims[row]) if sim > SIMILARITY_FLOOR]
+        results.append({
+            "match_score": int(score),
+            "matched_competencies": [n for n, c in required if c >= 0.5],
+            "missing_competencies": [n for n, c in required if c < 0.5][:3],
+            "score_source": "local",
+        })
+    return results
+
+
+def local_fit_reason(score: dict) -> str:
+    """Plain fit_reason from a local score, used when the LLM is unavailable."""
+    parts = []
+    if score.get("matched_competencies"):
+        parts.append(f"Matches your {', '.join(score['matched_competencies'][:3])}.")
+    if score.get("missing_competencies"):
+        parts.append(f"Areas to grow: {', '.join(score['missing_competencies'])}.")
+    return " ".join(parts) or "Related to your profile summary."
@@ -0,0 +1,173 @@
+# backend/job_search_client.py
+
+import os
+import re
+import asyncio
+import httpx
+from dotenv import load_dotenv
+
+from backend.resources import get_http_client, close_http_clients
+
+load_dotenv()
+
+SEARCH_API_URL = os.getenv("SEARCH_API_URL")
+SEARCH_API_KEY = os.getenv("SEARCH_API_KEY")
+
+# Fan-out settings (override in .env)
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "60"))       # unique jobs across all queries
+SEARCH_MAX_PAGES = int(os.getenv("SEARCH_MAX_PAGES", "3"))            # pages followed per query
+SEARCH_MAX_VARIANTS = int(os.getenv("SEARCH_MAX_VARIANTS", "6"))
+SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "4"))
+SEARCH_MAX_RETRIES = int(os.getenv("SEARCH_MAX_RETRIES", "3"))
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "20"))
+SEARCH_BACKOFF_BASE = float(os.getenv("SEARCH_BACKOFF_BASE", "0.5"))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Word swaps used to widen a title search ("data engineer" -> "data developer")
+TITLE_SYNONYMS = {
+    "engineer": ["developer"],
+    "developer": ["engineer", "programmer"],
+    "programmer": ["developer"],
+    "analyst": ["specialist"],
+    "specialist": ["analyst"],
+    "manager": ["lead"],
+    "lead": ["manager"],
+    "staff": ["officer"],
+    "officer": ["staff"],
+}
+SENIORITY_WORDS = {"senior", "junior", "sr", "jr", "lead", "principal", "intern", "trainee"}
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(timeout=SEARCH_TIMEOUT, limits=httpx.Limits(max_keepalive_connections=SEARCH_MAX_CONCURRENCY))
+
+
+def get_search_client() -> httpx.AsyncClient:
+    """Return the pooled search client for the running event loop, creating it on first use (see backend/resources.py)."""
+    return get_http_client("search", _build_client)
+
+
+def close_search_clients():
+    """Close every pooled search client whose event loop can still run its cleanup."""
+    close_http_clients("search")
+
+
+def title_variants(job_title: str) -> list:
+    """The title itself, without seniority words, and with common synonym swaps."""
+    title = " ".join(job_title.split())
+    words = title.lower().split()
+    variants = [title]
+
+    core = [w for w in words if w not in SENIORITY_WORDS]
+    if core and core != words:
+        variants.append(" ".join(core))
+    for i, word in enumerate(core):
+        for synonym in TITLE_SYNONYMS.get(word, []):
+            variants.append(" ".join(core[:i] + [synonym] + core[i + 1:]))
+    return variants
+
+
+def build_query_variants(job_title: str, preferences: dict = None, max_variants: int = None) -> list:
+    """
+    Query strings to search concurrently: title variants, plus the title in
+    each preferred industry, all scoped to the preferred location.
+    """
+    max_variants = max_variants or SEARCH_MAX_VARIANTS
+    preferences = preferences or {}
+    location = (preferences.get("location") or "").strip()
+    industries = [i for i in preferences.get("industries") or [] if i]
+
+    titles = title_variants(job_title)
+    queries = titles[:1] + [f"{titles[0]} {industry}" for industry in industries] + titles[1:]
+    if location:
+        queries = [f"{q} in {location}" for q in queries]
+
+    unique = []
+    for q in queries:
+        if q.lower() not in {u.lower() for u in unique}:
+            unique.append(q)
+    return unique[:max_variants]
+
+
+def job_key(job: dict) -> str:
+    """Identity used to drop the same posting returned by several queries or pages."""
+    if job.get("job_id"):
+        return f"id:{job['job_id']}"
+    parts = [job.get("title", ""), job.get("company_name", ""), job.get("location", "")]
+    return "|".join(re.sub(r"\W+", " ", str(p)).strip().lower() for p in parts)
+
+
+def _page_jobs(result: dict) -> list:
+    return result.get("jobs") or result.get("results") or result.get("jobs_results") or []
+
+
+def _next_page_token(result: dict):
+    return result.get("next_page_token") or (result.get("serpapi_pagination") or {}).get("next_page_token")
+
+
+async def _fetch_page(client, api_url, params):
+    for attempt in range(SEARCH_MAX_RETRIES):
+        try:
+            response = await client.get(api_url, params=params)
+            if response.status_code in RETRY_STATUS_CODES and attempt < SEARCH_MAX_RETRIES - 1:
+                await asyncio.sleep(SEARCH_BACKOFF_BASE * 2 ** attempt)
+                continue
+            response.raise_for_status()
+            return response.json()
+        except httpx.TransportError as e:
+            if attempt == SEARCH_MAX_RETRIES - 1:
+                raise
+            print(f"Search attempt {attempt + 1} failed: {e}")
+            await asyncio.sleep(SEARCH_BACKOFF_BASE * 2 ** attempt)
+
+
+async def _run_query(client, api_url, api_key, query, seen, budget, semaphore):
+    jobs, token = [], None
+    for _ in range(SEARCH_MAX_PAGES):
+        if len(seen) >= budget:
+            break
+        params = {"engine": "google_jobs", "q": query, "api_key": api_key}
+        if token:
+            params["next_page_token"] = token
+        async with semaphore:
+            result = await _fetch_page(client, api_url, params)
+        page = _page_jobs(result)
+        jobs.extend(page)
+        seen.update(job_key(job) for job in page)
+        token = _next_page_token(result)
+        if not page or not token:
+            break
+    return jobs
+
+
+async def search_jobs_async(job_title: str, preferences: dict = None, max_results: int = None,
+                            api_key: str = None, api_url: str = None) -> list:
+    """
+    Run the query variants for a title concurrently, follow next-page tokens
+    until max_results unique jobs are found, and return the merged,
+    de-duplicated list (results of the plain title query first).
+    A query that fails is logged and skipped.
+    """
+    max_results = max_results or SEARCH_MAX_RESULTS
+    api_url = api_url or SEARCH_API_URL
+    api_key = api_key or SEARCH_API_KEY
+    client = get_search_client()
+    semaphore = asyncio.Semaphore(SEARCH_MAX_CONCURRENCY)
+    seen = set()
+
+    queries = build_query_variants(job_title, preferences)
+    results = await asyncio.gather(
+        *(_run_query(client, api_url, api_key, q, seen, max_results, semaphore) for q in queries),
+        return_exceptions=True,
+    )
+
+    merged, keys = [], set()
+    for query, jobs in zip(queries, results):
+        if isinstance(jobs, Exception):
+            print(f"⚠️ Search for '{query}' failed: {jobs}")
+            continue
+        for job in jobs:
+            key = job_key(job)
+            if key not in keys:
+                keys.add(key)
+                merged.append(job)
+    return merged[:max_results]
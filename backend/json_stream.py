@@ -0,0 +1,80 @@
+# backend/json_stream.py
+
+import json
+
+
+class JsonArrayStreamParser:
+    """
+    Incrementally pull objects out of the first JSON array in a text stream.
+
+    Works for a bare array ([{...}, {...}]) as well as an array nested in an
+    object ({"gaps": [{...}, ...]}), and ignores any prose or markdown fences
+    the LLM wraps around it. Each object is returned by feed() as soon as its
+    closing brace arrives.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0          # next character of _buffer to scan
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._array_depth = None  # depth inside the target array
+        self._obj_start = None    # buffer index of the '{' of the current element
+        self.done = False
+
+    def feed(self, text: str) -> list:
+        if self.done:
+            return []
+
+        self._buffer += text
+        completed = []
+
+        while self._pos < len(self._buffer):
+            c = self._buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c in "[{":
+                self._depth += 1
+                if c == "[" and self._array_depth is None:
+                    self._array_depth = self._depth
+                elif c == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._obj_start = self._pos
+            elif c in "]}":
+                if c == "}" and self._obj_start is not None and self._depth == self._array_depth + 1:
+                    try:
+                        completed.append(json.loads(self._buffer[self._obj_start:self._pos + 1]))
+                    except json.JSONDecodeError as e:
+                        print(f"⚠️ Skipping malformed streamed object: {e}")
+                    self._obj_start = None
+                elif c == "]" and self._depth == self._array_depth:
+                    self.done = True
+                    break
+                self._depth -= 1
+
+            self._pos += 1
+
+        # Drop everything that can no longer be part of an object we emit
+        keep_from = self._obj_start if self._obj_start is not None else self._pos
+        self._buffer = self._buffer[keep_from:]
+        self._pos -= keep_from
+        if self._obj_start is not None:
+            self._obj_start = 0
+
+        return completed
+
+
+async def iter_json_array(chunks, parser: JsonArrayStreamParser = None):
+    """Yield each object of the streamed JSON array as soon as it is complete."""
+    parser = parser or JsonArrayStreamParser()
+    async for chunk in chunks:
+        for obj in parser.feed(chunk):
+            yield obj
@@ -1,16 +1,273 @@
 # backend/llm_api.py
 
 import os
-import httpx
+import json
+import time
+import random
 import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+import httpx
 from dotenv import load_dotenv
 
+from backend.llm_cache import get_llm_cache, CACHE_TEMPERATURE
+from backend.resources import get_http_client, aclose_http_client, close_http_clients
+
 load_dotenv()
 
 API_URL = os.getenv("APILOGY_API_URL", "https://telkom-ai-dag-api.apilogy.id/Telkom-LLM/0.0.4/llm/chat/completions")
 API_KEY = os.getenv("APILOGY_API_KEY", "your_default_api_key_here")  # Replace or set in .env
 
-async def call_apilogy_llm(prompt: str, chat_history: list = None) -> str:
+# Connection pool settings (override in .env)
+HTTP2_ENABLED = os.getenv("APILOGY_HTTP2", "1") == "1"
+MAX_CONNECTIONS = int(os.getenv("APILOGY_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("APILOGY_MAX_KEEPALIVE_CONNECTIONS", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("APILOGY_KEEPALIVE_EXPIRY", "60"))
+CONNECT_TIMEOUT = float(os.getenv("APILOGY_CONNECT_TIMEOUT", "10"))
+REQUEST_TIMEOUT = float(os.getenv("APILOGY_TIMEOUT", "60"))
+
+DEFAULT_TEMPERATURE = float(os.getenv("APILOGY_TEMPERATURE", "0.7"))
+
+# Client-side throttling and retry settings (override in .env)
+RATE_LIMIT_PER_SEC = float(os.getenv("APILOGY_RATE_LIMIT_PER_SEC", "5"))  # 0 = no rate limit
+RATE_LIMIT_BURST = int(os.getenv("APILOGY_RATE_LIMIT_BURST", "10"))
+MAX_CONCURRENT_REQUESTS = int(os.getenv("APILOGY_MAX_CONCURRENT_REQUESTS", "8"))
+MAX_RETRIES = int(os.getenv("APILOGY_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("APILOGY_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("APILOGY_BACKOFF_MAX", "30"))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+    return httpx.AsyncClient(
+        http2=HTTP2_ENABLED and _http2_available(),
+        limits=limits,
+        timeout=timeout,
+        headers={"Content-Type": "application/json", "x-api-key": API_KEY},
+    )
+
+
+def get_llm_client() -> httpx.AsyncClient:
+    """Return the pooled client for the running event loop, creating it on first use (see backend/resources.py)."""
+    return get_http_client("llm", _build_client)
+
+
+async def aclose_llm_client():
+    """Close the pooled client that belongs to the running event loop."""
+    await aclose_http_client("llm")
+
+
+def close_llm_clients():
+    """Close every pooled LLM client whose event loop can still run its cleanup."""
+    close_http_clients("llm")
+
+
+class RequestLimiter:
+    """
+    Process-wide token bucket plus concurrency cap for outgoing LLM requests.
+
+    State lives behind a threading lock rather than asyncio primitives so the
+    same limiter throttles every Streamlit session thread and event loop.
+    Callers waiting for a concurrency slot queue FIFO, each on a future of
+    its own loop; a released slot is handed straight to the oldest waiter.
+    A 429 pauses all callers until its Retry-After has passed.
+    """
+
+    def __init__(self, rate_per_sec=RATE_LIMIT_PER_SEC, burst=RATE_LIMIT_BURST, max_concurrency=MAX_CONCURRENT_REQUESTS):
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters = deque()  # (loop, future) per queued caller, oldest first
+        self.configure(rate_per_sec, burst, max_concurrency)
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._waits = deque(maxlen=1000)
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+
+    def configure(self, rate_per_sec=None, burst=None, max_concurrency=None):
+        with self._lock:
+            if rate_per_sec is not None:
+                self.rate_per_sec = rate_per_sec
+            if burst is not None:
+                self.burst = max(1, burst)
+            if max_concurrency is not None:
+                self.max_concurrency = max(1, max_concurrency)
+                while self._in_flight < self.max_concurrency and self._hand_over():
+                    self._in_flight += 1
+
+    def _hand_over(self) -> bool:
+        """Give a slot to the oldest waiter whose loop is still alive (call with the lock held)."""
+        while self._waiters:
+            loop, future = self._waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(self._grant, future)
+                return True
+            except RuntimeError:
+                continue  # its loop is closed
+        return False
+
+    def _grant(self, future):
+        # Runs on the waiter's loop; a waiter cancelled meanwhile passes the slot on
+        if future.cancelled():
+            self._release()
+        else:
+            future.set_result(None)
+
+    def _release(self):
+        with self._lock:
+            if not self._hand_over():
+                self._in_flight -= 1
+
+    def _reserve_token(self) -> float:
+        """Take a token (possibly on credit) and return how long to wait for it."""
+        now = time.monotonic()
+        wait = max(0.0, self._paused_until - now)
+        if self.rate_per_sec > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate_per_sec)
+            self._last_refill = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate_per_sec)
+        return wait
+
+    @asynccontextmanager
+    async def slot(self):
+        start = time.monotonic()  # queue time is measured from here
+        waiter = None
+        with self._lock:
+            if self._in_flight < self.max_concurrency and not self._waiters:
+                self._in_flight += 1
+            else:
+                waiter = (asyncio.get_running_loop(), asyncio.get_running_loop().create_future())
+                self._waiters.append(waiter)
+
+        if waiter is not None:
+            try:
+                await waiter[1]  # resolved by _grant once a slot is handed over
+            except asyncio.CancelledError:
+                with self._lock:
+                    queued = waiter in self._waiters
+                    if queued:
+                        self._waiters.remove(waiter)
+                if not queued and not waiter[1].cancelled():
+                    self._release()  # the slot arrived just as we were cancelled
+                raise
+
+        try:
+            with self._lock:
+                wait = self._reserve_token()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            with self._lock:
+                self.requests += 1
+                self._waits.append(time.monotonic() - start)
+            yield
+        finally:
+            self._release()
+
+    def record_throttle(self, retry_after: float = None):
+        with self._lock:
+            self.throttled += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            in_flight = self._in_flight
+        percentile = lambda q: waits[min(len(waits) - 1, int(len(waits) * q))] * 1000 if waits else 0.0
+        return {
+            "requests": self.requests,
+            "in_flight": in_flight,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "queue_wait_ms_mean": sum(waits) / len(waits) * 1000 if waits else 0.0,
+            "queue_wait_ms_p50": percentile(0.5),
+            "queue_wait_ms_p95": percentile(0.95),
+            "queue_wait_ms_max": waits[-1] * 1000 if waits else 0.0,
+        }
+
+
+_limiter = RequestLimiter()
+
+
+def configure_rate_limit(rate_per_sec: float = None, burst: int = None, max_concurrency: int = None):
+    """Adjust this process's request limits at runtime."""
+    _limiter.configure(rate_per_sec, burst, max_concurrency)
+
+
+def get_rate_limit_stats() -> dict:
+    """Queueing and throttling metrics for sizing quotas."""
+    return _limiter.stats()
+
+
+def _parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int, retry_after: float = None) -> float:
+    """Exponential backoff with full jitter, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+    if retry_after is not None:
+        delay = retry_after + random.uniform(0, BACKOFF_BASE)
+    return delay
+
+
+async def _post_with_retries(payload: dict) -> httpx.Response:
+    client = get_llm_client()
+    for attempt in range(MAX_RETRIES + 1):
+        retry_after = None
+        async with _limiter.slot():
+            try:
+                response = await client.post(API_URL, json=payload)
+            except httpx.TransportError as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                print(f"⚠️ LLM request failed ({e!r}), retrying")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                    response.raise_for_status()
+                    return response
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    _limiter.record_throttle(retry_after)
+
+        _limiter.record_retry()
+        await asyncio.sleep(_backoff_delay(attempt, retry_after))
+
+
+def _prepare_request(prompt: str, chat_history: list, use_cache: bool, refresh: bool):
+    """Build the request payload and look it up in the response cache."""
     if chat_history is None:
         chat_history = []
 
@@ -19,19 +276,95 @@ async def call_apilogy_llm(prompt: str, chat_history: list = None) -> str:
     payload = {
         "messages": messages,
         "max_tokens": 1000,
-        "temperature": 0.7,
+        "temperature": DEFAULT_TEMPERATURE,
         "stream": False
     }
 
-    headers = {
-        "Content-Type": "application/json",
-        "x-api-key": API_KEY
-    }
+    cache = get_llm_cache() if use_cache else None
+    cache_key = None
+    cached = None
+    if cache is not None:
+        payload["temperature"] = CACHE_TEMPERATURE
+        cache_key = cache.make_key(payload, API_URL)
+        if refresh:
+            payload["temperature"] = DEFAULT_TEMPERATURE
+        else:
+            cached = cache.get(cache_key)
+
+    return payload, cache, cache_key, cached
+
+
+async def call_apilogy_llm(prompt: str, chat_history: list = None, use_cache: bool = True, refresh: bool = False) -> str:
+    """
+    Send a chat completion request and return the reply text.
+
+    When the response cache is enabled (LLM_CACHE_ENABLED=1) and use_cache is
+    True, requests are sent with a deterministic temperature and answered from
+    the cache when possible. refresh=True skips the lookup and samples at the
+    normal temperature (for retrying an answer the caller could not use), then
+    overwrites the cached entry.
+    """
+    payload, cache, cache_key, cached = _prepare_request(prompt, chat_history, use_cache, refresh)
+    if cached is not None:
+        return cached
+
+    response = await _post_with_retries(payload)
+    data = response.json()
+    content = data["choices"][0]["message"]["content"]
+
+    if cache is not None:
+        cache.put(cache_key, content)
+
+    return content
+
+
+async def stream_apilogy_llm(prompt: str, chat_history: list = None, use_cache: bool = True, refresh: bool = False):
+    """
+    Same request as call_apilogy_llm, but yields the reply text piece by piece
+    as the server streams it (server-sent events). A cache hit is yielded as a
+    single piece; a completed stream is written back to the cache.
+    """
+    payload, cache, cache_key, cached = _prepare_request(prompt, chat_history, use_cache, refresh)
+    if cached is not None:
+        yield cached
+        return
+
+    payload["stream"] = True
+    parts = []
+
+    client = get_llm_client()
+    for attempt in range(MAX_RETRIES + 1):
+        retry_after = None
+        async with _limiter.slot():
+            try:
+                async with client.stream("POST", API_URL, json=payload) as response:
+                    if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+                        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                        if response.status_code == 429:
+                            _limiter.record_throttle(retry_after)
+                    else:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[len("data:"):].strip()
+                            if data == "[DONE]":
+                                break
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
+                            choice = json.loads(data)["choices"][0]
+                            piece = (choice.get("delta") or choice.get("message") or {}).get("content")
+                            if piece:
+                                parts.append(piece)
+                                yield piece
+                        break
+            except httpx.TransportError as e:
+                # Only safe to retry if nothing has been handed to the caller yet
+                if parts or attempt == MAX_RETRIES:
+                    raise
+                print(f"⚠️ LLM stream failed ({e!r}), retrying")
 
-    return data["choices"][0]["message"]["content"]
+        _limiter.record_retry()
+        await asyncio.sleep(_backoff_delay(attempt, retry_after))
 
+    if cache is not None:
+        cache.put(cache_key, "".join(parts))
@@ -1,15 +1,28 @@
 # backend/rag_engine.py
 
+import os
+import json
+import time
+import hashlib
+import threading
 import pandas as pd
-from sentence_transformers import SentenceTransformer
-from chromadb import PersistentClient
 
-# Initialize embedding model
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+from backend.competency_catalog import get_competency_catalog
+from backend.embedding_pipeline import encode_texts
+from backend.embedding_cache import embed_text, embed_texts
+from backend.vector_store import get_vector_store, get_chroma_collection
+from backend.resources import EMBEDDING_MODEL_NAME, get_embedding_model  # noqa: F401 (re-exported)
 
-# Setup Chroma persistent client
-chroma_client = PersistentClient(path="db/vectorstore")
-collection = chroma_client.get_or_create_collection(name="competencies")
+# Part of every content hash: changing how vectors are produced re-encodes all rows once
+EMBEDDING_SCHEME = f"{EMBEDDING_MODEL_NAME}:normalized"
+
+# Competencies retrieved as candidates for an LLM prompt, and CV chunk size for the query (override in .env)
+COMPETENCY_SHORTLIST_K = int(os.getenv("COMPETENCY_SHORTLIST_K", "40"))
+SHORTLIST_CHUNK_CHARS = int(os.getenv("SHORTLIST_CHUNK_CHARS", "1000"))
+
+def get_collection():
+    """Return the competencies Chroma collection, opening the store on first use."""
+    return get_chroma_collection("competencies")
 
 def load_competency_data(csv_path="data/direktori_komp.csv"):
     """Load and clean the competency CSV."""
@@ -17,39 +30,147 @@ def load_competency_data(csv_path="data/direktori_komp.csv"):
     df = df.dropna(subset=["Competency", "Definition"]).reset_index(drop=True)
     return df
 
-def embed_competencies(df: pd.DataFrame):
-    """Embed competencies into Chroma vectorstore."""
-    descriptions = df["Definition"].astype(str).tolist()
-    embeddings = embedding_model.encode(descriptions).tolist()
-    ids = [f"comp_{i}" for i in range(len(df))]
-
-    # Clear and re-add to avoid duplicates if needed
-    collection.delete(ids=ids)
-    collection.add(
-        documents=descriptions,
-        embeddings=embeddings,
-        ids=ids,
-        metadatas=df.to_dict(orient="records")
-    )
+def competency_id(name: str) -> str:
+    """Stable vector id derived from the competency name, not its row position."""
+    return "comp_" + hashlib.sha1(name.strip().lower().encode("utf-8")).hexdigest()[:16]
+
+def content_hash(record: dict) -> str:
+    """Hash of everything stored for a competency (definition and L1–L5)."""
+    material = json.dumps({"scheme": EMBEDDING_SCHEME, "record": record}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+def embed_competencies(df: pd.DataFrame) -> dict:
+    """
+    Sync competencies into the configured vector store incrementally.
+
+    Only new or changed rows are encoded; rows no longer in the CSV are
+    deleted. Returns counts and timing for the rebuild.
+    """
+    start = time.perf_counter()
+
+    desired = {}
+    for record in df.to_dict(orient="records"):
+        comp_id = competency_id(str(record["Competency"]))
+        if comp_id not in desired:  # First row wins for duplicate names
+            desired[comp_id] = dict(record, content_hash=content_hash(record))
+
+    store = get_vector_store("competencies")
+    existing_hashes = {
+        comp_id: meta.get("content_hash")
+        for comp_id, meta in store.get_metadatas().items()
+    }
+
+    to_upsert = [i for i, meta in desired.items() if existing_hashes.get(i) != meta["content_hash"]]
+    to_delete = [i for i in existing_hashes if i not in desired]
+
+    if to_delete:
+        store.delete(to_delete)
+
+    if to_upsert:
+        descriptions = [str(desired[i]["Definition"]) for i in to_upsert]
+        embeddings, _ = encode_texts(descriptions)
+        embeddings = embeddings.tolist()
+        store.upsert(
+            ids=to_upsert,
+            embeddings=embeddings,
+            documents=descriptions,
+            metadatas=[desired[i] for i in to_upsert]
+        )
+
+    added = sum(1 for i in to_upsert if i not in existing_hashes)
+    return {
+        "added": added,
+        "updated": len(to_upsert) - added,
+        "deleted": len(to_delete),
+        "unchanged": len(desired) - len(to_upsert),
+        "seconds": time.perf_counter() - start,
+    }
 
 def query_competency(text: str, top_k: int = 5):
     """Query top-k similar competencies for given text."""
-    query_embedding = embedding_model.encode([text])[0]
-    return collection.query(query_embeddings=[query_embedding], n_results=top_k)
+    query_embedding = embed_text(text)
+    return get_vector_store("competencies").query(query_embedding, top_k)
+
+def chunk_text(text: str, max_chars: int = None) -> list:
+    """Split text into paragraph-aligned chunks of at most max_chars (long paragraphs are cut)."""
+    max_chars = max_chars or SHORTLIST_CHUNK_CHARS
+    chunks, current = [], ""
+    for paragraph in (p.strip() for p in str(text).split("\n")):
+        if not paragraph:
+            continue
+        while len(paragraph) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        if current and len(current) + len(paragraph) + 1 > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+def shortlist_competencies(texts: list, top_k: int = None) -> list:
+    """
+    Names of the top_k competencies closest to any of the query texts, best
+    first. Each text (e.g. a role name or CV chunks) is queried separately
+    and a competency keeps its best distance. Falls back to the full catalog
+    if the vector store is unavailable.
+    """
+    top_k = top_k or COMPETENCY_SHORTLIST_K
+    texts = [t for t in texts if t and str(t).strip()]
+    try:
+        store = get_vector_store("competencies")
+        if not texts or store.count() == 0:
+            raise ValueError("no query text or empty competency store")
+        best = {}
+        for vector in embed_texts(texts):
+            result = store.query(vector, top_k)
+            for meta, distance in zip(result["metadatas"][0], result["distances"][0]):
+                name = (meta or {}).get("Competency")
+                if name and distance < best.get(name, float("inf")):
+                    best[name] = distance
+    except Exception as e:
+        print(f"⚠️ Competency shortlist unavailable, using full catalog: {e}")
+        return get_all_competency_names()
+
+    return sorted(best, key=best.get)[:top_k]
+
+_shortlist_stats = {"picks": 0, "outside": 0}
+_shortlist_lock = threading.Lock()
+
+def keep_shortlisted(picks: list, shortlist: list, step: str = "") -> list:
+    """
+    Recall check for LLM picks: map each pick to its shortlist name
+    (case-insensitive) and drop and log the ones that were not offered.
+    """
+    offered = {str(name).strip().lower(): name for name in shortlist}
+    kept, outside = [], []
+    for pick in picks:
+        name = offered.get(str(pick).strip().lower())
+        if name is None:
+            outside.append(pick)
+        else:
+            kept.append(name)
+
+    with _shortlist_lock:
+        _shortlist_stats["picks"] += len(picks)
+        _shortlist_stats["outside"] += len(outside)
+    if outside:
+        print(f"⚠️ {step or 'LLM'} picked {len(outside)} competencies outside the shortlist: {outside}")
+    return kept
+
+def get_shortlist_stats() -> dict:
+    """How many LLM picks fell outside the shortlist they were given."""
+    picks = _shortlist_stats["picks"]
+    return dict(_shortlist_stats, recall=1 - _shortlist_stats["outside"] / picks if picks else 1.0)
 
 def get_all_competency_names():
     """Return list of all competency names."""
-    df = load_competency_data()
-    return df["Competency"].dropna().unique().tolist()
+    return get_competency_catalog().names()
 
 def query_competency_by_name(name: str):
     """Fetch definition and metadata for a given competency name."""
-    df = load_competency_data()
-    row = df[df["Competency"].str.lower() == name.lower()]
-    if not row.empty:
-        row = row.iloc[0]
-        return {
-            "definition": row["Definition"],
-            "metadata": row.to_dict()
-        }
-    return None
+    return get_competency_catalog().get(name)
@@ -0,0 +1,186 @@
+# backend/resources.py
+
+import os
+import time
+import atexit
+import asyncio
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Load the model, stores and HTTP clients in the background when the app starts (override in .env)
+WARM_UP_ON_START = os.getenv("WARM_UP_ON_START", "1") not in ("0", "false", "False")
+
+# Shared instances, one per process; heavy imports happen inside the factories
+_resources = {}
+_load_seconds = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def get_resource(name: str, factory):
+    """
+    Return the process-wide instance registered under name, creating it with
+    factory() on first use. Concurrent callers wait for the one load instead
+    of each building their own copy.
+    """
+    resource = _resources.get(name)
+    if resource is None:
+        with _registry_lock:
+            lock = _locks.setdefault(name, threading.Lock())
+        with lock:
+            resource = _resources.get(name)
+            if resource is None:
+                start = time.perf_counter()
+                resource = factory()
+                _load_seconds[name] = time.perf_counter() - start
+                _resources[name] = resource
+    return resource
+
+
+def get_embedding_model():
+    """Return the shared SentenceTransformer, loading it on first use."""
+    def load():
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(EMBEDDING_MODEL_NAME)
+    return get_resource("embedding_model", load)
+
+
+def get_chroma_client(path: str):
+    """Return the shared Chroma PersistentClient for a directory."""
+    def load():
+        from chromadb import PersistentClient
+        return PersistentClient(path=path)
+    return get_resource(f"chroma:{os.path.abspath(path)}", load)
+
+
+# --- HTTP clients ---
+# httpx connections are bound to the event loop that opened them. The pages
+# share the long-lived loop in backend.async_runtime, but scripts and tests
+# still use asyncio.run(), so each named client is pooled per live loop.
+_http_clients = {}  # (name, id(loop)) -> (loop, client)
+_http_clients_lock = threading.Lock()
+
+
+def get_http_client(name: str, factory):
+    """Return the pooled httpx.AsyncClient `name` for the running event loop, creating it with factory() on first use."""
+    loop = asyncio.get_running_loop()
+    with _http_clients_lock:
+        # Drop clients whose loop is already gone; their sockets die with the loop
+        for key in [k for k, (l, _) in _http_clients.items() if l.is_closed()]:
+            del _http_clients[key]
+
+        entry = _http_clients.get((name, id(loop)))
+        if entry is None or entry[0] is not loop or entry[1].is_closed:
+            entry = (loop, factory())
+            _http_clients[(name, id(loop))] = entry
+        return entry[1]
+
+
+async def aclose_http_client(name: str):
+    """Close the pooled client `name` that belongs to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _http_clients_lock:
+        entry = _http_clients.pop((name, id(loop)), None)
+    if entry is not None and entry[0] is loop:
+        await entry[1].aclose()
+
+
+def close_http_clients(name: str = None):
+    """
+    Close every pooled client (or every one named `name`) whose event loop
+    can still run its cleanup: a running loop, such as the shared runtime
+    loop, closes it on its own thread; a stopped one runs it to completion.
+    """
+    with _http_clients_lock:
+        keys = [k for k in _http_clients if name is None or k[0] == name]
+        entries = [(k[0], *_http_clients.pop(k)) for k in keys]
+
+    for client_name, loop, client in entries:
+        if loop.is_closed() or client.is_closed:
+            continue
+        try:
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+            else:
+                loop.run_until_complete(client.aclose())
+        except Exception as e:
+            print(f"⚠️ Failed to close {client_name} HTTP client: {e}")
+
+
+atexit.register(close_http_clients)
+
+
+def resource_stats() -> dict:
+    """Loaded resources and how many seconds each took to create."""
+    return {name: round(_load_seconds.get(name, 0.0), 3) for name in _resources}
+
+
+# --- Warm-up ---
+
+def _warm_embedding_model():
+    get_embedding_model().encode(["warm up"], normalize_embeddings=True)
+
+
+def _warm_competency_store():
+    from backend.job_scoring import get_competency_matrix
+    get_competency_matrix()  # opens the vector store and caches the catalog matrix
+
+
+def _warm_enrichment_caches():
+    from backend.enrichment_cache import get_enrichment_cache, get_job_facts_cache
+    get_enrichment_cache()
+    get_job_facts_cache()
+
+
+def _warm_http_clients():
+    from backend.async_runtime import run_sync
+    from backend.llm_api import get_llm_client
+    from backend.job_search_client import get_search_client
+
+    # Clients are pooled per event loop, so open them on the shared one the pages use
+    async def open_clients():
+        get_llm_client()
+        get_search_client()
+    run_sync(open_clients())
+
+
+WARM_UP_STEPS = [
+    ("embedding model", _warm_embedding_model),
+    ("competency store", _warm_competency_store),
+    ("enrichment caches", _warm_enrichment_caches),
+    ("http clients", _warm_http_clients),
+]
+
+_warm_up_thread = None
+_warm_up_lock = threading.Lock()
+
+
+def warm_up(steps=None) -> dict:
+    """Run each warm-up step; a failing step is logged and skipped. Returns {step: seconds or error}."""
+    results = {}
+    for label, step in steps or WARM_UP_STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+            results[label] = round(time.perf_counter() - start, 3)
+        except Exception as e:
+            print(f"⚠️ Warm-up of {label} failed: {e}")
+            results[label] = f"failed: {e}"
+    print(f"🔥 Warm-up finished: {results}")
+    return results
+
+
+def start_warm_up(steps=None):
+    """Start warm_up() in a background thread once per process. Returns the thread, or None if disabled."""
+    global _warm_up_thread
+    if not WARM_UP_ON_START:
+        return None
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=warm_up, args=(steps,), daemon=True, name="resource-warm-up")
+            _warm_up_thread.start()
+    return _warm_up_thread
@@ -0,0 +1,333 @@
+# backend/step_store.py
+
+import os
+import json
+import time
+import sqlite3
+import secrets
+import threading
+from collections.abc import MutableMapping
+from dotenv import load_dotenv
+
+from backend.enrichment_cache import profile_hash
+
+load_dotenv()
+
+STEP_STORE_ENABLED = os.getenv("STEP_STORE_ENABLED", "1") == "1"
+STEP_STORE_PATH = os.getenv("STEP_STORE_PATH", "cache/step_results.sqlite3")
+STEP_STORE_TTL_SECONDS = float(os.getenv("STEP_STORE_TTL_SECONDS", str(30 * 24 * 3600)))  # 0 = never expire
+STEP_STORE_MAX_ENTRIES = int(os.getenv("STEP_STORE_MAX_ENTRIES", "20000"))
+
+# Session values the pages hand to each other; saved so a browser refresh can restore them.
+# Only derived results: the raw CV text and manual input never leave the session.
+SESSION_KEYS = (
+    "summary_result", "job_role", "final_competency_input", "selected_job", "user_preferences",
+    "selected_gap_job",
+)
+# Session values derived from the profile input; dropped when the input changes
+DERIVED_SESSION_KEYS = (
+    "summary_result", "job_role", "final_competency_input", "job_recommendations",
+    "job_recommendations_by_competencies", "selected_job",
+    "show_preferences", "user_preferences", "selected_gap_job",
+    "competency_summary", "gap_analysis_results", "job_search_results",
+)
+# Memo namespaces whose entries carry their own input fingerprints (AgentDAG state):
+# carried over to a new profile, so only the nodes whose inputs changed re-run
+CARRIED_NAMESPACES = ("competency_dag_state",)
+
+
+def profile_input_key(input_text: str, cv_text: str = "", manual_data: dict = None) -> str:
+    """Key for everything derived from one raw profile input."""
+    return profile_hash(input_text or "", cv_text or "", manual_data or {})
+
+
+class StepStore:
+    """
+    SQLite-backed agent step results, grouped by profile key. Values are
+    stored as JSON. Entries older than ttl_seconds are misses; beyond
+    max_entries the least recently used rows are evicted.
+
+    Browser sessions are kept separately: a random token maps to the
+    session's profile key and its saved session values, so the URL never
+    carries anything derived from the profile itself.
+    """
+
+    def __init__(self, path=STEP_STORE_PATH, ttl_seconds=STEP_STORE_TTL_SECONDS, max_entries=STEP_STORE_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS steps (
+                profile_key TEXT NOT NULL,
+                step TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (profile_key, step)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_steps_last_access ON steps(last_access)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                token TEXT PRIMARY KEY,
+                profile_key TEXT NOT NULL,
+                state TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def get(self, profile_key: str, step: str, default=None):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM steps WHERE profile_key = ? AND step = ?", (profile_key, step)
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                self.misses += 1
+                return default
+            self._conn.execute(
+                "UPDATE steps SET last_access = ? WHERE profile_key = ? AND step = ?", (now, profile_key, step)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, profile_key: str, step: str, result):
+        now = time.time()
+        material = json.dumps(result, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO steps (profile_key, step, result, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (profile_key, step, material, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def steps(self, profile_key: str, prefix: str = "") -> list:
+        """Names of the live steps stored for a profile, optionally only those starting with prefix."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT step, created_at FROM steps WHERE profile_key = ? AND substr(step, 1, ?) = ?",
+                (profile_key, len(prefix), prefix)
+            ).fetchall()
+        return [step for step, created_at in rows if not self._expired(created_at, now)]
+
+    def copy_steps(self, from_key: str, to_key: str, prefix: str = "") -> int:
+        """Copy a profile's steps starting with prefix to another profile, keeping any it already has."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO steps (profile_key, step, result, created_at, last_access) "
+                "SELECT ?, step, result, created_at, last_access FROM steps "
+                "WHERE profile_key = ? AND substr(step, 1, ?) = ?",
+                (to_key, from_key, len(prefix), prefix)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def invalidate(self, profile_key: str, steps=None) -> int:
+        """Delete the given steps of a profile, or all of them. Returns the number of rows removed."""
+        with self._lock:
+            if steps is None:
+                cursor = self._conn.execute("DELETE FROM steps WHERE profile_key = ?", (profile_key,))
+            else:
+                cursor = self._conn.executemany(
+                    "DELETE FROM steps WHERE profile_key = ? AND step = ?", [(profile_key, s) for s in steps]
+                )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def save_session(self, token: str, profile_key: str, state: dict):
+        """Bind a session token to a profile key and store the session's values."""
+        material = json.dumps(state, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (token, profile_key, state, last_access) VALUES (?, ?, ?, ?)",
+                (token, profile_key, material, time.time())
+            )
+            self._conn.commit()
+
+    def load_session(self, token: str):
+        """(profile_key, state) saved for a session token, or None if it is unknown or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT profile_key, state, last_access FROM sessions WHERE token = ?", (token,)
+            ).fetchone()
+            if row is None or self._expired(row[2], now):
+                return None
+            self._conn.execute("UPDATE sessions SET last_access = ? WHERE token = ?", (now, token))
+            self._conn.commit()
+        return row[0], json.loads(row[1])
+
+    def profile_in_use(self, profile_key: str) -> bool:
+        """True if a live session is bound to the profile."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT last_access FROM sessions WHERE profile_key = ?", (profile_key,)
+            ).fetchall()
+        now = time.time()
+        return any(not self._expired(last_access, now) for (last_access,) in rows)
+
+    def _evict(self):
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM steps WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._conn.execute("DELETE FROM sessions WHERE last_access < ?", (time.time() - self.ttl_seconds,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM steps").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM steps WHERE rowid IN (SELECT rowid FROM steps ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM steps").fetchone()
+            (profiles,) = self._conn.execute("SELECT COUNT(DISTINCT profile_key) FROM steps").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "profiles": profiles,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class StepState(MutableMapping):
+    """
+    Dict view of one profile's steps under a namespace, so code that memoises
+    into a plain dict (AgentDAG.run, run_gap_analysis) persists to the store.
+    """
+
+    def __init__(self, store: StepStore, profile_key: str, namespace: str):
+        self.store = store
+        self.profile_key = profile_key
+        self.prefix = f"{namespace}:"
+
+    def __getitem__(self, name):
+        missing = object()
+        value = self.store.get(self.profile_key, self.prefix + name, missing)
+        if value is missing:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        self.store.put(self.profile_key, self.prefix + name, value)
+
+    def __delitem__(self, name):
+        if not self.store.invalidate(self.profile_key, [self.prefix + name]):
+            raise KeyError(name)
+
+    def __iter__(self):
+        return iter([step[len(self.prefix):] for step in self.store.steps(self.profile_key, self.prefix)])
+
+    def __len__(self):
+        return len(self.store.steps(self.profile_key, self.prefix))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_step_store():
+    """Return the process-wide step store, or None when it is disabled or can't be opened."""
+    global _store
+    if not STEP_STORE_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = StepStore()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Step store unavailable, results are kept for this session only: {e}")
+                    return None
+    return _store
+
+
+# --- Streamlit session helpers (session_state and query_params are passed in, any dict works) ---
+
+def step_state(session_state, namespace: str):
+    """Persistent memo dict for the session's profile, or a session-only dict without a store or profile."""
+    store = get_step_store()
+    profile_key = session_state.get("profile_key")
+    if store is None or not profile_key:
+        return session_state.setdefault(namespace, {})
+    return StepState(store, profile_key, namespace)
+
+
+def start_profile(session_state, input_text: str, cv_text: str = "", manual_data: dict = None) -> str:
+    """
+    Bind the session to a new raw profile input. If it differs from the
+    previous input, everything derived from it is dropped from the session
+    and the DAG state is carried over (see CARRIED_NAMESPACES). The previous
+    profile's stored steps are then invalidated, unless another live
+    session is still bound to that profile.
+    """
+    session_state.setdefault("session_token", secrets.token_urlsafe(24))
+    key = profile_input_key(input_text, cv_text, manual_data)
+    previous = session_state.get("profile_key")
+    store = get_step_store()
+    if previous != key:
+        for name in DERIVED_SESSION_KEYS:
+            session_state.pop(name, None)
+        if previous and store is not None:
+            for namespace in CARRIED_NAMESPACES:
+                store.copy_steps(previous, key, f"{namespace}:")
+    session_state["profile_key"] = key
+    save_session(session_state)  # rebinds this session's token to the new profile
+
+    if previous and previous != key and store is not None and not store.profile_in_use(previous):
+        store.invalidate(previous)
+    return key
+
+
+def save_session(session_state):
+    """Persist the derived values pages pass along (SESSION_KEYS), so restore_session() can rebuild them after a refresh."""
+    store = get_step_store()
+    token, profile_key = session_state.get("session_token"), session_state.get("profile_key")
+    if store is not None and token and profile_key:
+        store.save_session(token, profile_key, {k: session_state[k] for k in SESSION_KEYS if k in session_state})
+
+
+def restore_session(session_state, query_params) -> str:
+    """
+    Keep the session's random token in the URL (?session=...). A new
+    session opened from such a URL, e.g. after a browser refresh, gets its
+    profile and saved values back; an unknown or expired token restores
+    nothing. Returns the profile key, or None.
+    """
+    if "profile_key" not in session_state:
+        token = query_params.get("session")
+        store = get_step_store()
+        saved = store.load_session(token) if token and store is not None else None
+        if saved is None:
+            return None
+        profile_key, values = saved
+        for name, value in values.items():
+            session_state.setdefault(name, value)
+        session_state["profile_key"] = profile_key
+        session_state["session_token"] = token
+
+    token = session_state.get("session_token")
+    if token and query_params.get("session") != token:
+        query_params["session"] = token
+    return session_state["profile_key"]
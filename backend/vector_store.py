@@ -0,0 +1,246 @@
+# backend/vector_store.py
+
+import os
+import json
+import uuid
+import threading
+from abc import ABC, abstractmethod
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Which backend serves the competency vectors: "chroma" or "numpy" (override in .env)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+CHROMA_PATH = "db/vectorstore"
+NUMPY_STORE_PATH = os.getenv("NUMPY_VECTORSTORE_PATH", "db/numpy_vectorstore")
+
+
+class VectorStore(ABC):
+    """
+    What the backend needs from a vector store. query() returns results in
+    Chroma's shape ({"ids": [[...]], "documents": [[...]], "metadatas": [[...]],
+    "distances": [[...]]}) so callers work the same with either backend.
+
+    version goes up on every upsert/delete made through the store, so
+    callers can cache data derived from its vectors.
+    """
+
+    version = 0
+
+    @abstractmethod
+    def get_metadatas(self) -> dict:
+        """Return {id: metadata} for every stored vector."""
+
+    @abstractmethod
+    def upsert(self, ids: list, embeddings: list, documents: list, metadatas: list):
+        ...
+
+    @abstractmethod
+    def delete(self, ids: list):
+        ...
+
+    @abstractmethod
+    def query(self, query_embedding, top_k: int = 5) -> dict:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    @abstractmethod
+    def get_vectors(self):
+        """Return (ids, float32 matrix, metadatas) for every stored vector."""
+
+
+class ChromaVectorStore(VectorStore):
+    """Chroma collection (SQLite + HNSW) behind the VectorStore interface."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_metadatas(self) -> dict:
+        existing = self.collection.get(include=["metadatas"])
+        return {i: meta or {} for i, meta in zip(existing["ids"], existing["metadatas"])}
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+        self.version += 1
+
+    def delete(self, ids):
+        self.collection.delete(ids=ids)
+        self.version += 1
+
+    def query(self, query_embedding, top_k=5):
+        return self.collection.query(query_embeddings=[list(map(float, query_embedding))], n_results=top_k)
+
+    def count(self):
+        return self.collection.count()
+
+    def get_vectors(self):
+        existing = self.collection.get(include=["embeddings", "metadatas"])
+        matrix = np.asarray(existing["embeddings"], dtype=np.float32)
+        return existing["ids"], matrix, [meta or {} for meta in existing["metadatas"]]
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Exact cosine search over an L2-normalised float32 matrix kept in a
+    memory-mapped .npy file, with ids/documents/metadata in a JSON sidecar.
+
+    A query is one matrix-vector product plus argpartition. Writes produce a
+    new snapshot that is swapped in whole, so readers never see a
+    half-written store. distances are cosine distances (1 - similarity).
+    """
+
+    def __init__(self, path=NUMPY_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot = self._load()
+
+    @property
+    def _records_file(self):
+        return os.path.join(self.path, "records.json")
+
+    def _load(self):
+        if not os.path.exists(self._records_file):
+            return np.zeros((0, 0), dtype=np.float32), [], [], []
+        with open(self._records_file, encoding="utf-8") as f:
+            records = json.load(f)
+        matrix = np.load(os.path.join(self.path, records["matrix_file"]), mmap_mode="r")
+        return matrix, records["ids"], records["documents"], records["metadatas"]
+
+    def _save(self, matrix, ids, documents, metadatas):
+        # Each write gets a new matrix file and records.json is swapped to point
+        # at it, so a mapped file is never overwritten in place (Windows forbids it).
+        os.makedirs(self.path, exist_ok=True)
+        matrix_file = f"embeddings-{uuid.uuid4().hex}.npy"
+        np.save(os.path.join(self.path, matrix_file), np.ascontiguousarray(matrix, dtype=np.float32))
+
+        tmp_records = self._records_file + ".tmp"
+        with open(tmp_records, "w", encoding="utf-8") as f:
+            json.dump(
+                {"matrix_file": matrix_file, "ids": ids, "documents": documents, "metadatas": metadatas},
+                f, ensure_ascii=False, default=str
+            )
+        os.replace(tmp_records, self._records_file)
+        self._snapshot = self._load()
+        self.version += 1
+
+        for name in os.listdir(self.path):
+            if name.startswith("embeddings-") and name != matrix_file:
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    pass  # Still mapped by a reader; removed on a later write
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def get_metadatas(self):
+        _, ids, _, metadatas = self._snapshot
+        return dict(zip(ids, metadatas))
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        if not ids:
+            return
+        new_vectors = self._normalize(embeddings)
+        with self._lock:
+            matrix, old_ids, old_documents, old_metadatas = self._snapshot
+            matrix = np.array(matrix) if len(old_ids) else np.zeros((0, new_vectors.shape[1]), dtype=np.float32)
+            ids_out, documents_out, metadatas_out = list(old_ids), list(old_documents), list(old_metadatas)
+            position = {i: n for n, i in enumerate(ids_out)}
+
+            appended = []
+            for vector, i, document, metadata in zip(new_vectors, ids, documents, metadatas):
+                if i in position:
+                    n = position[i]
+                    matrix[n] = vector
+                    documents_out[n], metadatas_out[n] = document, metadata
+                else:
+                    position[i] = len(ids_out)
+                    ids_out.append(i)
+                    documents_out.append(document)
+                    metadatas_out.append(metadata)
+                    appended.append(vector)
+
+            if appended:
+                matrix = np.vstack([matrix, np.stack(appended)])
+            self._save(matrix, ids_out, documents_out, metadatas_out)
+
+    def delete(self, ids):
+        drop = set(ids)
+        with self._lock:
+            matrix, old_ids, documents, metadatas = self._snapshot
+            keep = [n for n, i in enumerate(old_ids) if i not in drop]
+            if len(keep) == len(old_ids):
+                return
+            self._save(
+                np.asarray(matrix)[keep] if keep else np.zeros((0, matrix.shape[1]), dtype=np.float32),
+                [old_ids[n] for n in keep],
+                [documents[n] for n in keep],
+                [metadatas[n] for n in keep],
+            )
+
+    def query(self, query_embedding, top_k=5):
+        matrix, ids, documents, metadatas = self._snapshot
+        k = min(top_k, len(ids))
+        if k == 0:
+            return {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+
+        scores = matrix @ self._normalize(query_embedding)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return {
+            "ids": [[ids[n] for n in top]],
+            "documents": [[documents[n] for n in top]],
+            "metadatas": [[metadatas[n] for n in top]],
+            "distances": [[float(1 - scores[n]) for n in top]],
+        }
+
+    def count(self):
+        return len(self._snapshot[1])
+
+    def get_vectors(self):
+        matrix, ids, _, metadatas = self._snapshot
+        return list(ids), matrix, list(metadatas)
+
+
+_chroma_collections = {}
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_chroma_collection(name: str = "competencies"):
+    """Return a collection of the persistent Chroma store, opening it on first use."""
+    with _stores_lock:
+        if name not in _chroma_collections:
+            from backend.resources import get_chroma_client
+            # Cosine space, so distances match NumpyVectorStore (1 - similarity)
+            collection = get_chroma_client(CHROMA_PATH).get_or_create_collection(
+                name=name, metadata={"hnsw:space": "cosine"}
+            )
+            if (collection.metadata or {}).get("hnsw:space") != "cosine":
+                print(f"⚠️ Chroma collection '{name}' uses L2 distances; delete {CHROMA_PATH} and re-run scripts/embed_competencies.py to rebuild it with cosine")
+            _chroma_collections[name] = collection
+        return _chroma_collections[name]
+
+
+def get_vector_store(name: str = "competencies", backend: str = None) -> VectorStore:
+    """Return the process-wide store for a collection on the configured backend."""
+    backend = backend or VECTOR_BACKEND
+    key = (backend, name)
+    store = _stores.get(key)
+    if store is None:
+        if backend == "numpy":
+            store = NumpyVectorStore(os.path.join(NUMPY_STORE_PATH, name))
+        elif backend == "chroma":
+            store = ChromaVectorStore(get_chroma_collection(name))
+        else:
+            raise ValueError(f"Unknown VECTOR_BACKEND '{backend}' (expected 'chroma' or 'numpy')")
+        with _stores_lock:
+            store = _stores.setdefault(key, store)
+    return store
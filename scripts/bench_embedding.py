@@ -0,0 +1,45 @@
+# scripts/bench_embedding.py
+#
+# Embedding throughput on the competency catalog, optionally scaled up by
+# repeating it (--scale 10 ~ a catalog 10x larger):
+#   plain model.encode(texts)  vs  encode_texts() single-process  vs  encode_texts() on all cores
+#
+#   python -m scripts.bench_embedding --scale 10
+
+import os
+import time
+import argparse
+
+from backend.rag_engine import load_competency_data, get_embedding_model
+from backend.embedding_pipeline import encode_texts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    definitions = load_competency_data()["Definition"].astype(str).tolist()
+    texts = [f"{text} ({copy})" for copy in range(args.scale) for text in definitions]
+    model = get_embedding_model()
+    model.encode(texts[:32])  # warm-up
+
+    start = time.perf_counter()
+    model.encode(texts)
+    seconds = time.perf_counter() - start
+    print(f"{'model.encode (default)':<28} {len(texts) / seconds:8.0f} texts/sec")
+
+    _, stats = encode_texts(texts, batch_size=args.batch_size, processes=1, model=model, verbose=False)
+    print(f"{'encode_texts, 1 process':<28} {stats['texts_per_sec']:8.0f} texts/sec")
+
+    if args.processes > 1:
+        import backend.embedding_pipeline as pipeline
+        pipeline.EMBED_MULTIPROCESS_MIN_TEXTS = 0
+        _, stats = encode_texts(texts, batch_size=args.batch_size, processes=args.processes, model=model, verbose=False)
+        print(f"{f'encode_texts, {args.processes} processes':<28} {stats['texts_per_sec']:8.0f} texts/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# scripts/bench_flow.py
+#
+# Drives the recruitee -> competency summary -> job recommendation -> job
+# search -> gap analyzer flow against the offline stub server
+# (scripts/stub_server.py) and reports p50/p95 per step. Needs the embedding
+# model and the competency vector store, like the app itself.
+#
+#   python -m scripts.bench_flow --users 4 --iterations 5 --llm-latency lognormal:0.8:0.4 --rate-limit-rate 0.05
+#
+# Each iteration serves a new batch of postings so the job facts cache starts
+# cold; pass --warm to measure the cached path instead.
+
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+from collections import defaultdict
+
+from scripts.stub_server import add_stub_arguments, stub_from_args
+
+SAMPLE_CV = """Data Analyst at PT Example (2021 - present)
+- Built SQL and Python pipelines feeding weekly management dashboards
+- Led a team of three analysts; presented insights to senior stakeholders
+Business Intelligence Intern at Example Bank (2020)
+- Automated Excel reporting with Python
+Skills: SQL, Python, Tableau, statistics, stakeholder management, Google Cloud
+Certifications: Google Cloud Professional Data Engineer"""
+
+PREFERENCES = {"industries": ["IT", "Finance"], "company_type": "Private Sector", "location": "Jakarta, Indonesia"}
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class StepTimer:
+    """Collects seconds per step name, keeping the order steps were first seen."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def record(self, step: str, seconds: float):
+        self.samples[step].append(seconds)
+
+    def rows(self) -> list:
+        return [
+            (step, len(v), percentile(v, 50), percentile(v, 95), statistics.mean(v), max(v))
+            for step, v in self.samples.items()
+        ]
+
+
+def read_cv(path: str) -> str:
+    if not path:
+        return SAMPLE_CV
+    from PyPDF2 import PdfReader
+    return "\n".join(page.extract_text() for page in PdfReader(path).pages if page.extract_text())
+
+
+async def run_flow(cv_path: str, search_url: str, timer: StepTimer):
+    """One user's pass through every page of the flow, timing each step."""
+    from backend.competency_flow import build_competency_summary_dag
+    from backend.agents.agent_job_recommender import recommend_jobs_from_competencies
+    from backend.job_search_client import search_jobs_async
+    from backend.job_dedup import dedupe_jobs
+    from backend.job_ranker import prerank_jobs, ENRICH_TOP_N
+    from backend.agents.agent_enrich_job import stream_enriched_jobs
+    from backend.gap_flow import run_gap_analysis
+
+    flow_start = time.perf_counter()
+
+    start = time.perf_counter()
+    cv_text = await asyncio.to_thread(read_cv, cv_path)
+    timer.record("recruitee: read profile", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    dag = build_competency_summary_dag()
+    results = await dag.run({"input_text": cv_text, "summary_text": "", "cv_text": cv_text})
+    timer.record("competency summary", time.perf_counter() - start)
+    for node, seconds in dag.timings.items():
+        timer.record(f"  {node}", seconds)
+
+    summary = results["summary"]
+    competencies, seen = [], set()
+    role_items = [{"competency": c, "level": results["user_levels"][c]} for c, _ in results["role_matches"]]
+    for item in role_items + list(results["strengths"]):
+        if item["competency"] not in seen:
+            seen.add(item["competency"])
+            competencies.append({"competency": item["competency"], "level": item["level"]})
+
+    start = time.perf_counter()
+    recommendations = await recommend_jobs_from_competencies(competencies)
+    timer.record("job recommendation", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    raw_jobs = await search_jobs_async(recommendations[0]["title"], PREFERENCES, api_key="stub", api_url=search_url)
+    raw_jobs = await asyncio.to_thread(dedupe_jobs, raw_jobs)
+    timer.record("job search: search + dedupe", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    candidates = await asyncio.to_thread(prerank_jobs, raw_jobs, summary, ENRICH_TOP_N)
+    timer.record("job search: prerank", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    enriched = []
+    async for job in stream_enriched_jobs(candidates, summary, competencies=competencies):
+        if not enriched:
+            timer.record("job search: first enriched job", time.perf_counter() - start)
+        enriched.append(job)
+    timer.record("job search: enrichment", time.perf_counter() - start)
+
+    if enriched:
+        start = time.perf_counter()
+        first_gap = []
+
+        def on_gap(gaps):
+            if not first_gap:
+                first_gap.append(time.perf_counter() - start)
+
+        await run_gap_analysis(max(enriched, key=lambda j: j.get("match_score", 0)), summary, competencies, on_gap=on_gap)
+        if first_gap:
+            timer.record("gap analyzer: first gap", first_gap[0])
+        timer.record("gap analyzer", time.perf_counter() - start)
+
+    timer.record("total flow", time.perf_counter() - flow_start)
+
+
+async def run_iteration(users: int, cv_path: str, search_url: str, timer: StepTimer) -> int:
+    outcomes = await asyncio.gather(
+        *(run_flow(cv_path, search_url, timer) for _ in range(users)), return_exceptions=True
+    )
+    failures = [o for o in outcomes if isinstance(o, Exception)]
+    for failure in failures:
+        print(f"❌ Flow failed: {failure!r}")
+    return len(failures)
+
+
+def print_report(timer: StepTimer):
+    print(f"\n{'step':<34}{'n':>5}{'p50 s':>10}{'p95 s':>10}{'mean s':>10}{'max s':>10}")
+    for step, n, p50, p95, mean, worst in timer.rows():
+        print(f"{step:<34}{n:>5}{p50:>10.3f}{p95:>10.3f}{mean:>10.3f}{worst:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1, help="concurrent flows per iteration")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--cv", help="PDF to use as the uploaded CV (default: a built-in sample)")
+    parser.add_argument("--warm", action="store_true", help="serve the same postings every iteration")
+    parser.add_argument("--json", help="write raw step timings to this file")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    stub = stub_from_args(args).start()
+    # Must be set before backend modules read their configuration
+    os.environ["APILOGY_API_URL"] = stub.llm_url
+    os.environ["SEARCH_API_URL"] = stub.search_url
+    os.environ["SEARCH_API_KEY"] = "stub"
+    os.environ["ENRICH_CACHE_PATH"] = tempfile.mkdtemp(prefix="bench_enrich_cache_")
+    if "backend.llm_api" in sys.modules:
+        sys.exit("❌ backend.llm_api was imported before the stub URL was set")
+
+    from backend import llm_api
+    from backend.async_runtime import run_sync
+    print(f"🧪 Stub at {stub.url}; LLM client rate limit {llm_api.RATE_LIMIT_PER_SEC}/s (APILOGY_RATE_LIMIT_PER_SEC)")
+
+    timer = StepTimer()
+    failures = 0
+    try:
+        for iteration in range(args.iterations):
+            if not args.warm:
+                stub.epoch = iteration
+            start = time.perf_counter()
+            # Same shared loop the pages run on
+            failures += run_sync(run_iteration(args.users, args.cv, stub.search_url, timer))
+            print(f"⏱️ Iteration {iteration + 1}/{args.iterations}: {time.perf_counter() - start:.2f}s")
+    finally:
+        stub.stop()
+
+    print_report(timer)
+    print(f"\nStub requests: {stub.stats()['requests']}")
+    print(f"Stub statuses: {stub.stats()['statuses']}")
+    print(f"LLM client: {llm_api.get_rate_limit_stats()}")
+    if failures:
+        print(f"❌ {failures} flow(s) failed")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({step: v for step, v in timer.samples.items()}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
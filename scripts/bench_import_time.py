@@ -0,0 +1,92 @@
+# scripts/bench_import_time.py
+#
+# Cold-start import cost of app/main.py and each page, measured with
+# `python -X importtime` in a fresh interpreter per file. Only the page's
+# top-level import statements are executed, so Streamlit calls in the page
+# body don't run.
+#
+#   python -m scripts.bench_import_time
+#   python -m scripts.bench_import_time --budget-ms 3000   # non-zero exit if any file is over
+
+import os
+import ast
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TARGETS = ["app/main.py"] + sorted(str(p.relative_to(ROOT)) for p in (ROOT / "app" / "pages").glob("*.py"))
+
+
+def top_level_imports(path: Path) -> str:
+    """Source of the module-level import statements of a file."""
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source)
+    return "\n".join(
+        ast.get_source_segment(source, node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def run_importtime(code: str):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    top_level = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # one space only = imported directly by the code
+            top_level.append((name.strip(), int(cumulative) / 1000))
+    return proc, top_level
+
+
+def measure(path: Path, startup_modules: set) -> dict:
+    proc, top_level = run_importtime(top_level_imports(path))
+    top_level = [(name, ms) for name, ms in top_level if name not in startup_modules]
+
+    error = None
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit code {proc.returncode}"
+
+    return {
+        "total_ms": sum(ms for _, ms in top_level),
+        "heaviest": sorted(top_level, key=lambda item: -item[1])[:5],
+        "error": error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    # Modules every interpreter imports at startup are not the page's cost
+    _, startup = run_importtime("pass")
+    startup_modules = {name for name, _ in startup}
+
+    over_budget = False
+    for target in args.targets:
+        result = measure(ROOT / target, startup_modules)
+        print(f"{target:<40} {result['total_ms']:9.1f} ms")
+        for name, ms in result["heaviest"]:
+            print(f"    {name:<36} {ms:9.1f} ms")
+        if result["error"]:
+            print(f"    ⚠️ import failed: {result['error']}")
+        if args.budget_ms is not None and result["total_ms"] > args.budget_ms:
+            over_budget = True
+
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
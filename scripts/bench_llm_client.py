@@ -0,0 +1,88 @@
+# scripts/bench_llm_client.py
+#
+# Measures per-call overhead of call_apilogy_llm against a local stub server:
+# a fresh httpx.AsyncClient per call (old behaviour) vs the pooled client.
+#
+#   python -m scripts.bench_llm_client --calls 200
+
+import json
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from backend import llm_api
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        reply = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+async def call_with_fresh_client(prompt):
+    payload = {"messages": [{"role": "user", "content": prompt}], "max_tokens": 1000, "temperature": 0.7, "stream": False}
+    headers = {"Content-Type": "application/json", "x-api-key": llm_api.API_KEY}
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        response = await client.post(llm_api.API_URL, headers=headers, json=payload)
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+
+async def timed_calls(fn, calls):
+    timings = []
+    for i in range(calls):
+        start = time.perf_counter()
+        await fn(f"prompt {i}")
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(timings):7.3f} ms   p50 {statistics.median(timings):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    llm_api.API_URL = f"http://127.0.0.1:{server.server_port}/chat/completions"
+    llm_api.configure_rate_limit(rate_per_sec=0)  # measure connection overhead, not throttling
+
+    try:
+        report("fresh client per call", asyncio.run(timed_calls(call_with_fresh_client, args.calls)))
+
+        async def pooled():
+            try:
+                return await timed_calls(llm_api.call_apilogy_llm, args.calls)
+            finally:
+                await llm_api.aclose_llm_client()
+
+        report("pooled client", asyncio.run(pooled()))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
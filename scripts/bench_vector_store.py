@@ -0,0 +1,82 @@
+# scripts/bench_vector_store.py
+#
+# Query latency and recall@k of the Chroma (HNSW) and NumPy (exact) vector
+# backends on the same vectors. Uses the competency catalog embeddings by
+# default, or random vectors with --random N.
+#
+#   python -m scripts.bench_vector_store --queries 500 --top-k 5
+#   python -m scripts.bench_vector_store --random 100000 --dim 384
+
+import time
+import tempfile
+import argparse
+import numpy as np
+
+from backend.vector_store import ChromaVectorStore, NumpyVectorStore
+
+
+def load_vectors(args):
+    if args.random:
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(args.random, args.dim)).astype(np.float32)
+        return vectors, [f"doc {i}" for i in range(args.random)]
+
+    from backend.rag_engine import load_competency_data
+    from backend.embedding_pipeline import encode_texts
+    documents = load_competency_data()["Definition"].astype(str).tolist()
+    vectors, _ = encode_texts(documents)
+    return vectors, documents
+
+
+def time_queries(store, queries, top_k):
+    timings, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        result = store.query(query, top_k)
+        timings.append((time.perf_counter() - start) * 1000)
+        results.append(result["ids"][0])
+    return np.array(timings), results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--random", type=int, default=0)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    vectors, documents = load_vectors(args)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [f"id{i}" for i in range(len(vectors))]
+    metadatas = [{"n": i} for i in range(len(vectors))]
+
+    # Queries: perturbed copies of stored vectors, like a user text near a definition
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, len(vectors), args.queries)] + rng.normal(scale=0.05, size=(args.queries, vectors.shape[1]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from chromadb import PersistentClient
+        collection = PersistentClient(path=f"{tmp}/chroma").get_or_create_collection(
+            name="bench", metadata={"hnsw:space": "cosine"}
+        )
+        chroma = ChromaVectorStore(collection)
+        for start in range(0, len(ids), 5000):  # Chroma caps batch size
+            end = start + 5000
+            chroma.upsert(ids[start:end], vectors[start:end].tolist(), documents[start:end], metadatas[start:end])
+
+        numpy_store = NumpyVectorStore(f"{tmp}/numpy")
+        numpy_store.upsert(ids, vectors, documents, metadatas)
+
+        exact_timings, exact = time_queries(numpy_store, queries, args.top_k)
+        chroma_timings, approx = time_queries(chroma, queries, args.top_k)
+
+    recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact)])
+    print(f"{len(ids)} vectors x {vectors.shape[1]} dims, {args.queries} queries, top_k={args.top_k}")
+    for label, timings in (("numpy (exact)", exact_timings), ("chroma (hnsw)", chroma_timings)):
+        print(f"{label:<16} p50 {np.percentile(timings, 50):7.3f} ms   p95 {np.percentile(timings, 95):7.3f} ms")
+    print(f"chroma recall@{args.top_k} vs exact: {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
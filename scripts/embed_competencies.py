@@ -1,6 +1,12 @@
 from backend.rag_engine import load_competency_data, embed_competencies
 
-df = load_competency_data("data/direktori_komp.csv")
-embed_competencies(df)
+# The embedding pipeline may spawn worker processes, which re-import this file
+if __name__ == "__main__":
+    df = load_competency_data("data/direktori_komp.csv")
+    report = embed_competencies(df)
 
-print("✅ Competency data embedded successfully!")
+    print(
+        f"✅ Competency data embedded successfully! "
+        f"added={report['added']} updated={report['updated']} deleted={report['deleted']} "
+        f"unchanged={report['unchanged']} in {report['seconds']:.2f}s"
+    )
@@ -0,0 +1,31 @@
+# scripts/evict_enrichment_cache.py
+#
+# Keeps chromadb_data bounded: removes expired entries from the per-user
+# enrichment cache and the global job facts cache, and trims each to its
+# max entries. Run it from cron, e.g. daily:
+#
+#   python -m scripts.evict_enrichment_cache --drop-legacy
+
+import argparse
+
+from backend.enrichment_cache import get_enrichment_cache, get_job_facts_cache, get_chroma_client, LEGACY_COLLECTION
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drop-legacy", action="store_true", help=f"also delete the old '{LEGACY_COLLECTION}' collection")
+    args = parser.parse_args()
+
+    for label, cache in (("enrichment", get_enrichment_cache()), ("job facts", get_job_facts_cache())):
+        removed = cache.evict()
+        print(f"🧹 Removed {removed} {label} cache entries, {cache.collection.count()} left")
+
+    if args.drop_legacy:
+        client = get_chroma_client()
+        if LEGACY_COLLECTION in [getattr(c, "name", c) for c in client.list_collections()]:
+            client.delete_collection(LEGACY_COLLECTION)
+            print(f"🗑️ Dropped legacy collection '{LEGACY_COLLECTION}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+# scripts/stub_server.py
+#
+# Offline stand-in for the Apilogy LLM and the Google Jobs search API, for
+# end-to-end benchmarks. LLM prompts are classified by the agent that wrote
+# them and answered with canned, well-formed responses (streamed as SSE when
+# asked); /search returns Google-Jobs-shaped pages with next-page tokens.
+# Latency, 5xx and 429 rates are configurable per endpoint.
+#
+#   python -m scripts.stub_server --port 8765 --llm-latency lognormal:0.8:0.4 --rate-limit-rate 0.05
+#
+# then point the app at it:
+#
+#   APILOGY_API_URL=http://127.0.0.1:8765/llm/chat/completions SEARCH_API_URL=http://127.0.0.1:8765/search
+
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPANIES = ["Telkom Indonesia", "Bank Mandiri", "Gojek", "Tokopedia", "Pertamina", "Traveloka", "Bukalapak", "XL Axiata"]
+LOCATIONS = ["Jakarta, Indonesia", "Bandung, Indonesia", "Surabaya, Indonesia", "Remote"]
+BOARDS = ["LinkedIn", "Glints", "JobStreet", "Kalibrr"]
+SKILLS = ["SQL", "Python", "stakeholder management", "data visualization", "cloud platforms", "agile delivery",
+          "statistics", "API design", "communication", "project planning"]
+
+
+class Latency:
+    """
+    Delay distribution parsed from "fixed:S", "uniform:LO:HI",
+    "normal:MEAN:SD" or "lognormal:MEDIAN:SIGMA" (seconds).
+    """
+
+    def __init__(self, spec: str = "fixed:0"):
+        kind, *params = spec.split(":")
+        self.kind, self.params = kind, [float(p) for p in params]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if expected.get(kind) != len(self.params):
+            raise ValueError(f"Bad latency spec '{spec}' (e.g. fixed:0.2, uniform:0.1:0.5, lognormal:0.8:0.4)")
+        self.spec = spec
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            return p[0]
+        if self.kind == "uniform":
+            return rng.uniform(p[0], p[1])
+        if self.kind == "normal":
+            return max(rng.gauss(p[0], p[1]), 0.0)
+        return p[0] * math.exp(rng.gauss(0, p[1])) if p[0] > 0 else 0.0
+
+
+def _stable(*parts) -> int:
+    return int(hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _list_after(prompt: str, heading: str) -> list:
+    """The "- item" lines that follow a heading in the prompt."""
+    _, _, rest = prompt.partition(heading)
+    items = []
+    for line in rest.splitlines()[1:]:
+        if line.startswith("- "):
+            items.append(line[2:].strip())
+        elif items and line.strip():
+            break
+    return items
+
+
+def _json_after(prompt: str, heading: str, default):
+    """The JSON value that follows a heading in the prompt."""
+    _, _, rest = prompt.partition(heading)
+    try:
+        value, _ = json.JSONDecoder().raw_decode(rest.strip())
+        return value
+    except json.JSONDecodeError:
+        return default
+
+
+# --- Canned answers, one per agent prompt ---
+
+def answer_summary(prompt):
+    return ("Data professional with 5 years of experience in SQL, Python and dashboarding. Led a team of three "
+            "analysts, built automated reporting pipelines, and presented insights to senior stakeholders. "
+            "Certified in cloud data engineering; strong communication and project planning skills.")
+
+
+def answer_latest_job(prompt):
+    return "Data Analyst"
+
+
+def answer_role_competencies(prompt):
+    return ", ".join(_list_after(prompt, "Available competencies:")[:7])
+
+
+def answer_levels(prompt):
+    names = _list_after(prompt, "for each of the following competencies:")
+    return json.dumps({name: 1 + _stable(name) % 5 for name in names})
+
+
+def answer_level(prompt):
+    return str(1 + _stable(prompt) % 5)
+
+
+def answer_strengths(prompt):
+    names = _list_after(prompt, "Available Competencies:")[:5]
+    return json.dumps([{"competency": name, "level": 3 + _stable(name) % 3} for name in names])
+
+
+def answer_recommendations(prompt):
+    return json.dumps([
+        {"title": "Data Analyst", "level": "Senior", "fit_reason": "Strong SQL, Python and reporting experience."},
+        {"title": "Business Intelligence Developer", "level": "Mid", "fit_reason": "Dashboarding and stakeholder work."},
+        {"title": "Data Engineer", "level": "Junior", "fit_reason": "Pipeline automation and cloud certification."},
+    ])
+
+
+def answer_job_facts(prompt):
+    jobs = _json_after(prompt, "Jobs (raw):", [])
+    return json.dumps([{
+        "role": job.get("title", "Unknown Role"),
+        "company": job.get("company_name", "Unknown Company"),
+        "company_type": "Private",
+        "location": job.get("location", ""),
+        "industry": ["Technology", "Finance", "Telecommunication", "Energy"][_stable(job.get("company_name")) % 4],
+        "pay_usd": f"{800 + _stable(job.get('title'), job.get('company_name')) % 1200}-{2200 + _stable(job.get('title')) % 800}",
+        "description": str(job.get("description", ""))[:160],
+        "link": job.get("apply_link") or job.get("sharing_link", ""),
+    } for job in jobs])
+
+
+def answer_scores(prompt):
+    jobs = _json_after(prompt, "\nJobs:\n", [])
+    return json.dumps([{
+        "fit_reason": f"Your SQL and reporting experience fits the {job.get('role', 'role')} position.",
+        "match_score": 40 + _stable(job.get("role"), job.get("company")) % 55,
+    } for job in jobs])
+
+
+def answer_fit_reasons(prompt):
+    jobs = _json_after(prompt, "\nJobs:\n", [])
+    return json.dumps([{
+        "fit_reason": f"Matches your {', '.join(job.get('matched_competencies', [])[:2]) or 'profile'}; "
+                      f"grow {', '.join(job.get('missing_competencies', [])[:1]) or 'domain knowledge'}."
+    } for job in jobs])
+
+
+def answer_gaps(prompt):
+    gaps = [{
+        "type": "skill",
+        "competency": skill,
+        "current_level": 2 + i % 2,
+        "required_level": 4,
+        "explanation": f"The role relies on {skill} daily.",
+        "recommendation": f"Complete a hands-on {skill} project.",
+        "suggested_learning_mode": ["project", "video", "community"][i % 3],
+    } for i, skill in enumerate(SKILLS[:6])]
+    gaps.append({
+        "type": "experience",
+        "competency": "Team leadership",
+        "explanation": "The role leads a small team.",
+        "recommendation": "Mentor a junior colleague.",
+        "suggested_learning_mode": "internship",
+    })
+    return json.dumps({"job_title": "Data Analyst", "gaps": gaps})
+
+
+def answer_requirements(prompt):
+    return json.dumps({"requirements": [{
+        "requirement": f"Experience with {skill}",
+        "category": "technical skill" if i % 2 == 0 else "soft skill",
+        "reason": f"{skill} is central to the role.",
+        "match_score": 50 + _stable(skill) % 50,
+        "match_explanation": f"The CV mentions {skill}.",
+    } for i, skill in enumerate(SKILLS[:5])]})
+
+
+def answer_learning_plan(prompt):
+    return json.dumps({"plan": [{
+        "week": week,
+        "focus_area": SKILLS[week - 1],
+        "objectives": f"Get comfortable with {SKILLS[week - 1]}.",
+        "activities": [f"Follow a {SKILLS[week - 1]} course", "Build a small project"],
+        "resources": [f"https://example.com/learn/{week}"],
+        "rationale": "Closes one of the largest gaps.",
+    } for week in range(1, 5)]})
+
+
+# (prompt type, marker, answer); the first marker found in the prompt wins
+PROMPT_TYPES = [
+    ("job_facts", "You are a job data assistant.", answer_job_facts),
+    ("fit_reasons", "already has a match score", answer_fit_reasons),
+    ("job_scores", "You are a job matching assistant.", answer_scores),
+    ("summary", "You are a professional career analyst.", answer_summary),
+    ("latest_job", "You are an expert in resume analysis.", answer_latest_job),
+    ("role_competencies", "You are a career development expert.", answer_role_competencies),
+    ("levels", "for each of the following competencies:", answer_levels),
+    ("level", "Reply with ONLY a single digit", answer_level),
+    ("strengths", "You are a professional HR analyst.", answer_strengths),
+    ("recommendations", "You are a career advisor AI.", answer_recommendations),
+    ("gaps", "You are a career coach AI.", answer_gaps),
+    ("requirements", "You are an AI job analyst.", answer_requirements),
+    ("learning_plan", "You are a learning coach AI.", answer_learning_plan),
+]
+
+
+def classify_prompt(prompt: str) -> str:
+    for prompt_type, marker, _ in PROMPT_TYPES:
+        if marker in prompt:
+            return prompt_type
+    return "unknown"
+
+
+def answer_prompt(prompt: str) -> str:
+    for _, marker, answer in PROMPT_TYPES:
+        if marker in prompt:
+            return answer(prompt)
+    return "OK"
+
+
+# --- Search ---
+
+def search_page(query: str, page: int, epoch: int = 0, page_size: int = 10, max_pages: int = 3) -> dict:
+    """
+    One Google Jobs result page. Jobs depend on the query (minus the
+    location), so title variants overlap; the first page of every query
+    also carries a few postings shared across queries, listed under a
+    different board, for deduplication to collapse.
+    """
+    title, _, location = query.partition(" in ")
+    location = location or LOCATIONS[_stable(title) % len(LOCATIONS)]
+    jobs = []
+    for n in range(page_size):
+        shared = page == 0 and n < 3
+        seed = ("shared", n, epoch) if shared else (title.lower(), page, n, epoch)
+        company = COMPANIES[_stable(*seed) % len(COMPANIES)]
+        role = f"{'Senior ' if _stable(*seed, 'level') % 3 == 0 else ''}{title.strip().title() if not shared else 'Data Analyst'}"
+        board = BOARDS[(_stable(*seed) + (_stable(title) if shared else 0)) % len(BOARDS)]
+        skills = [SKILLS[(_stable(*seed) + k) % len(SKILLS)] for k in range(4)]
+        link = f"https://jobs.example.com/{board.lower()}/{_stable(*seed):08x}"
+        jobs.append({
+            "title": role,
+            "company_name": company,
+            "location": location,
+            "via": f"via {board}",
+            "description": (f"{company} is hiring a {role} in {location}. You will work with {', '.join(skills)} "
+                            f"to deliver insights for product and business teams. Posting {_stable(*seed)} "
+                            f"(batch {epoch}). ") * 3,
+            "detected_extensions": {"posted_at": f"{1 + _stable(*seed) % 20} days ago", "schedule_type": "Full-time"},
+            "apply_options": [{"title": board, "link": link}],
+            "sharing_link": link,
+            "job_id": f"{board}-{_stable(*seed):08x}",
+        })
+    result = {"search_metadata": {"status": "Success"}, "jobs_results": jobs}
+    if page + 1 < max_pages:
+        result["serpapi_pagination"] = {"next_page_token": f"page-{page + 1}"}
+    return result
+
+
+class StubServer:
+    """
+    Runs the stub in a background thread. llm_latency / search_latency are
+    Latency specs; error_rate and rate_limit_rate are the share of requests
+    answered with 503 and 429 (with Retry-After: retry_after). stream_chunk
+    is the size of each SSE piece; bump epoch to serve a new batch of jobs.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, llm_latency="fixed:0", search_latency="fixed:0",
+                 error_rate=0.0, rate_limit_rate=0.0, retry_after=1, stream_chunk=40, seed=0):
+        self.llm_latency = Latency(llm_latency)
+        self.search_latency = Latency(search_latency)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stream_chunk = stream_chunk
+        self.epoch = 0
+        self.requests = Counter()
+        self.statuses = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def llm_url(self) -> str:
+        return f"{self.url}/llm/chat/completions"
+
+    @property
+    def search_url(self) -> str:
+        return f"{self.url}/search"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="stub-server")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": dict(self.requests), "statuses": dict(self.statuses)}
+
+    def _draw(self, latency: Latency):
+        """(delay, injected status or None) for one request."""
+        with self._lock:
+            delay = latency.sample(self._rng)
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return delay, 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, 503
+        return delay, None
+
+    def _record(self, kind, status):
+        with self._lock:
+            self.requests[kind] += 1
+            self.statuses[status] += 1
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _send(self, status, body: bytes, content_type="application/json", headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _inject(self, kind, latency) -> bool:
+                """Sleep, then answer with an injected error if one is drawn. Returns True if it did."""
+                delay, status = stub._draw(latency)
+                time.sleep(delay)
+                if status is None:
+                    return False
+                stub._record(kind, status)
+                headers = {"Retry-After": str(stub.retry_after)} if status == 429 else None
+                self._send(status, json.dumps({"error": "injected"}).encode(), headers=headers)
+                return True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/stats":
+                    return self._send(200, json.dumps(stub.stats()).encode())
+                if url.path != "/search":
+                    return self._send(404, b"{}")
+                if self._inject("search", stub.search_latency):
+                    return
+                params = parse_qs(url.query)
+                token = params.get("next_page_token", [""])[0]
+                page = int(token.split("-")[1]) if re.fullmatch(r"page-\d+", token) else 0
+                result = search_page(params.get("q", [""])[0], page, stub.epoch)
+                stub._record("search", 200)
+                self._send(200, json.dumps(result).encode())
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                messages = payload.get("messages") or [{}]
+                prompt = str(messages[-1].get("content", ""))
+                kind = classify_prompt(prompt)
+                if self._inject(kind, stub.llm_latency):
+                    return
+                content = answer_prompt(prompt)
+                stub._record(kind, 200)
+
+                if not payload.get("stream"):
+                    body = json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}]})
+                    return self._send(200, body.encode())
+
+                # Server-sent events in chunked encoding, one delta per piece
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                pieces = [content[i:i + stub.stream_chunk] for i in range(0, len(content), stub.stream_chunk)]
+                events = [json.dumps({"choices": [{"delta": {"content": p}}]}) for p in pieces] + ["[DONE]"]
+                for event in events:
+                    data = f"data: {event}\n\n".encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--llm-latency", default="fixed:0", help="e.g. fixed:0.5, uniform:0.2:1.5, lognormal:0.8:0.4")
+    parser.add_argument("--search-latency", default="fixed:0", help="latency spec for /search")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with a 429")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def stub_from_args(args, port=0) -> StubServer:
+    return StubServer(
+        port=port,
+        llm_latency=args.llm_latency,
+        search_latency=args.search_latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    stub = stub_from_args(args, port=args.port).start()
+    print(f"🧪 Stub LLM at {stub.llm_url}")
+    print(f"🧪 Stub search at {stub.search_url} (stats at {stub.url}/stats)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# tests/conftest.py
+
+import pytest
+
+
+class InMemoryCollection:
+    """The part of a Chroma collection the enrichment caches use, kept in memory."""
+
+    def __init__(self):
+        self.records = {}
+
+    def get(self, ids=None, include=None):
+        keys = [i for i in (ids if ids is not None else self.records) if i in self.records]
+        return {
+            "ids": keys,
+            "documents": [self.records[i][0] for i in keys],
+            "metadatas": [self.records[i][1] for i in keys],
+        }
+
+    def upsert(self, ids, documents, metadatas, embeddings):
+        for i, doc, meta in zip(ids, documents, metadatas):
+            self.records[i] = (doc, meta)
+
+    def delete(self, ids):
+        for i in ids:
+            self.records.pop(i, None)
+
+    def count(self):
+        return len(self.records)
+
+
+@pytest.fixture
+def memory_collection():
+    return InMemoryCollection()
@@ -0,0 +1,88 @@
+# tests/test_agent_dag.py
+
+import time
+import asyncio
+
+import pytest
+
+from backend.agent_dag import AgentDAG
+from backend import competency_flow
+
+
+def _diamond(calls, delay=0.05):
+    async def step(name, **kwargs):
+        calls.append(name)
+        await asyncio.sleep(delay)
+        return f"{name}({','.join(str(v) for v in kwargs.values())})"
+
+    def node(name):
+        async def run(**kwargs):
+            return await step(name, **kwargs)
+        return run
+
+    return (
+        AgentDAG()
+        .add("a", node("a"), ["x"])
+        .add("b", node("b"), ["a"])
+        .add("c", node("c"), ["y"])
+        .add("d", node("d"), ["b", "c"])
+    )
+
+
+def test_independent_nodes_run_concurrently():
+    calls = []
+    start = time.perf_counter()
+    results = asyncio.run(_diamond(calls, delay=0.1).run({"x": 1, "y": 2}))
+    elapsed = time.perf_counter() - start
+
+    assert results["d"] == "d(b(a(1)),c(2))"
+    assert elapsed < 0.37  # critical path a -> b -> d (0.3s); all four in sequence would be 0.4s
+    assert calls.index("c") < calls.index("b")
+
+
+def test_only_nodes_downstream_of_a_change_rerun():
+    calls, state = [], {}
+    asyncio.run(_diamond(calls, delay=0).run({"x": 1, "y": 2}, state=state))
+    calls.clear()
+
+    reused = []
+    results = asyncio.run(_diamond(calls, delay=0).run(
+        {"x": 1, "y": 3}, state=state, on_done=lambda name, out, secs, was_reused: was_reused and reused.append(name)
+    ))
+
+    assert sorted(calls) == ["c", "d"]
+    assert sorted(reused) == ["a", "b"]
+    assert results["d"] == "d(b(a(1)),c(3))"
+
+
+def test_missing_input_and_cycles_are_rejected():
+    dag = AgentDAG().add("a", lambda b: b, ["b"]).add("b", lambda a: a, ["a"])
+    with pytest.raises(ValueError, match="Cycle"):
+        asyncio.run(dag.run({}))
+    with pytest.raises(ValueError, match="neither a node nor a flow input"):
+        asyncio.run(AgentDAG().add("a", lambda z: z, ["z"]).run({}))
+
+
+def test_competency_flow_runs_cv_branch_alongside_role_chain(monkeypatch):
+    order = []
+
+    async def slow(label, value):
+        order.append(label)
+        await asyncio.sleep(0.02)
+        return value
+
+    monkeypatch.setattr(competency_flow, "summarize_user_profile", lambda text: slow("summary", "S"))
+    monkeypatch.setattr(competency_flow, "extract_latest_job_role", lambda s: slow("role", "Analyst"))
+    monkeypatch.setattr(competency_flow, "shortlist_competencies", lambda texts: ["Python", "SQL"])
+    monkeypatch.setattr(competency_flow, "map_competencies_for_role", lambda role, names: slow("map", names))
+    monkeypatch.setattr(competency_flow, "query_competency_by_name", lambda name: {"definition": name, "metadata": {}})
+    monkeypatch.setattr(competency_flow, "estimate_user_levels", lambda names, s: slow("levels", {n: 3 for n in names}))
+    monkeypatch.setattr(competency_flow, "extract_top_strengths", lambda cv, names: slow("strengths", [{"competency": "SQL", "level": 4}]))
+
+    results = asyncio.run(competency_flow.build_competency_summary_dag().run(
+        {"input_text": "profile", "summary_text": "", "cv_text": "cv"}
+    ))
+
+    assert results["user_levels"] == {"Python": 3, "SQL": 3}
+    assert results["strengths"] == [{"competency": "SQL", "level": 4}]
+    assert order.index("strengths") < order.index("role")
@@ -0,0 +1,88 @@
+# tests/test_async_runtime.py
+
+import asyncio
+import threading
+import concurrent.futures
+
+import pytest
+
+from backend import async_runtime
+from backend.async_runtime import get_loop, submit, run_sync, iterate_sync
+
+
+async def current_loop():
+    await asyncio.sleep(0)
+    return asyncio.get_running_loop()
+
+
+def test_run_sync_reuses_one_background_loop():
+    first = run_sync(current_loop())
+    second = run_sync(current_loop())
+
+    assert first is second is get_loop()
+    assert first.is_running() and not first.is_closed()
+    assert threading.current_thread() is not async_runtime._thread
+
+
+def test_submit_returns_concurrent_future():
+    async def add(a, b):
+        await asyncio.sleep(0.01)
+        return a + b
+
+    future = submit(add(2, 3))
+    assert isinstance(future, concurrent.futures.Future)
+    assert future.result(timeout=5) == 5
+
+
+def test_run_sync_propagates_errors():
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        run_sync(fail())
+
+
+def test_run_sync_inside_loop_is_rejected():
+    async def nested():
+        return run_sync(current_loop())
+
+    with pytest.raises(RuntimeError, match="runtime loop"):
+        run_sync(nested())
+
+
+def test_run_sync_polls_until_done():
+    polls = []
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        return "done"
+
+    assert run_sync(slow(), on_poll=lambda: polls.append(1)) == "done"
+    assert len(polls) >= 2
+
+
+def test_run_sync_timeout_cancels():
+    async def forever():
+        await asyncio.sleep(60)
+
+    with pytest.raises(TimeoutError):
+        run_sync(forever(), timeout=0.1, on_poll=lambda: None)
+
+
+def test_iterate_sync_streams_items_in_caller_thread():
+    closed = []
+
+    async def numbers():
+        try:
+            for i in range(5):
+                await asyncio.sleep(0)
+                yield i
+        finally:
+            closed.append(True)
+
+    assert list(iterate_sync(numbers())) == [0, 1, 2, 3, 4]
+
+    items = iterate_sync(numbers())
+    assert next(items) == 0
+    items.close()
+    assert closed == [True, True]
@@ -0,0 +1,56 @@
+# tests/test_competency_catalog.py
+
+import os
+
+from backend.competency_catalog import CompetencyCatalog, get_competency_catalog
+
+CSV = """Competency|Definition|L1|L2|L3|L4|L5
+Deep Learning|Neural networks|basic|guided|independent|lead|expert
+Data Analytics|Analyse data|a1|a2|a3|a4|a5
+Deep learning|Duplicate row|x|x|x|x|x
+Orphan||o1|o2|o3|o4|o5
+"""
+
+
+def _write(path, text, mtime=None):
+    path.write_text(text, encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_names_and_case_insensitive_lookup(tmp_path):
+    csv_path = tmp_path / "komp.csv"
+    _write(csv_path, CSV)
+    catalog = CompetencyCatalog(str(csv_path))
+
+    assert catalog.names() == ["Deep Learning", "Data Analytics"]
+    entry = catalog.get("  deep LEARNING ")
+    assert entry["definition"] == "Neural networks"
+    assert entry["metadata"]["L5"] == "expert"
+    assert catalog.get("Orphan") is None  # rows without a definition are dropped
+    assert catalog.get("Unknown") is None
+
+
+def test_csv_parsed_once_until_mtime_changes(tmp_path, monkeypatch):
+    csv_path = tmp_path / "komp.csv"
+    _write(csv_path, CSV, mtime=1_000_000_000)
+    catalog = CompetencyCatalog(str(csv_path))
+
+    import backend.competency_catalog as module
+    reads = []
+    real_read_csv = module.pd.read_csv
+    monkeypatch.setattr(module.pd, "read_csv", lambda *a, **k: reads.append(a) or real_read_csv(*a, **k))
+
+    for _ in range(5):
+        catalog.get("Data Analytics")
+        catalog.names()
+    assert len(reads) == 1
+
+    _write(csv_path, CSV + "Cloud|Run things in the cloud|c1|c2|c3|c4|c5\n", mtime=2_000_000_000)
+    assert catalog.get("cloud")["definition"] == "Run things in the cloud"
+    assert len(reads) == 2
+
+
+def test_catalog_is_shared_per_path(tmp_path):
+    csv_path = str(tmp_path / "komp.csv")
+    assert get_competency_catalog(csv_path) is get_competency_catalog(csv_path)
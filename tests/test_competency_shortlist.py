@@ -0,0 +1,84 @@
+# tests/test_competency_shortlist.py
+
+import asyncio
+import numpy as np
+
+from backend import rag_engine, embedding_cache
+from backend.agents import agent_role_competency_mapper, agent_cv_strengths
+from backend.vector_store import NumpyVectorStore
+
+VOCAB = ["python", "data", "nurse", "patient", "sales", "lead"]
+
+
+class _BagOfWordsModel:
+    def encode(self, texts, **kwargs):
+        vectors = np.array([[t.lower().count(w) for w in VOCAB] for t in texts], dtype=np.float32) + 1e-3
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _store(monkeypatch, tmp_path):
+    model = _BagOfWordsModel()
+    monkeypatch.setattr(embedding_cache, "_cache", embedding_cache.EmbeddingCache(model=model))
+    store = NumpyVectorStore(str(tmp_path / "competencies"))
+    rows = [
+        ("Python Programming", "write python code"),
+        ("Data Analysis", "analyse data with python"),
+        ("Patient Care", "nurse patient care"),
+        ("Sales Negotiation", "close sales deals"),
+        ("Team Leadership", "lead a team"),
+    ]
+    store.upsert(
+        ids=[name for name, _ in rows],
+        embeddings=model.encode([d for _, d in rows]),
+        documents=[d for _, d in rows],
+        metadatas=[{"Competency": name} for name, _ in rows],
+    )
+    monkeypatch.setattr(rag_engine, "get_vector_store", lambda name: store)
+
+
+def test_shortlist_merges_best_match_per_query_text(monkeypatch, tmp_path):
+    _store(monkeypatch, tmp_path)
+
+    shortlist = rag_engine.shortlist_competencies(["nurse patient", "python data"], top_k=3)
+
+    assert shortlist[0] == "Patient Care"
+    assert set(shortlist) == {"Patient Care", "Data Analysis", "Python Programming"}
+
+
+def test_shortlist_falls_back_to_full_catalog(monkeypatch):
+    def unavailable(name):
+        raise RuntimeError("no store")
+
+    monkeypatch.setattr(rag_engine, "get_vector_store", unavailable)
+    monkeypatch.setattr(rag_engine, "get_all_competency_names", lambda: ["A", "B"])
+    assert rag_engine.shortlist_competencies(["anything"]) == ["A", "B"]
+
+
+def test_chunk_text_keeps_paragraphs_under_limit():
+    text = "a" * 30 + "\n\n" + "b" * 30 + "\n" + "c" * 75
+    chunks = rag_engine.chunk_text(text, max_chars=64)
+
+    assert chunks == ["a" * 30 + "\n" + "b" * 30, "c" * 64, "c" * 11]
+
+
+def test_agents_drop_picks_outside_shortlist(monkeypatch):
+    shortlist = ["Python Programming", "Data Analysis"]
+
+    async def role_llm(prompt, **kwargs):
+        assert "Patient Care" not in prompt
+        return "python programming, Patient Care, Data Analysis"
+
+    async def cv_llm(prompt, **kwargs):
+        return '[{"competency": "Data Analysis", "level": 4}, {"competency": "Sales Negotiation", "level": 5}]'
+
+    monkeypatch.setattr(agent_role_competency_mapper, "call_apilogy_llm", role_llm)
+    monkeypatch.setattr(agent_cv_strengths, "call_apilogy_llm", cv_llm)
+    before = rag_engine.get_shortlist_stats()
+
+    role = asyncio.run(agent_role_competency_mapper.map_competencies_for_role("Analyst", shortlist))
+    strengths = asyncio.run(agent_cv_strengths.extract_top_strengths("cv", shortlist))
+
+    assert role == ["Python Programming", "Data Analysis"]
+    assert strengths == [{"competency": "Data Analysis", "level": 4}]
+    after = rag_engine.get_shortlist_stats()
+    assert after["picks"] - before["picks"] == 5 and after["outside"] - before["outside"] == 2
@@ -0,0 +1,77 @@
+# tests/test_embed_incremental.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import rag_engine
+from backend.vector_store import NumpyVectorStore
+
+
+class _CountingModel:
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+        return np.array([[1.0] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    vector_store, model = NumpyVectorStore(str(tmp_path / "competencies")), _CountingModel()
+    monkeypatch.setattr(rag_engine, "get_vector_store", lambda name: vector_store)
+    monkeypatch.setattr(rag_engine, "get_embedding_model", lambda: model)
+    return vector_store, model
+
+
+def _documents(vector_store):
+    _, ids, documents, _ = vector_store._snapshot
+    return dict(zip(ids, documents))
+
+
+def _df(rows):
+    return pd.DataFrame(rows, columns=["Competency", "Definition", "L1"])
+
+
+BASE = [("Python", "Write Python", "basics"), ("SQL", "Query data", "select"), ("Leadership", "Lead teams", "self")]
+
+
+def test_rebuild_encodes_only_changed_rows(store):
+    vector_store, model = store
+
+    report = rag_engine.embed_competencies(_df(BASE))
+    assert (report["added"], report["updated"], report["deleted"], report["unchanged"]) == (3, 0, 0, 0)
+    assert model.encoded == 3
+
+    report = rag_engine.embed_competencies(_df(BASE))
+    assert (report["added"], report["updated"], report["unchanged"]) == (0, 0, 3)
+    assert model.encoded == 3
+
+    edited = [BASE[0], ("SQL", "Query and model data", "select"), BASE[2]]
+    report = rag_engine.embed_competencies(_df(edited))
+    assert (report["updated"], report["unchanged"]) == (1, 2)
+    assert model.encoded == 4
+    assert _documents(vector_store)[rag_engine.competency_id("SQL")] == "Query and model data"
+
+
+def test_ids_survive_row_insertion_and_removed_rows_are_deleted(store):
+    vector_store, model = store
+    rag_engine.embed_competencies(_df(BASE))
+    ids_before = set(vector_store.get_metadatas())
+
+    report = rag_engine.embed_competencies(_df([("Cloud", "Run in cloud", "vm")] + BASE[1:]))
+
+    assert (report["added"], report["deleted"], report["unchanged"]) == (1, 1, 2)
+    assert model.encoded == 4
+    assert set(vector_store.get_metadatas()) == ids_before - {rag_engine.competency_id("Python")} | {rag_engine.competency_id("Cloud")}
+
+
+def test_legacy_positional_ids_are_replaced(store):
+    vector_store, _ = store
+    vector_store.upsert(ids=["comp_0"], embeddings=[[1.0]], documents=["old"], metadatas=[{"Competency": "Python"}])
+
+    report = rag_engine.embed_competencies(_df(BASE))
+
+    assert report["deleted"] == 1 and report["added"] == 3
+    assert "comp_0" not in vector_store.get_metadatas()
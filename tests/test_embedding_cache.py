@@ -0,0 +1,57 @@
+# tests/test_embedding_cache.py
+
+import numpy as np
+
+from backend import embedding_cache
+from backend.embedding_cache import EmbeddingCache
+
+
+class _CountingModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, normalize_embeddings=False, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        vectors = np.array([[len(t), t.count("a") + 1] for t in texts], dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_repeated_texts_skip_the_model():
+    model = _CountingModel()
+    cache = EmbeddingCache(max_entries=10, model=model)
+
+    first = cache.embed(["data analyst", "nurse"])
+    second = cache.embed(["nurse", "data analyst", "nurse"])
+
+    assert model.encoded == ["data analyst", "nurse"]
+    np.testing.assert_array_equal(second[1], first[0])
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 2
+
+
+def test_cache_evicts_least_recently_used():
+    model = _CountingModel()
+    cache = EmbeddingCache(max_entries=2, model=model)
+
+    cache.embed(["a"])
+    cache.embed(["bb"])
+    cache.embed(["a"])    # "a" becomes most recent
+    cache.embed(["ccc"])  # evicts "bb"
+    cache.embed(["a", "bb"])
+
+    assert model.encoded == ["a", "bb", "ccc", "bb"]
+    assert cache.stats()["entries"] == 2
+
+
+def test_profile_embedding_is_computed_once_per_session(monkeypatch):
+    model = _CountingModel()
+    monkeypatch.setattr(embedding_cache, "_cache", EmbeddingCache(model=model))
+    monkeypatch.setattr(embedding_cache, "_profile_stats", {"hits": 0, "misses": 0})
+    session = {}
+
+    vector = embedding_cache.get_profile_embedding(session, "python data engineer")
+    again = embedding_cache.get_profile_embedding(session, "python data engineer")
+    changed = embedding_cache.get_profile_embedding(session, "nurse")
+
+    assert again is vector
+    assert not np.array_equal(changed, vector)
+    assert embedding_cache.get_embedding_cache_stats()["profile"] == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
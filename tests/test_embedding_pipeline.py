@@ -0,0 +1,69 @@
+# tests/test_embedding_pipeline.py
+
+import numpy as np
+
+from backend import embedding_pipeline
+from backend.embedding_pipeline import encode_texts
+
+
+class _LengthModel:
+    """Encodes a text as [len, 1] so results can be traced back to inputs."""
+
+    def __init__(self):
+        self.batches = []
+        self.pool_devices = None
+
+    def _vectors(self, texts, normalize):
+        vectors = np.array([[len(t), 1.0] for t in texts], dtype=np.float64)
+        if normalize:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, convert_to_numpy=True):
+        self.batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        return self._vectors(texts, normalize_embeddings)
+
+    def start_multi_process_pool(self, target_devices):
+        self.pool_devices = target_devices
+        return "pool"
+
+    def encode_multi_process(self, texts, pool, batch_size=32, chunk_size=None, normalize_embeddings=False):
+        self.chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        return self._vectors(texts, normalize_embeddings)
+
+    def stop_multi_process_pool(self, pool):
+        self.stopped = pool
+
+
+def _texts(n):
+    return ["x" * ((i * 7) % 50 + 1) for i in range(n)]
+
+
+def test_single_process_output_is_normalised_float32_in_input_order():
+    model = _LengthModel()
+    texts = _texts(100)
+
+    vectors, stats = encode_texts(texts, batch_size=16, processes=1, model=model, verbose=False)
+
+    assert vectors.dtype == np.float32 and vectors.shape == (100, 2)
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-6)
+    expected = model._vectors(texts, normalize=True)
+    np.testing.assert_allclose(vectors, expected, rtol=1e-6)
+    assert stats["texts"] == 100 and stats["processes"] == 1 and stats["texts_per_sec"] > 0
+
+    # Batches are length-sorted, so each batch spans a narrow range of lengths
+    lengths = [len(t) for batch in model.batches for t in batch]
+    assert lengths == sorted(lengths, reverse=True)
+
+
+def test_large_inputs_use_process_pool(monkeypatch):
+    monkeypatch.setattr(embedding_pipeline, "EMBED_MULTIPROCESS_MIN_TEXTS", 50)
+    model = _LengthModel()
+    texts = _texts(200)
+
+    vectors, stats = encode_texts(texts, batch_size=8, processes=4, model=model, verbose=False)
+
+    assert model.pool_devices == ["cpu"] * 4 and model.stopped == "pool"
+    assert stats["processes"] == 4
+    assert len(model.chunks) >= 4
+    np.testing.assert_allclose(vectors, model._vectors(texts, normalize=True), rtol=1e-6)
@@ -0,0 +1,148 @@
+# tests/test_enrich_chunked.py
+
+import re
+import json
+import time
+import asyncio
+
+import pytest
+
+from backend.agents import agent_enrich_job
+from backend.enrichment_cache import EnrichmentCache
+
+
+def _no_local_scoring(*args):
+    raise RuntimeError("no competency store")
+
+
+@pytest.fixture(autouse=True)
+def llm_scoring_only(monkeypatch):
+    monkeypatch.setattr(agent_enrich_job, "get_job_facts_cache", lambda: None)
+    monkeypatch.setattr(agent_enrich_job, "score_jobs", _no_local_scoring)
+
+
+def _raw_jobs(n):
+    return [{"title": f"Job {i}", "company_name": f"Co {i}", "description": f"desc {i}"} for i in range(n)]
+
+
+def _fake_llm(delay=0.05, fail_titles=(), calls=None):
+    calls = calls if calls is not None else []
+
+    async def fake(prompt, refresh=False, **kwargs):
+        if "job data assistant" in prompt:
+            return _facts_reply(prompt)
+        titles = re.findall(r'"role": "(Job \d+)"', prompt)
+        calls.append((titles, refresh))
+        await asyncio.sleep(delay)
+        if any(t in fail_titles for t in titles) and not refresh:
+            return "not json"
+        return json.dumps([{"match_score": 80, "fit_reason": "fits"} for t in titles])
+
+    return fake
+
+
+def _facts_reply(prompt):
+    titles = re.findall(r'"title": "(Job \d+)"', prompt)
+    return json.dumps([{"role": t, "company": "Co", "industry": "IT"} for t in titles])
+
+
+def test_chunks_run_concurrently_and_merge_in_order(monkeypatch):
+    calls = []
+    monkeypatch.setattr(agent_enrich_job, "call_apilogy_llm", _fake_llm(calls=calls))
+
+    start = time.perf_counter()
+    enriched = asyncio.run(agent_enrich_job.enrich_and_score_jobs_chunked(
+        _raw_jobs(50), "summary", chunk_size=5, max_concurrency=10
+    ))
+    elapsed = time.perf_counter() - start
+
+    assert [j["role"] for j in enriched] == [f"Job {i}" for i in range(50)]
+    assert len(calls) == 10
+    assert elapsed < 0.3  # ~one call's latency, not ten
+
+
+def test_local_scoring_does_not_block_the_event_loop(monkeypatch):
+    monkeypatch.setattr(agent_enrich_job, "call_apilogy_llm", _fake_llm(delay=0))
+
+    def slow_scores(jobs, *args, **kwargs):
+        time.sleep(0.2)  # stands in for embedding the postings
+        return [{"match_score": 50, "matched_competencies": [], "missing_competencies": [], "score_source": "local"} for _ in jobs]
+
+    monkeypatch.setattr(agent_enrich_job, "score_jobs", slow_scores)
+
+    async def flow():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        enriched = await agent_enrich_job.enrich_and_score_jobs_chunked(
+            _raw_jobs(20), "summary", chunk_size=5, max_concurrency=4
+        )
+        elapsed = time.perf_counter() - start
+        task.cancel()
+        return enriched, elapsed, ticks
+
+    enriched, elapsed, ticks = asyncio.run(flow())
+
+    assert [j["match_score"] for j in enriched] == [50] * 20
+    assert elapsed < 0.6  # the four chunks' scoring overlaps instead of taking 0.8s
+    assert ticks > 10  # other coroutines kept running meanwhile
+
+
+def test_only_failing_chunk_is_retried(monkeypatch):
+    calls = []
+    monkeypatch.setattr(agent_enrich_job, "call_apilogy_llm", _fake_llm(delay=0, fail_titles={"Job 7"}, calls=calls))
+
+    enriched = asyncio.run(agent_enrich_job.enrich_and_score_jobs_chunked(_raw_jobs(15), "summary", chunk_size=5))
+
+    assert [j["role"] for j in enriched] == [f"Job {i}" for i in range(15)]
+    retried = [titles for titles, refresh in calls if refresh]
+    assert retried == [[f"Job {i}" for i in range(5, 10)]]
+
+
+def test_failed_chunk_keeps_raw_jobs_in_place(monkeypatch):
+    async def broken_for_middle(prompt, refresh=False, **kwargs):
+        if "job data assistant" in prompt:
+            return _facts_reply(prompt)
+        titles = re.findall(r'"role": "(Job \d+)"', prompt)
+        if "Job 5" in titles:
+            return "still not json"
+        return json.dumps([{"match_score": 80, "fit_reason": "fits"} for t in titles])
+
+    monkeypatch.setattr(agent_enrich_job, "call_apilogy_llm", broken_for_middle)
+    enriched = asyncio.run(agent_enrich_job.enrich_and_score_jobs_chunked(_raw_jobs(15), "summary", chunk_size=5))
+
+    assert [j["role"] for j in enriched] == [f"Job {i}" for i in range(15)]
+    assert enriched[6]["match_score"] == 20 and enriched[6]["fit_reason"].startswith("Auto-filled")
+    assert agent_enrich_job.is_raw_fallback(enriched[6])
+    assert enriched[0]["match_score"] == 80 and not agent_enrich_job.is_raw_fallback(enriched[0])
+    # Only real enrichments may be memoised for the profile
+    assert agent_enrich_job.is_enriched(enriched[0])
+    assert not agent_enrich_job.is_enriched(enriched[6])
+    assert not agent_enrich_job.is_enriched(_raw_jobs(1)[0])
+
+
+def test_job_facts_are_extracted_once_across_users(monkeypatch, memory_collection):
+    facts_cache = EnrichmentCache(memory_collection)
+    monkeypatch.setattr(agent_enrich_job, "get_job_facts_cache", lambda: facts_cache)
+    prompts = []
+
+    async def fake(prompt, refresh=False, **kwargs):
+        prompts.append("facts" if "job data assistant" in prompt else "score")
+        if prompts[-1] == "facts":
+            return _facts_reply(prompt)
+        assert "Job 0" in prompt and "desc 0" not in prompt  # scoring sees compact facts only
+        return json.dumps([{"match_score": 70, "fit_reason": "fits"}] * 3)
+
+    monkeypatch.setattr(agent_enrich_job, "call_apilogy_llm", fake)
+    for summary in ("alice", "bob", "carol"):
+        enriched = asyncio.run(agent_enrich_job.enrich_and_score_jobs_chunked(_raw_jobs(3), summary))
+        assert [(j["role"], j["industry"], j["match_score"]) for j in enriched] == [(f"Job {i}", "IT", 70) for i in range(3)]
+
+    assert prompts == ["facts", "score", "score", "score"]
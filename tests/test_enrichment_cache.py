@@ -0,0 +1,88 @@
+# tests/test_enrichment_cache.py
+
+import time
+import threading
+
+from backend.enrichment_cache import EnrichmentCache, profile_hash
+
+
+JOBS = [
+    {"title": "Data Engineer", "company_name": "Acme", "description": "pipelines"},
+    {"title": "Nurse", "company_name": "Hospital", "description": "ward"},
+]
+
+
+def test_hits_are_per_job_and_per_profile(memory_collection):
+    cache = EnrichmentCache(memory_collection)
+    alice, bob = profile_hash("alice summary"), profile_hash("bob summary")
+
+    cache.put(JOBS[:1], alice, [{"role": "Data Engineer", "match_score": 90}])
+    found, stale, missing = cache.lookup(JOBS, alice)
+    assert found[0]["match_score"] == 90 and found[0]["job_fingerprint"]
+    assert (stale, missing) == ([], [1])
+
+    # Same posting, different user: no leaked score
+    assert cache.lookup(JOBS, bob) == ({}, [], [0, 1])
+
+    # Re-adding replaces the entry instead of colliding
+    cache.put(JOBS[:1], alice, [{"role": "Data Engineer", "match_score": 40}])
+    assert cache.collection.count() == 1
+    assert cache.lookup(JOBS[:1], alice)[0][0]["match_score"] == 40
+
+
+def test_entries_go_stale_then_expire(memory_collection):
+    cache = EnrichmentCache(memory_collection, ttl_seconds=100, stale_seconds=50)
+    key = profile_hash("summary")
+    cache.put(JOBS[:1], key, [{"match_score": 70}], now=1000)
+
+    assert cache.lookup(JOBS[:1], key, now=1050)[1:] == ([], [])
+    found, stale, missing = cache.lookup(JOBS[:1], key, now=1120)
+    assert found[0]["match_score"] == 70 and stale == [0]
+    assert cache.lookup(JOBS[:1], key, now=1200) == ({}, [], [0])
+
+
+def test_revalidate_refreshes_in_background_once(memory_collection):
+    cache = EnrichmentCache(memory_collection)
+    key = profile_hash("summary")
+    release, calls = threading.Event(), []
+
+    def refresh(jobs):
+        calls.append(len(jobs))
+        release.wait(5)
+        return [{"match_score": 55} for _ in jobs]
+
+    assert cache.revalidate(JOBS, key, refresh)
+    assert not cache.revalidate(JOBS, key, refresh)  # already in flight
+    release.set()
+
+    deadline = time.time() + 5
+    while cache.collection.count() < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert calls == [2]
+    assert [j["match_score"] for j in cache.lookup(JOBS, key)[0].values()] == [55, 55]
+
+
+def test_failed_refresh_keeps_stale_entry(memory_collection):
+    cache = EnrichmentCache(memory_collection, ttl_seconds=100, stale_seconds=1000)
+    key = profile_hash("summary")
+    cache.put(JOBS, key, [{"match_score": 70}, {"match_score": 80}], now=time.time() - 200)
+
+    assert cache.revalidate(JOBS, key, lambda jobs: [{}, {"match_score": 55}])
+
+    deadline = time.time() + 5
+    while cache._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+    found, stale, _ = cache.lookup(JOBS, key)
+    assert [found[0]["match_score"], found[1]["match_score"]] == [70, 55]
+    assert stale == [0]
+
+
+def test_evict_drops_expired_then_oldest(memory_collection):
+    cache = EnrichmentCache(memory_collection, ttl_seconds=10, stale_seconds=10, max_entries=100)
+    for n in range(5):
+        cache.put([{"title": f"job {n}"}], "p", [{"n": n}], now=1000 + n * 10)
+
+    cache.max_entries = 1
+    assert cache.evict(now=1045) == 4  # three past the stale window, one over the limit
+    remaining = sorted(meta["created_at"] for _, meta in cache.collection.records.values())
+    assert remaining == [1040]
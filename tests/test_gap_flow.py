@@ -0,0 +1,85 @@
+# tests/test_gap_flow.py
+
+import time
+import asyncio
+
+from backend import gap_flow
+
+JOB = {"title": "Data Engineer", "company_name": "Acme", "description": "Build pipelines"}
+COMPETENCIES = [{"competency": "Python", "level": 3}]
+
+
+def patch_agents(monkeypatch, delay=0.1, gaps=({"type": "skill", "competency": "SQL"},)):
+    calls = []
+
+    async def fake_stream_gaps(job, summary, competencies):
+        calls.append(("gaps", time.perf_counter()))
+        for gap in gaps:
+            await asyncio.sleep(delay)
+            yield gap
+
+    async def fake_requirements(description, summary):
+        calls.append(("requirements", time.perf_counter()))
+        await asyncio.sleep(delay)
+        return {"requirements": [{"requirement": "SQL"}]}
+
+    async def fake_plan(job, summary, gap_list, requirements):
+        calls.append(("plan", gap_list, requirements))
+        return {"plan": [{"week": 1}]}
+
+    monkeypatch.setattr(gap_flow, "stream_gaps", fake_stream_gaps)
+    monkeypatch.setattr(gap_flow, "extract_job_requirements", fake_requirements)
+    monkeypatch.setattr(gap_flow, "generate_learning_plan", fake_plan)
+    return calls
+
+
+def test_gaps_and_requirements_run_concurrently(monkeypatch):
+    calls = patch_agents(monkeypatch, delay=0.1)
+    streamed = []
+
+    start = time.perf_counter()
+    result = asyncio.run(gap_flow.run_gap_analysis(JOB, "summary", COMPETENCIES, on_gap=streamed.append))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.18  # sequential would take 0.2s
+    assert [c[0] for c in calls] == ["gaps", "requirements", "plan"]
+    assert calls[2][1] == [{"type": "skill", "competency": "SQL"}]
+    assert calls[2][2] == [{"requirement": "SQL"}]
+    assert streamed == [[{"type": "skill", "competency": "SQL"}]]
+    assert result["plan"] == {"plan": [{"week": 1}]}
+    assert result["gaps"]["job_title"] == "Data Engineer"
+
+
+def test_results_are_memoised_per_job_summary_and_competencies(monkeypatch):
+    calls = patch_agents(monkeypatch, delay=0)
+    state = {}
+
+    first = asyncio.run(gap_flow.run_gap_analysis(JOB, "summary", COMPETENCIES, state=state))
+    again = asyncio.run(gap_flow.run_gap_analysis(dict(JOB), "summary", list(COMPETENCIES), state=state))
+    assert again is first
+    assert len(calls) == 3
+
+    asyncio.run(gap_flow.run_gap_analysis(JOB, "summary", [{"competency": "Python", "level": 4}], state=state))
+    asyncio.run(gap_flow.run_gap_analysis(JOB, "other summary", COMPETENCIES, state=state))
+    assert len(calls) == 9
+    assert len(state) == 3
+
+
+def test_empty_results_are_not_memoised(monkeypatch):
+    calls = patch_agents(monkeypatch, delay=0, gaps=())
+
+    async def empty(*args):
+        return {"requirements": []}
+
+    async def no_plan(*args):
+        return {"plan": []}
+
+    monkeypatch.setattr(gap_flow, "extract_job_requirements", empty)
+    monkeypatch.setattr(gap_flow, "generate_learning_plan", no_plan)
+    state = {}
+
+    asyncio.run(gap_flow.run_gap_analysis(JOB, "summary", COMPETENCIES, state=state))
+    asyncio.run(gap_flow.run_gap_analysis(JOB, "summary", COMPETENCIES, state=state))
+
+    assert state == {}
+    assert [c[0] for c in calls] == ["gaps", "gaps"]
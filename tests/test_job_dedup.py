@@ -0,0 +1,59 @@
+# tests/test_job_dedup.py
+
+import time
+import random
+
+from backend.job_dedup import dedupe_jobs, simhash, job_features
+
+DESCRIPTION = (
+    "We are looking for a data engineer to build and maintain batch and streaming pipelines, "
+    "model warehouse tables, and work with analysts to deliver reliable dashboards for the business."
+)
+
+
+def _job(title, company, description, link):
+    return {"title": title, "company_name": company, "description": description, "sharing_link": link, "via": link.split("/")[2]}
+
+
+def test_near_duplicates_collapse_and_keep_apply_links():
+    jobs = [
+        _job("Data Engineer", "Acme", DESCRIPTION, "https://linkedin.com/1"),
+        _job("Nurse", "City Hospital", "Care for patients on the ward and support doctors during rounds.", "https://jobstreet.com/2"),
+        dict(_job("Data Engineer", "Acme", DESCRIPTION + " Apply now!", "https://glints.com/3"),
+             apply_link="https://acme.com/careers/3",
+             apply_options=[{"title": "Glints", "link": "https://glints.com/3"}]),
+        _job("Data Engineer", "Other Corp", DESCRIPTION, "https://indeed.com/4"),
+    ]
+
+    deduped = dedupe_jobs(jobs)
+
+    assert [j["company_name"] for j in deduped] == ["Acme", "City Hospital", "Other Corp"]
+    assert [o["link"] for o in deduped[0]["apply_options"]] == [
+        "https://linkedin.com/1", "https://glints.com/3", "https://acme.com/careers/3"
+    ]
+    assert deduped[0]["duplicate_count"] == 1
+
+
+def test_simhash_is_close_for_small_edits():
+    a = simhash(job_features({"title": "Data Engineer", "company_name": "Acme", "description": DESCRIPTION}))
+    b = simhash(job_features({"title": "Data Engineer", "company_name": "Acme", "description": DESCRIPTION + " Apply now!"}))
+    c = simhash(job_features({"title": "Chef", "company_name": "Bistro", "description": "Cook food in a busy kitchen."}))
+
+    assert bin(a ^ b).count("1") <= 3
+    assert bin(a ^ c).count("1") > 10
+
+
+def test_large_result_set_runs_quickly():
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(2000)]
+    jobs = [
+        _job(f"Role {i}", f"Company {i % 50}", " ".join(rng.choice(vocab) for _ in range(60)), f"https://board.com/{i}")
+        for i in range(2000)
+    ]
+    jobs += [dict(job, sharing_link=job["sharing_link"] + "?dup") for job in jobs[:500]]
+
+    start = time.perf_counter()
+    deduped = dedupe_jobs(jobs)
+
+    assert len(deduped) == 2000
+    assert time.perf_counter() - start < 10
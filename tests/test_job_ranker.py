@@ -0,0 +1,67 @@
+# tests/test_job_ranker.py
+
+import numpy as np
+
+from backend import job_ranker, embedding_cache
+
+VOCAB = ["python", "data", "nurse", "chef", "sales"]
+
+
+class _BagOfWordsModel:
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, normalize_embeddings=False, convert_to_numpy=True):
+        self.calls += 1
+        vectors = np.array([[t.lower().count(w) for w in VOCAB] for t in texts], dtype=np.float32) + 1e-3
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _jobs():
+    return [
+        {"title": "Head Chef", "description": "chef kitchen"},
+        {"title": "Sales Rep", "description": "sales targets"},
+        {"title": "Data Analyst", "description": "python data dashboards"},
+        {"title": "Nurse", "description": "nurse ward"},
+        {"title": "Data Engineer", "description": "python python data pipelines"},
+    ]
+
+
+def test_prerank_picks_most_relevant_jobs(monkeypatch):
+    model = _BagOfWordsModel()
+    monkeypatch.setattr(embedding_cache, "_cache", embedding_cache.EmbeddingCache(model=model))
+
+    ranked = job_ranker.prerank_jobs(_jobs(), "python data engineer", top_n=2)
+
+    assert [j["title"] for j in ranked] == ["Data Engineer", "Data Analyst"]
+    assert model.calls == 1  # summary and all jobs embedded in one batch
+
+    # A rerun is served from the embedding cache
+    assert job_ranker.prerank_jobs(_jobs(), "python data engineer", top_n=2) == ranked
+    assert model.calls == 1
+
+
+def test_prerank_uses_session_profile_vector(monkeypatch):
+    model = _BagOfWordsModel()
+    monkeypatch.setattr(embedding_cache, "_cache", embedding_cache.EmbeddingCache(model=model))
+    profile = model.encode(["nurse"])[0]
+
+    ranked = job_ranker.prerank_jobs(_jobs(), "ignored when a vector is given", top_n=1, profile_vector=profile)
+
+    assert [j["title"] for j in ranked] == ["Nurse"]
+
+
+def test_prerank_skips_model_when_everything_fits(monkeypatch):
+    def fail(texts):
+        raise AssertionError("model should not be loaded")
+
+    monkeypatch.setattr(job_ranker, "embed_texts", fail)
+    assert job_ranker.prerank_jobs(_jobs(), "python", top_n=5) == _jobs()
+
+
+def test_prerank_falls_back_to_first_jobs_without_model(monkeypatch):
+    def unavailable(texts):
+        raise ImportError("no sentence_transformers")
+
+    monkeypatch.setattr(job_ranker, "embed_texts", unavailable)
+    assert job_ranker.prerank_jobs(_jobs(), "python", top_n=2) == _jobs()[:2]
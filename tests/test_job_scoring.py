@@ -0,0 +1,133 @@
+# tests/test_job_scoring.py
+
+import asyncio
+import numpy as np
+import pytest
+
+from backend import job_scoring, embedding_cache
+from backend.agents import agent_enrich_job
+from backend.job_ranker import prerank_jobs
+from backend.vector_store import NumpyVectorStore
+
+VOCAB = ["python", "data", "nurse", "patient", "sales", "lead"]
+CATALOG = {
+    "Python Programming": "python python",
+    "Data Analysis": "data data python",
+    "Patient Care": "nurse patient",
+    "Sales": "sales",
+    "Leadership": "lead",
+}
+
+
+class _BagOfWordsModel:
+    def encode(self, texts, **kwargs):
+        vectors = np.array([[t.lower().count(w) for w in VOCAB] for t in texts], dtype=np.float32) + 1e-3
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch, tmp_path):
+    model = _BagOfWordsModel()
+    monkeypatch.setattr(embedding_cache, "_cache", embedding_cache.EmbeddingCache(model=model))
+    store = NumpyVectorStore(str(tmp_path / "competencies"))
+    store.upsert(
+        ids=list(CATALOG),
+        embeddings=model.encode(list(CATALOG.values())),
+        documents=list(CATALOG.values()),
+        metadatas=[{"Competency": name} for name in CATALOG],
+    )
+    monkeypatch.setattr(job_scoring, "get_vector_store", lambda name: store)
+    monkeypatch.setattr(job_scoring, "_matrix_cache", {})
+    return store
+
+
+JOBS = [
+    {"title": "Nurse", "description": "patient care on the ward"},
+    {"title": "Data Engineer", "description": "python data pipelines"},
+    {"title": "Sales Lead", "description": "sales targets"},
+]
+
+
+def test_scores_follow_competency_levels():
+    strong = [{"competency": "Python Programming", "level": 5}, {"competency": "data analysis", "level": 4}]
+    weak = [{"competency": "Python Programming", "level": 1}]
+
+    scores = job_scoring.score_jobs(JOBS, "python data", strong)
+    assert max(range(3), key=lambda i: scores[i]["match_score"]) == 1
+    assert "Python Programming" in scores[1]["matched_competencies"]
+    assert "Patient Care" in scores[0]["missing_competencies"]
+
+    assert job_scoring.score_jobs(JOBS, "python data", weak)[1]["match_score"] < scores[1]["match_score"]
+    assert job_scoring.score_jobs(JOBS, "python data", strong) == scores  # reproducible
+
+
+def test_enrichment_keeps_working_when_llm_is_down(monkeypatch):
+    monkeypatch.setattr(agent_enrich_job, "get_job_facts_cache", lambda: None)
+
+    async def llm_down(prompt, **kwargs):
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(agent_enrich_job, "call_apilogy_llm", llm_down)
+    competencies = [{"competency": "Patient Care", "level": 5}]
+
+    enriched = asyncio.run(agent_enrich_job.enrich_and_score_jobs_chunked(JOBS, "nurse", competencies=competencies))
+
+    assert [j["role"] for j in enriched] == ["Nurse", "Data Engineer", "Sales Lead"]
+    assert enriched[0]["match_score"] > enriched[1]["match_score"]
+    assert enriched[0]["fit_reason"] == "Matches your Patient Care."
+    assert all(j["score_source"] == "local" for j in enriched)
+
+
+def test_llm_only_writes_fit_reasons(monkeypatch):
+    monkeypatch.setattr(agent_enrich_job, "get_job_facts_cache", lambda: None)
+    prompts = []
+
+    async def fake(prompt, **kwargs):
+        prompts.append(prompt)
+        if "job data assistant" in prompt:
+            return "[]"
+        return '[{"fit_reason": "Great fit", "match_score": 99}]'
+
+    monkeypatch.setattr(agent_enrich_job, "call_apilogy_llm", fake)
+    enriched = asyncio.run(agent_enrich_job.enrich_and_score_jobs(JOBS[:1], "nurse", competencies=[]))
+
+    assert enriched[0]["fit_reason"] == "Great fit"
+    assert enriched[0]["match_score"] == job_scoring.score_jobs(JOBS[:1], "nurse")[0]["match_score"]
+    assert '"match_score"' in prompts[-1]  # the local score is given to the LLM, not asked for
+
+
+def test_profile_is_embedded_once_per_session(monkeypatch):
+    monkeypatch.setattr(agent_enrich_job, "get_job_facts_cache", lambda: None)
+
+    async def llm_down(prompt, **kwargs):
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(agent_enrich_job, "call_apilogy_llm", llm_down)
+    embedded = []
+    cache = embedding_cache._cache
+    original = cache.embed
+    monkeypatch.setattr(cache, "embed", lambda texts: embedded.extend(texts) or original(texts))
+    session, summary = {}, "nurse on a patient ward"
+
+    for _ in range(2):  # the page reruns on every interaction
+        vector = embedding_cache.get_profile_embedding(session, summary)
+        candidates = prerank_jobs(JOBS, summary, top_n=2, profile_vector=vector)
+        enriched = asyncio.run(agent_enrich_job.enrich_and_score_jobs_chunked(
+            candidates, summary, competencies=[], profile_vector=vector
+        ))
+
+    assert enriched[0]["role"] == "Nurse"
+    assert embedded.count(summary) == 1
+
+
+def test_matrix_follows_edited_definitions(catalog):
+    names, before = job_scoring.get_competency_matrix()
+    row = names.index("Sales")
+
+    # An incremental rebuild re-embeds an edited definition under the same id
+    catalog.upsert(ids=["Sales"], embeddings=_BagOfWordsModel().encode(["sales lead"]),
+                   documents=["sales lead"], metadatas=[{"Competency": "Sales"}])
+    names, after = job_scoring.get_competency_matrix()
+
+    assert len(names) == len(CATALOG)
+    assert not np.allclose(after[row], before[row])
@@ -0,0 +1,98 @@
+# tests/test_job_search_client.py
+
+import json
+import asyncio
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend import job_search_client
+from backend.job_search_client import build_query_variants, search_jobs_async
+
+
+class _StubSearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    requests = []
+    connections = set()
+    failures = {}
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        cls = _StubSearchHandler
+        cls.requests.append(params)
+        cls.connections.add(self.client_address)
+
+        query, page = params["q"], int(params.get("next_page_token", "0"))
+        if cls.failures.get(query, 0) > 0:
+            cls.failures[query] -= 1
+            return self._reply(503, {"error": "busy"})
+
+        # Every query shares job "shared-<page>", the rest are unique to the query
+        jobs = [{"job_id": f"shared-{page}", "title": "Shared"}] + [
+            {"title": f"{query} #{page}-{n}", "company_name": "Acme", "location": "Jakarta"} for n in range(3)
+        ]
+        body = {"jobs_results": jobs, "serpapi_pagination": {"next_page_token": str(page + 1)}} if page else {"jobs": jobs, "next_page_token": "1"}
+        self._reply(200, body)
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_search(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSearchHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _StubSearchHandler.requests, _StubSearchHandler.connections, _StubSearchHandler.failures = [], set(), {}
+    monkeypatch.setattr(job_search_client, "SEARCH_MAX_PAGES", 2)
+    yield f"http://127.0.0.1:{server.server_port}/search"
+    job_search_client.close_search_clients()
+    server.shutdown()
+    server.server_close()
+
+
+def test_query_variants_cover_synonyms_location_and_industries():
+    variants = build_query_variants("Senior Data Engineer", {"location": "Jakarta", "industries": ["Finance"]}, max_variants=10)
+
+    assert variants == [
+        "Senior Data Engineer in Jakarta",
+        "Senior Data Engineer Finance in Jakarta",
+        "data engineer in Jakarta",
+        "data developer in Jakarta",
+    ]
+
+
+def test_fan_out_follows_pages_and_dedupes(stub_search):
+    preferences = {"industries": ["IT"], "location": ""}
+    jobs = asyncio.run(search_jobs_async("Data Engineer", preferences, max_results=100, api_key="k", api_url=stub_search))
+
+    queries = {r["q"] for r in _StubSearchHandler.requests}
+    assert queries == {"Data Engineer", "Data Engineer IT", "data developer"}
+    assert len(_StubSearchHandler.requests) == 6  # two pages per query
+    # 3 queries x 2 pages x 3 unique jobs, plus one shared job per page
+    assert len(jobs) == 3 * 2 * 3 + 2
+    assert jobs[0]["job_id"] == "shared-0" and jobs[1]["title"] == "Data Engineer #0-0"
+    assert len(_StubSearchHandler.connections) <= job_search_client.SEARCH_MAX_CONCURRENCY
+
+
+def test_budget_stops_paging_and_retries_busy_queries(stub_search, monkeypatch):
+    monkeypatch.setattr(job_search_client, "SEARCH_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(job_search_client, "SEARCH_BACKOFF_BASE", 0)
+    _StubSearchHandler.failures = {"Data Engineer": 1}
+
+    jobs = asyncio.run(search_jobs_async("Data Engineer", {}, max_results=3, api_key="k", api_url=stub_search))
+
+    assert len(jobs) == 3
+    assert [r["q"] for r in _StubSearchHandler.requests].count("Data Engineer") == 2  # one 503, one retry
+    assert not any(r.get("next_page_token") for r in _StubSearchHandler.requests)
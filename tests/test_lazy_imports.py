@@ -0,0 +1,42 @@
+# tests/test_lazy_imports.py
+
+import sys
+import time
+import types
+import threading
+import subprocess
+
+from backend import rag_engine, resources
+
+
+def test_backend_imports_do_not_load_model_or_chroma():
+    code = (
+        "import sys\n"
+        "import backend.rag_engine, backend.job_ranker\n"
+        "heavy = [m for m in ('sentence_transformers', 'torch', 'chromadb') if m in sys.modules]\n"
+        "assert not heavy, heavy\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_embedding_model_is_created_once_across_threads(monkeypatch):
+    created = []
+
+    class FakeSentenceTransformer:
+        def __init__(self, name):
+            time.sleep(0.05)  # widen the race window
+            created.append(name)
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=FakeSentenceTransformer))
+    monkeypatch.setattr(resources, "_resources", {})
+
+    models = []
+    threads = [threading.Thread(target=lambda: models.append(rag_engine.get_embedding_model())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert created == [rag_engine.EMBEDDING_MODEL_NAME]
+    assert all(m is models[0] for m in models)
@@ -0,0 +1,41 @@
+# tests/test_level_estimator.py
+
+import asyncio
+
+from backend.agents import agent_level_estimator
+
+
+def test_batch_uses_single_structured_call(monkeypatch):
+    prompts = []
+
+    async def fake_llm(prompt, **kwargs):
+        prompts.append(prompt)
+        return 'Here you go: {"python": 4, "SQL": 9, "Leadership": "2"}'
+
+    monkeypatch.setattr(agent_level_estimator, "call_apilogy_llm", fake_llm)
+    levels = asyncio.run(agent_level_estimator.estimate_user_levels(["Python", "SQL", "Leadership"], "summary"))
+
+    assert levels == {"Python": 4, "SQL": 5, "Leadership": 2}
+    assert len(prompts) == 1
+
+
+def test_missing_competencies_fall_back_to_bounded_fan_out(monkeypatch):
+    in_flight, peak = 0, 0
+
+    async def fake_llm(prompt, **kwargs):
+        nonlocal in_flight, peak
+        if "JSON object" in prompt:
+            return '{"A": 1}'
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "5"
+
+    monkeypatch.setattr(agent_level_estimator, "call_apilogy_llm", fake_llm)
+    names = ["A"] + [f"C{i}" for i in range(6)]
+    levels = asyncio.run(agent_level_estimator.estimate_user_levels(names, "summary", max_concurrency=2))
+
+    assert list(levels) == names
+    assert levels["A"] == 1 and all(levels[f"C{i}"] == 5 for i in range(6))
+    assert peak == 2
@@ -0,0 +1,63 @@
+# tests/test_llm_api.py
+
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend import llm_api, resources
+
+
+class _StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+    disable_nagle_algorithm = True
+    connections = set()
+
+    def do_POST(self):
+        _StubLLMHandler.connections.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        reply = json.dumps({
+            "choices": [{"message": {"content": f"echo: {body['messages'][-1]['content']}"}}]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubLLMHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _StubLLMHandler.connections = set()
+    monkeypatch.setattr(llm_api, "API_URL", f"http://127.0.0.1:{server.server_port}/chat/completions")
+    yield _StubLLMHandler
+    llm_api.close_llm_clients()
+    server.shutdown()
+    server.server_close()
+
+
+def test_calls_on_one_loop_share_a_connection(stub_llm):
+    async def run():
+        first = await llm_api.call_apilogy_llm("hello")
+        second = await llm_api.call_apilogy_llm("again")
+        assert llm_api.get_llm_client() is llm_api.get_llm_client()
+        await llm_api.aclose_llm_client()
+        return first, second
+
+    assert asyncio.run(run()) == ("echo: hello", "echo: again")
+    assert len(stub_llm.connections) == 1
+
+
+def test_separate_asyncio_run_calls_get_working_clients(stub_llm):
+    # Streamlit pages call asyncio.run() repeatedly; each loop needs its own pool.
+    for i in range(3):
+        assert asyncio.run(llm_api.call_apilogy_llm(f"run {i}")) == f"echo: run {i}"
+    assert [name for name, _ in resources._http_clients].count("llm") == 1  # closed loops are pruned on the next call
@@ -0,0 +1,100 @@
+# tests/test_llm_cache.py
+
+import asyncio
+
+from backend import llm_api
+from backend.llm_cache import LLMResponseCache
+
+
+def test_get_put_and_counters(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"))
+    key = cache.make_key({"messages": [{"role": "user", "content": "hi"}], "temperature": 0}, "http://llm")
+
+    assert cache.get(key) is None
+    cache.put(key, "hello")
+    assert cache.get(key) == "hello"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_key_depends_on_params_and_endpoint():
+    payload = {"messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+    key = LLMResponseCache.make_key(payload, "http://llm")
+    assert key == LLMResponseCache.make_key(dict(payload), "http://llm")
+    assert key != LLMResponseCache.make_key({**payload, "temperature": 0.7}, "http://llm")
+    assert key != LLMResponseCache.make_key(payload, "http://other-llm")
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"), ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr("backend.llm_cache.time.time", lambda: now[0])
+
+    cache.put("k", "v")
+    now[0] += 5
+    assert cache.get("k") == "v"
+    now[0] += 10
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction(tmp_path, monkeypatch):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"), max_entries=2)
+    now = [1000.0]
+    monkeypatch.setattr("backend.llm_cache.time.time", lambda: now[0])
+
+    for key in ("a", "b"):
+        now[0] += 1
+        cache.put(key, key)
+    now[0] += 1
+    cache.get("a")  # "b" is now least recently used
+    now[0] += 1
+    cache.put("c", "c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" and cache.get("c") == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+class _FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, content):
+        self._content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"choices": [{"message": {"content": self._content}}]}
+
+
+class _FakeClient:
+    def __init__(self):
+        self.payloads = []
+
+    async def post(self, url, json):
+        self.payloads.append(json)
+        return _FakeResponse(f"answer {len(self.payloads)}")
+
+
+def test_call_apilogy_llm_uses_cache(tmp_path, monkeypatch):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite3"))
+    client = _FakeClient()
+    monkeypatch.setattr(llm_api, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(llm_api, "get_llm_client", lambda: client)
+
+    first = asyncio.run(llm_api.call_apilogy_llm("same prompt"))
+    second = asyncio.run(llm_api.call_apilogy_llm("same prompt"))
+    assert first == second == "answer 1"
+    assert client.payloads[0]["temperature"] == llm_api.CACHE_TEMPERATURE
+
+    # A refresh re-samples at the normal temperature and replaces the entry
+    refreshed = asyncio.run(llm_api.call_apilogy_llm("same prompt", refresh=True))
+    assert refreshed == "answer 2"
+    assert client.payloads[1]["temperature"] == llm_api.DEFAULT_TEMPERATURE
+    assert asyncio.run(llm_api.call_apilogy_llm("same prompt")) == "answer 2"
+
+    assert asyncio.run(llm_api.call_apilogy_llm("same prompt", use_cache=False)) == "answer 3"
@@ -0,0 +1,120 @@
+# tests/test_llm_stream.py
+
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend import llm_api
+from backend.json_stream import JsonArrayStreamParser
+from backend.agents import agent_enrich_job
+
+JOBS_REPLY = """```json
+[
+  {"role": "Data Scientist", "company": "Acme {Labs}", "match_score": 88, "fit_reason": "Python \\"and\\" ML"},
+  {"role": "ML Engineer", "company": "Beta", "match_score": 75, "fit_reason": "Models [in prod]"}
+]
+```"""
+
+
+class _StubSSEHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    reply = JOBS_REPLY
+    piece_size = 7
+    delay = 0.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert body["stream"] is True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for i in range(0, len(self.reply), self.piece_size):
+            event = {"choices": [{"delta": {"content": self.reply[i:i + self.piece_size]}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(self.delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_sse(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(llm_api, "API_URL", f"http://127.0.0.1:{server.server_port}/chat/completions")
+    monkeypatch.setattr(llm_api, "get_llm_cache", lambda: None)
+    yield _StubSSEHandler
+    llm_api.close_llm_clients()
+    server.shutdown()
+    server.server_close()
+
+
+def test_parser_emits_objects_across_any_chunk_boundary():
+    expected = [
+        {"role": "Data Scientist", "company": "Acme {Labs}", "match_score": 88, "fit_reason": 'Python "and" ML'},
+        {"role": "ML Engineer", "company": "Beta", "match_score": 75, "fit_reason": "Models [in prod]"},
+    ]
+    for size in (1, 2, 3, 5, 17, len(JOBS_REPLY)):
+        parser = JsonArrayStreamParser()
+        objects = []
+        for i in range(0, len(JOBS_REPLY), size):
+            objects.extend(parser.feed(JOBS_REPLY[i:i + size]))
+        assert objects == expected
+        assert parser.done
+
+
+def test_parser_reads_array_nested_in_object():
+    parser = JsonArrayStreamParser()
+    text = '{"job_title": "Analyst [Senior]", "gaps": [{"type": "skill", "meta": {"a": [1, 2]}}, {"type": "experience"}]}'
+    split = text.index("}}") + 3
+    assert parser.feed(text[:split]) == [{"type": "skill", "meta": {"a": [1, 2]}}]
+    assert parser.feed(text[split:]) == [{"type": "experience"}]
+
+
+def test_parser_emits_first_object_before_array_closes():
+    parser = JsonArrayStreamParser()
+    assert parser.feed('[{"week": 1}, {"week"') == [{"week": 1}]
+    assert parser.feed(': 2}]') == [{"week": 2}]
+
+
+def test_stream_apilogy_llm_yields_pieces(stub_sse):
+    async def collect():
+        return [piece async for piece in llm_api.stream_apilogy_llm("jobs please")]
+
+    pieces = asyncio.run(collect())
+    assert len(pieces) > 1
+    assert "".join(pieces) == JOBS_REPLY
+
+
+def test_first_enriched_job_arrives_before_stream_ends(stub_sse, monkeypatch):
+    monkeypatch.setattr(stub_sse, "delay", 0.01)
+    raw_jobs = [{"title": "DS", "description": "x"}, {"title": "MLE", "description": "y"}]
+
+    async def cached_facts(jobs):
+        return [{"industry": "IT"} for _ in jobs]
+
+    monkeypatch.setattr(agent_enrich_job, "get_job_facts", cached_facts)
+    monkeypatch.setattr(agent_enrich_job, "local_scores_for", lambda *args: None)
+
+    async def collect():
+        start = time.perf_counter()
+        arrivals = []
+        async for job in agent_enrich_job.stream_enriched_jobs(raw_jobs, "summary"):
+            arrivals.append((time.perf_counter() - start, job))
+        return time.perf_counter() - start, arrivals
+
+    total, arrivals = asyncio.run(collect())
+    assert [job["role"] for _, job in arrivals] == ["Data Scientist", "ML Engineer"]
+    assert arrivals[0][1]["industry"] == "IT"  # merged with the job facts
+    assert arrivals[0][1]["link"] == ""  # raw fallbacks still applied
+    assert arrivals[0][0] < total * 0.75
@@ -0,0 +1,165 @@
+# tests/test_rate_limit.py
+
+import json
+import time
+import asyncio
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend import llm_api
+from backend.llm_api import RequestLimiter
+
+
+class _ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    throttle_first = 1
+    calls = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).calls += 1
+        if type(self).calls <= self.throttle_first:
+            reply, status = b"{}", 429
+        else:
+            reply, status = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode(), 200
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0.2")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def throttling_llm(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _ThrottlingHandler.calls = 0
+    monkeypatch.setattr(llm_api, "API_URL", f"http://127.0.0.1:{server.server_port}/chat/completions")
+    monkeypatch.setattr(llm_api, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(llm_api, "_limiter", RequestLimiter(rate_per_sec=0, burst=1, max_concurrency=4))
+    yield _ThrottlingHandler
+    llm_api.close_llm_clients()
+    server.shutdown()
+    server.server_close()
+
+
+def test_429_is_retried_after_retry_after(throttling_llm):
+    start = time.monotonic()
+    assert asyncio.run(llm_api.call_apilogy_llm("hi")) == "ok"
+    assert time.monotonic() - start >= 0.2
+
+    stats = llm_api.get_rate_limit_stats()
+    assert (stats["throttled"], stats["retries"], stats["requests"]) == (1, 1, 2)
+
+
+def test_gives_up_after_max_retries(throttling_llm, monkeypatch):
+    monkeypatch.setattr(throttling_llm, "throttle_first", 100)
+    monkeypatch.setattr(llm_api, "MAX_RETRIES", 1)
+    monkeypatch.setattr(llm_api, "_parse_retry_after", lambda value: 0.0)
+    with pytest.raises(llm_api.httpx.HTTPStatusError):
+        asyncio.run(llm_api.call_apilogy_llm("hi"))
+    assert throttling_llm.calls == 2
+
+
+def test_token_bucket_spaces_out_requests():
+    limiter = RequestLimiter(rate_per_sec=20, burst=1, max_concurrency=10)
+
+    async def run():
+        async def one():
+            async with limiter.slot():
+                pass
+        await asyncio.gather(*(one() for _ in range(5)))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start >= 0.19  # burst of 1, then 4 more at 20/s
+    assert limiter.stats()["queue_wait_ms_max"] >= 190
+
+
+def test_concurrency_cap_is_shared_across_event_loops():
+    limiter = RequestLimiter(rate_per_sec=0, burst=1, max_concurrency=2)
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    async def one():
+        nonlocal in_flight, peak
+        async with limiter.slot():
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            with lock:
+                in_flight -= 1
+
+    async def session():
+        await asyncio.gather(one(), one())
+
+    # Each thread stands in for a Streamlit session running its own asyncio.run()
+    threads = [threading.Thread(target=asyncio.run, args=(session(),)) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak == 2
+    assert limiter.stats()["requests"] == 6
+
+
+def test_retry_after_parsing_and_backoff_bounds():
+    assert llm_api._parse_retry_after("3") == 3.0
+    assert 8 < llm_api._parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+    assert llm_api._parse_retry_after("soon") is None
+
+    for attempt in range(10):
+        assert 0 <= llm_api._backoff_delay(attempt) <= min(llm_api.BACKOFF_MAX, llm_api.BACKOFF_BASE * 2 ** attempt)
+    assert llm_api._backoff_delay(0, retry_after=5) >= 5
+
+
+def test_waiters_get_slots_in_arrival_order():
+    limiter = RequestLimiter(rate_per_sec=0, burst=1, max_concurrency=1)
+    order = []
+
+    async def one(n):
+        async with limiter.slot():
+            order.append(n)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        tasks = []
+        for n in range(6):
+            tasks.append(asyncio.create_task(one(n)))
+            await asyncio.sleep(0)  # queue in a known order
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order == list(range(6))
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    limiter = RequestLimiter(rate_per_sec=0, burst=1, max_concurrency=1)
+
+    async def hold(seconds):
+        async with limiter.slot():
+            await asyncio.sleep(seconds)
+
+    async def run():
+        holder = asyncio.create_task(hold(0.05))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold(0))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await holder
+        await asyncio.wait_for(hold(0), timeout=1)  # the slot is still available
+
+    asyncio.run(run())
+    assert limiter.stats()["in_flight"] == 0
@@ -0,0 +1,95 @@
+# tests/test_resources.py
+
+import sys
+import asyncio
+import time
+import types
+import threading
+
+import httpx
+
+from backend import resources, enrichment_cache
+
+
+def test_resource_is_created_once_across_threads(monkeypatch):
+    monkeypatch.setattr(resources, "_resources", {})
+    created = []
+
+    def factory():
+        time.sleep(0.05)  # widen the race window
+        created.append(1)
+        return object()
+
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(resources.get_resource("thing", factory))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert created == [1]
+    assert all(r is got[0] for r in got)
+    assert "thing" in resources.resource_stats()
+
+
+def test_chroma_client_is_shared_per_path(monkeypatch, tmp_path):
+    monkeypatch.setattr(resources, "_resources", {})
+    opened = []
+
+    class FakeClient:
+        def __init__(self, path):
+            opened.append(path)
+
+    monkeypatch.setitem(sys.modules, "chromadb", types.SimpleNamespace(PersistentClient=FakeClient))
+
+    first = enrichment_cache.get_chroma_client(str(tmp_path / "a"))
+    again = resources.get_chroma_client(str(tmp_path / "a"))
+    other = resources.get_chroma_client(str(tmp_path / "b"))
+
+    assert first is again
+    assert other is not first
+    assert len(opened) == 2
+
+
+def test_warm_up_continues_past_failing_steps(capsys):
+    ran = []
+
+    def broken():
+        raise RuntimeError("no model")
+
+    results = resources.warm_up([("broken", broken), ("ok", lambda: ran.append("ok"))])
+
+    assert ran == ["ok"]
+    assert results["broken"].startswith("failed")
+    assert isinstance(results["ok"], float)
+    assert "Warm-up of broken failed" in capsys.readouterr().out
+
+
+def test_start_warm_up_runs_once_per_process(monkeypatch):
+    monkeypatch.setattr(resources, "_warm_up_thread", None)
+    monkeypatch.setattr(resources, "WARM_UP_ON_START", True)
+    calls = []
+
+    first = resources.start_warm_up([("count", lambda: calls.append(1))])
+    second = resources.start_warm_up([("count", lambda: calls.append(1))])
+    first.join(timeout=5)
+
+    assert first is second
+    assert calls == [1]
+
+
+def test_http_clients_are_pooled_per_loop_and_closed_on_a_running_loop():
+    from backend.async_runtime import run_sync
+
+    async def open_client():
+        return resources.get_http_client("test", httpx.AsyncClient)
+
+    shared = run_sync(open_client())
+    assert run_sync(open_client()) is shared  # same loop, same client
+    other = asyncio.run(open_client())
+    assert other is not shared
+
+    # The shared runtime loop is still running when the atexit hook fires
+    resources.close_http_clients("test")
+    assert shared.is_closed
+    assert not any(name == "test" for name, _ in resources._http_clients)
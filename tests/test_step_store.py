@@ -0,0 +1,169 @@
+# tests/test_step_store.py
+
+import asyncio
+
+import pytest
+
+from backend import step_store
+from backend.agent_dag import AgentDAG
+from backend.step_store import StepStore, StepState
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = StepStore(path=str(tmp_path / "steps.sqlite3"))
+    monkeypatch.setattr(step_store, "STEP_STORE_ENABLED", True)
+    monkeypatch.setattr(step_store, "_store", store)
+    return store
+
+
+def test_put_get_and_invalidate(store):
+    store.put("p1", "summary", {"text": "Data engineer"})
+    store.put("p1", "job_role", "Engineer")
+    store.put("p2", "summary", {"text": "Designer"})
+
+    assert store.get("p1", "summary") == {"text": "Data engineer"}
+    assert store.get("p1", "missing", "default") == "default"
+    assert sorted(store.steps("p1")) == ["job_role", "summary"]
+
+    assert store.invalidate("p1", ["job_role"]) == 1
+    assert store.get("p1", "job_role") is None
+    assert store.invalidate("p1") == 1
+    assert store.get("p2", "summary") == {"text": "Designer"}
+    assert store.stats()["profiles"] == 1
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    store = StepStore(path=str(tmp_path / "steps.sqlite3"), ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr("backend.step_store.time.time", lambda: now[0])
+
+    store.put("p", "summary", "text")
+    now[0] += 5
+    assert store.get("p", "summary") == "text"
+    now[0] += 10
+    assert store.get("p", "summary") is None
+    assert store.steps("p") == []
+
+
+def test_dag_results_survive_a_restart(tmp_path):
+    path = str(tmp_path / "steps.sqlite3")
+    calls = []
+
+    def build():
+        async def summary(text):
+            calls.append("summary")
+            return text.upper()
+
+        async def pairs(summary):
+            calls.append("pairs")
+            return [(summary, 1)]
+
+        return AgentDAG().add("summary", summary, ["text"]).add("pairs", pairs, ["summary"])
+
+    first = asyncio.run(build().run({"text": "cv"}, state=StepState(StepStore(path=path), "p", "dag")))
+    # A new store on the same file stands in for a restarted server
+    again = asyncio.run(build().run({"text": "cv"}, state=StepState(StepStore(path=path), "p", "dag")))
+
+    assert calls == ["summary", "pairs"]
+    assert first["summary"] == again["summary"] == "CV"
+    assert again["pairs"] == [["CV", 1]]  # tuples come back as lists
+
+
+def test_new_input_invalidates_previous_profile(store):
+    session, other = {}, {}
+    first = step_store.start_profile(session, "my cv")
+    step_store.step_state(session, "dag")["summary"] = ["k", "Summary"]
+    session["summary_result"] = "Summary"
+
+    assert step_store.start_profile(session, "my cv") == first
+    assert store.get(first, "dag:summary") == ["k", "Summary"]
+
+    # Another session on the same input keeps the previous profile's steps alive
+    step_store.start_profile(other, "my cv")
+    second = step_store.start_profile(session, "another cv")
+    assert second != first
+    assert "summary_result" not in session
+    assert store.get(first, "dag:summary") == ["k", "Summary"]
+
+    # Once no session uses it, the next change invalidates it
+    step_store.start_profile(other, "a third cv")
+    assert store.steps(first) == []
+
+
+def test_profile_change_only_reruns_affected_dag_nodes(store):
+    calls = []
+
+    def node(name):
+        async def run(**inputs):
+            calls.append(name)
+            return f"{name}({','.join(sorted(map(str, inputs.values())))})"
+        return run
+
+    dag = (
+        AgentDAG()
+        .add("summary", node("summary"), ["input_text"])
+        .add("strengths", node("strengths"), ["cv_text"])
+    )
+    session = {}
+
+    def analyse(input_text, cv_text):
+        step_store.start_profile(session, input_text, cv_text)
+        state = step_store.step_state(session, "competency_dag_state")
+        return asyncio.run(dag.run({"input_text": input_text, "cv_text": cv_text}, state=state))
+
+    analyse("cv + manual notes", "cv")
+    results = analyse("cv + edited notes", "cv")
+
+    assert calls == ["summary", "strengths", "summary"]  # the CV branch was reused
+    assert results["strengths"] == "strengths(cv)"
+
+
+def test_refresh_restores_session_from_url(store):
+    session = {"raw_input_text": "my cv", "cv_text": "cv text"}
+    key = step_store.start_profile(session, "my cv", "cv text")
+    session["summary_result"] = "Data engineer"
+    session["final_competency_input"] = [{"competency": "Python", "level": 3}]
+    step_store.save_session(session)
+
+    query_params = {}
+    assert step_store.restore_session(session, query_params) == key
+    assert query_params == {"session": session["session_token"]}
+    assert key not in query_params.values()  # the URL carries a random token, not the profile hash
+
+    refreshed = {}
+    assert step_store.restore_session(refreshed, query_params) == key
+    assert refreshed["summary_result"] == "Data engineer"
+    assert "cv_text" not in refreshed and "raw_input_text" not in refreshed
+    assert store.load_session(session["session_token"])[1].keys() == {"summary_result", "final_competency_input"}
+    assert refreshed["final_competency_input"] == [{"competency": "Python", "level": 3}]
+    assert isinstance(step_store.step_state(refreshed, "dag"), StepState)
+
+
+def test_url_needs_a_known_session_token(store):
+    first, second = {}, {}
+    key = step_store.start_profile(first, "same cv")
+    assert step_store.start_profile(second, "same cv") == key
+    assert first["session_token"] != second["session_token"]
+
+    first["selected_job"] = {"title": "Data Engineer"}
+    step_store.save_session(first)
+    step_store.save_session(second)
+
+    for params in ({"profile": key}, {"session": key}, {"session": "guessed"}):
+        stranger = {}
+        assert step_store.restore_session(stranger, dict(params)) is None
+        assert stranger == {}
+
+    # Sessions on the same profile keep their own values
+    reopened = {}
+    step_store.restore_session(reopened, {"session": second["session_token"]})
+    assert "selected_job" not in reopened
+
+
+def test_step_state_falls_back_to_session_without_store(monkeypatch):
+    monkeypatch.setattr(step_store, "STEP_STORE_ENABLED", False)
+    session = {"profile_key": "p"}
+    state = step_store.step_state(session, "gap_analysis_results")
+    state["k"] = 1
+    assert session["gap_analysis_results"] == {"k": 1}
@@ -0,0 +1,115 @@
+# tests/test_stub_server.py
+
+import random
+import asyncio
+
+import pytest
+
+from backend import llm_api, job_search_client
+from backend.job_search_client import search_jobs_async
+from backend.agents.agent_profile_summarizer import summarize_user_profile
+from backend.agents.agent_extract_latest_job import extract_latest_job_role
+from backend.agents.agent_role_competency_mapper import map_competencies_for_role
+from backend.agents.agent_level_estimator import estimate_user_levels
+from backend.agents.agent_cv_strengths import extract_top_strengths
+from backend.agents.agent_job_recommender import recommend_jobs_from_competencies
+from backend.agents.agent_enrich_job import extract_job_facts, build_scoring_prompt, build_fit_reason_prompt
+from backend.agents.agent_gap_analyzer import stream_gaps
+from backend.agents.agent_extract_job_requirements import extract_job_requirements
+from backend.agents.agent_learning_plan import generate_learning_plan
+from scripts.stub_server import StubServer, Latency, classify_prompt, search_page
+from scripts.bench_flow import percentile
+
+CATALOG = ["Data Analysis", "SQL", "Python", "Communication", "Leadership", "Statistics", "Cloud", "Agile"]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with StubServer(stream_chunk=16) as stub:
+        monkeypatch.setattr(llm_api, "API_URL", stub.llm_url)
+        llm_api.configure_rate_limit(rate_per_sec=0)
+        yield stub
+        llm_api.close_llm_clients()
+    llm_api.configure_rate_limit(rate_per_sec=llm_api.RATE_LIMIT_PER_SEC)
+
+
+def test_every_agent_gets_a_usable_answer(stub):
+    job = {"title": "Data Analyst", "company_name": "Gojek", "description": "SQL and dashboards"}
+
+    async def flow():
+        summary = await summarize_user_profile("CV text")
+        role = await extract_latest_job_role(summary)
+        role_competencies = await map_competencies_for_role(role, CATALOG)
+        levels = await estimate_user_levels(role_competencies, summary)
+        strengths = await extract_top_strengths("CV text", CATALOG)
+        recommendations = await recommend_jobs_from_competencies(strengths)
+        facts = await extract_job_facts([job, dict(job, company_name="Tokopedia")])
+        gaps = [gap async for gap in stream_gaps(job, summary, strengths)]
+        requirements = await extract_job_requirements(job["description"], summary)
+        plan = await generate_learning_plan(job, summary, gaps, requirements["requirements"])
+        return summary, role, role_competencies, levels, strengths, recommendations, facts, gaps, requirements, plan
+
+    summary, role, role_competencies, levels, strengths, recommendations, facts, gaps, requirements, plan = asyncio.run(flow())
+
+    assert summary and role == "Data Analyst"
+    assert role_competencies == CATALOG[:7]
+    assert set(levels) == set(role_competencies) and all(1 <= v <= 5 for v in levels.values())
+    assert [s["competency"] for s in strengths] == CATALOG[:5]
+    assert len(recommendations) == 3
+    assert [f["company"] for f in facts] == ["Gojek", "Tokopedia"]
+    assert len(gaps) == 7
+    assert requirements["requirements"] and len(plan["plan"]) == 4
+
+    requests = stub.stats()["requests"]
+    assert "unknown" not in requests
+    assert requests["levels"] == 1 and "level" not in requests  # the batch call covered every competency
+
+
+def test_scoring_and_fit_reason_prompts_are_told_apart():
+    facts = [{"role": "Data Analyst", "company": "Gojek"}]
+    score = {"match_score": 70, "matched_competencies": ["SQL"], "missing_competencies": []}
+    assert classify_prompt(build_scoring_prompt(facts, "summary")) == "job_scores"
+    assert classify_prompt(build_fit_reason_prompt(facts, [score], "summary")) == "fit_reasons"
+    assert classify_prompt("hello") == "unknown"
+
+
+def test_search_pages_and_shared_postings(stub):
+    first = search_page("Data Analyst in Jakarta", 0)
+    assert len(first["jobs_results"]) == 10
+    assert first["serpapi_pagination"]["next_page_token"] == "page-1"
+    assert "serpapi_pagination" not in search_page("Data Analyst in Jakarta", 2)
+
+    shared = search_page("Data Specialist in Jakarta", 0)["jobs_results"][:3]
+    assert [j["description"] for j in shared] == [j["description"] for j in first["jobs_results"][:3]]
+    assert search_page("Data Analyst in Jakarta", 0, epoch=1)["jobs_results"][0]["description"] != first["jobs_results"][0]["description"]
+
+    jobs = asyncio.run(search_jobs_async("Data Analyst", {"location": "Jakarta"}, api_key="k", api_url=stub.search_url))
+    assert jobs and all(j["location"] == "Jakarta" for j in jobs)
+
+
+def test_injected_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(job_search_client, "SEARCH_BACKOFF_BASE", 0)
+    monkeypatch.setattr(job_search_client, "SEARCH_MAX_RETRIES", 10)
+    with StubServer(error_rate=0.3, rate_limit_rate=0.3, seed=1) as stub:
+        jobs = asyncio.run(search_jobs_async("Data Analyst", api_key="k", api_url=stub.search_url, max_results=20))
+        statuses = stub.stats()["statuses"]
+
+    assert len(jobs) == 20
+    assert statuses[429] and statuses[503] and statuses[200]
+
+
+def test_latency_specs():
+    rng = random.Random(0)
+    assert Latency("fixed:0.2").sample(rng) == 0.2
+    assert all(0.1 <= Latency("uniform:0.1:0.3").sample(rng) <= 0.3 for _ in range(50))
+    samples = sorted(Latency("lognormal:0.5:0.3").sample(rng) for _ in range(501))
+    assert 0.4 < samples[250] < 0.6
+    with pytest.raises(ValueError):
+        Latency("gamma:1")
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([7], 95) == 7
@@ -0,0 +1,93 @@
+# tests/test_vector_store.py
+
+import numpy as np
+import pytest
+
+from backend import vector_store
+from backend.vector_store import NumpyVectorStore, get_vector_store
+
+
+def _random_store(path, n=300, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    store = NumpyVectorStore(str(path))
+    ids = [f"id{i}" for i in range(n)]
+    store.upsert(ids=ids, embeddings=vectors, documents=[f"doc {i}" for i in range(n)], metadatas=[{"n": i} for i in range(n)])
+    return store, vectors, ids
+
+
+def test_query_is_exact_top_k(tmp_path):
+    store, vectors, ids = _random_store(tmp_path / "store")
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = np.random.default_rng(1).normal(size=16)
+
+    result = store.query(query, top_k=10)
+
+    expected = np.argsort(-(normed @ (query / np.linalg.norm(query))))[:10]
+    assert result["ids"][0] == [ids[i] for i in expected]
+    assert result["documents"][0][0] == f"doc {expected[0]}"
+    assert result["metadatas"][0][0] == {"n": int(expected[0])}
+    assert result["distances"][0] == sorted(result["distances"][0])
+
+
+def test_persisted_matrix_is_memory_mapped_and_normalised(tmp_path):
+    _random_store(tmp_path / "store")
+    reopened = NumpyVectorStore(str(tmp_path / "store"))
+
+    matrix = reopened._snapshot[0]
+    assert isinstance(matrix, np.memmap) and matrix.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0, rtol=1e-5)
+    assert reopened.count() == 300
+
+
+def test_upsert_replaces_and_delete_removes(tmp_path):
+    store, _, _ = _random_store(tmp_path / "store", n=5, dim=3)
+
+    store.upsert(ids=["id2", "new"], embeddings=[[1, 0, 0], [0, 1, 0]], documents=["two", "new"], metadatas=[{"n": 2}, {"n": 99}])
+    assert store.count() == 6
+    assert store.query([1, 0, 0], top_k=1)["ids"][0] == ["id2"]
+    assert store.query([1, 0, 0], top_k=1)["distances"][0][0] == pytest.approx(0, abs=1e-6)
+
+    store.delete(["id2", "missing"])
+    assert "id2" not in store.get_metadatas()
+    assert NumpyVectorStore(str(tmp_path / "store")).count() == 5
+    assert len(list((tmp_path / "store").glob("embeddings-*.npy"))) == 1
+
+
+def test_empty_store_and_backend_selection(tmp_path, monkeypatch):
+    assert NumpyVectorStore(str(tmp_path / "empty")).query([1.0, 0.0], top_k=3)["ids"] == [[]]
+
+    monkeypatch.setattr(vector_store, "NUMPY_STORE_PATH", str(tmp_path))
+    monkeypatch.setattr(vector_store, "_stores", {})
+    store = get_vector_store("competencies", backend="numpy")
+    assert isinstance(store, NumpyVectorStore) and get_vector_store("competencies", backend="numpy") is store
+    with pytest.raises(ValueError):
+        get_vector_store("competencies", backend="faiss")
+
+
+def test_vector_store_is_abstract():
+    class Partial(vector_store.VectorStore):
+        def count(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_chroma_and_numpy_return_the_same_distances(tmp_path, monkeypatch):
+    pytest.importorskip("chromadb")
+    from backend import resources
+
+    monkeypatch.setattr(vector_store, "CHROMA_PATH", str(tmp_path / "chroma"))
+    monkeypatch.setattr(vector_store, "_chroma_collections", {})
+    monkeypatch.setattr(resources, "_resources", {})
+    numpy_store, vectors, ids = _random_store(tmp_path / "numpy", n=50)
+    chroma_store = vector_store.ChromaVectorStore(vector_store.get_chroma_collection("competencies"))
+    chroma_store.upsert(ids=ids, embeddings=vectors.tolist(), documents=[f"doc {i}" for i in range(50)], metadatas=[{"n": i} for i in range(50)])
+    query = np.random.default_rng(1).normal(size=16)
+
+    from_numpy = numpy_store.query(query, top_k=5)
+    from_chroma = chroma_store.query(query, top_k=5)
+
+    assert from_chroma["ids"] == from_numpy["ids"]
+    np.testing.assert_allclose(from_chroma["distances"][0], from_numpy["distances"][0], atol=1e-4)